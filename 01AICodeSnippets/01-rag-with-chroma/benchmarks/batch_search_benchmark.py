@@ -0,0 +1,68 @@
+"""
+Batched Search Benchmark
+Measures queries/sec of similarity_search (one call per query) against
+similarity_search_batch for batch sizes 1 to 256.
+
+Usage (from the project root):
+    python benchmarks/batch_search_benchmark.py --docs 5000
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from vector_store import ChromaVectorStore
+
+TOPICS = ["python", "databases", "vector search", "embeddings", "transformers",
+          "retrieval", "caching", "latency", "gpu", "tokenization"]
+VERBS = ["improves", "explains", "slows down", "speeds up", "depends on", "replaces"]
+
+
+def sentence(rng: random.Random) -> str:
+    return f"{rng.choice(TOPICS).title()} {rng.choice(VERBS)} {rng.choice(TOPICS)} in case {rng.randint(0, 10**6)}."
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Single vs batched similarity search throughput")
+    parser.add_argument("--docs", type=int, default=5000, help="Documents to index")
+    parser.add_argument("--k", type=int, default=4)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64, 128, 256])
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        # Disable the embedding cache so every query is really encoded
+        store = ChromaVectorStore(persist_directory=tmp, embedding_cache_size=0)
+        texts = [" ".join(sentence(rng) for _ in range(3)) for _ in range(args.docs)]
+        for i in range(0, len(texts), 1000):
+            batch = texts[i:i + 1000]
+            store.add_documents(batch, [{"source": f"doc_{i + j}"} for j in range(len(batch))],
+                                [f"doc_{i + j}" for j in range(len(batch))])
+
+        # Warm up the model and the index
+        store.similarity_search_batch([sentence(rng) for _ in range(8)], k=args.k)
+
+        print(f"\n{'batch':>6}{'single q/s':>14}{'batch q/s':>14}{'speedup':>10}")
+        for batch_size in args.batch_sizes:
+            queries = [sentence(rng) for _ in range(batch_size)]
+
+            start = time.perf_counter()
+            for query in queries:
+                store.similarity_search(query, k=args.k)
+            single_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            store.similarity_search_batch(queries, k=args.k)
+            batch_time = time.perf_counter() - start
+
+            print(f"{batch_size:>6}{batch_size / single_time:>14.1f}"
+                  f"{batch_size / batch_time:>14.1f}{single_time / batch_time:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Compact Storage Benchmark
+Compares the int8 / float16 QuantizedVectorIndex with the float32 Chroma
+store it replaces: recall@k against exact search and against Chroma's own
+results, resident (scanned) bytes and disk bytes. Compact-mode disk use
+includes the Chroma directory that still holds documents with 1-d
+placeholder embeddings.
+
+Uses synthetic clustered 384-d vectors (MiniLM's dimension). Pass
+--skip-chroma to measure the compact index alone (numpy only).
+
+Usage (from the project root):
+    python benchmarks/compact_storage_benchmark.py --vectors 100000 --k 4 10
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from quantized_index import QuantizedVectorIndex
+
+
+def synthetic_embeddings(rng, n: int, dim: int, clusters: int = 200) -> np.ndarray:
+    """Clustered vectors, closer to real sentence embeddings than pure noise."""
+    centers = rng.normal(size=(clusters, dim)).astype(np.float32)
+    labels = rng.integers(0, clusters, size=n)
+    vectors = centers[labels] + 0.6 * rng.normal(size=(n, dim)).astype(np.float32)
+    return vectors
+
+
+def dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def build_chroma(path: str, ids, vectors: np.ndarray, batch: int = 5000):
+    import chromadb
+    client = chromadb.PersistentClient(path=path)
+    collection = client.get_or_create_collection("bench_vectors", metadata={"hnsw:space": "cosine"})
+    for i in range(0, len(ids), batch):
+        collection.add(ids=ids[i:i + batch], embeddings=vectors[i:i + batch])
+    return collection
+
+
+def recall(results, truths, k: int) -> float:
+    """Share of each truth list's top k found in the matching result's top k."""
+    hits = sum(len(set(truth[:k]) & set(result[:k])) for result, truth in zip(results, truths))
+    return hits / (k * len(truths))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compact vs float32 embedding storage")
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, nargs="+", default=[4, 10])
+    parser.add_argument("--rerank-factor", type=int, default=4)
+    parser.add_argument("--skip-chroma", action="store_true", help="Do not build the float32 Chroma store")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    vectors = synthetic_embeddings(rng, args.vectors, args.dim)
+    queries = synthetic_embeddings(rng, args.queries, args.dim)
+    ids = [f"chunk_{i}" for i in range(args.vectors)]
+
+    normalized = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    max_k = max(args.k)
+    exact = []
+    for query in queries:
+        scores = normalized @ (query / np.linalg.norm(query))
+        exact.append([ids[i] for i in np.argsort(-scores)[:max_k]])
+
+    float32_bytes = vectors.size * 4
+    print(f"{args.vectors} x {args.dim} vectors, float32 matrix: {float32_bytes / 2**20:.1f} MiB\n")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = []
+        chroma_results, chroma_disk = None, None
+        if not args.skip_chroma:
+            collection = build_chroma(f"{tmp}/chroma", ids, vectors)
+            start = time.perf_counter()
+            chroma_results = collection.query(query_embeddings=queries, n_results=max_k)["ids"]
+            per_query = (time.perf_counter() - start) / len(queries) * 1000
+            chroma_disk = dir_size(Path(tmp) / "chroma")
+            # Chroma keeps its HNSW graph and vectors in memory, so "scan" is the float32 matrix
+            rows.append(("chroma f32", float32_bytes, chroma_disk, per_query, chroma_results))
+
+            # What a compact-mode store still writes to Chroma: the same rows with 1-d placeholders
+            build_chroma(f"{tmp}/placeholders", ids, np.zeros((args.vectors, 1), dtype=np.float32))
+            placeholder_disk = dir_size(Path(tmp) / "placeholders")
+
+        for dtype in QuantizedVectorIndex.DTYPES:
+            index = QuantizedVectorIndex(f"{tmp}/{dtype}", dtype=dtype, rerank_factor=args.rerank_factor)
+            for i in range(0, args.vectors, 10_000):
+                index.add(ids[i:i + 10_000], vectors[i:i + 10_000])
+
+            start = time.perf_counter()
+            results = [[doc_id for doc_id, _ in index.search(query, max_k)] for query in queries]
+            per_query = (time.perf_counter() - start) / len(queries) * 1000
+
+            stats = index.get_stats()
+            disk = stats['disk_bytes'] + (placeholder_disk if chroma_results is not None else 0)
+            rows.append((dtype, stats['scan_bytes'], disk, per_query, results))
+
+    header = f"{'store':<12}{'scan MiB':>10}{'disk MiB':>10}{'ms/query':>10}"
+    header += "".join(f"{f'recall@{k}':>11}" for k in args.k)
+    if chroma_results is not None:
+        header += f"{'disk vs chroma':>16}" + "".join(f"{f'vs chroma@{k}':>14}" for k in args.k)
+    print(header)
+    for name, scan, disk, per_query, results in rows:
+        line = f"{name:<12}{scan / 2**20:>10.1f}{disk / 2**20:>10.1f}{per_query:>10.2f}"
+        line += "".join(f"{recall(results, exact, k):>11.3f}" for k in args.k)
+        if chroma_results is not None:
+            line += f"{disk / chroma_disk:>16.2f}" + "".join(
+                f"{recall(results, chroma_results, k):>14.3f}" for k in args.k)
+        print(line)
+    if chroma_results is not None:
+        print(f"\nCompact disk includes {placeholder_disk / 2**20:.1f} MiB of Chroma rows with 1-d placeholders")
+
+
+if __name__ == "__main__":
+    main()
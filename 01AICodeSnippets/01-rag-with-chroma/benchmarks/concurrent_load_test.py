@@ -0,0 +1,160 @@
+"""
+Concurrent Load Test
+Measures p50 / p99 query latency through RAGService while a large ingest runs,
+compared with the same query load on an idle system.
+
+The LLM is a local fake OpenAI-compatible streaming server (the Groq client is
+pointed at it through GROQ_BASE_URL), so no API key or network is needed; the
+embedding model, ChromaDB and BM25 index are the real ones.
+
+Usage (from the project root):
+    python benchmarks/concurrent_load_test.py --files 1000 --concurrency 8
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+TOPICS = ["python", "databases", "vector search", "embeddings", "transformers",
+          "retrieval", "caching", "latency", "gpu", "tokenization"]
+VERBS = ["improves", "explains", "slows down", "speeds up", "depends on", "replaces"]
+
+
+def sentence(rng: random.Random) -> str:
+    return f"{rng.choice(TOPICS).title()} {rng.choice(VERBS)} {rng.choice(TOPICS)} in case {rng.randint(0, 10**6)}."
+
+
+def write_corpus(directory: Path, files: int, rng: random.Random):
+    directory.mkdir(parents=True, exist_ok=True)
+    for i in range(files):
+        paragraphs = ["\n".join(sentence(rng) for _ in range(8)) for _ in range(4)]
+        (directory / f"doc_{i:05d}.txt").write_text("\n\n".join(paragraphs), encoding="utf-8")
+
+
+def start_fake_llm(token_delay: float) -> ThreadingHTTPServer:
+    """Local OpenAI-compatible chat completions endpoint that streams a short answer."""
+    tokens = ["This", " is", " a", " fake", " answer", "."]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.end_headers()
+            for token in tokens:
+                chunk = {"id": "x", "object": "chat.completion.chunk", "created": 0, "model": body["model"],
+                         "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]}
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+                time.sleep(token_delay)
+            self.wfile.write(b"data: [DONE]\n\n")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_queries(service, stop: threading.Event, latencies: list, seed: int, max_queries: int = None):
+    rng = random.Random(seed)
+    while not stop.is_set() and (max_queries is None or len(latencies) < max_queries):
+        question = f"What {rng.choice(VERBS)} {rng.choice(TOPICS)} in case {rng.randint(0, 10**6)}?"
+        start = time.perf_counter()
+        service.query(question, k=4)
+        latencies.append(time.perf_counter() - start)
+
+
+def percentiles(latencies: list) -> str:
+    if not latencies:
+        return "no queries completed"
+    ms = np.array(latencies) * 1000
+    return (f"{len(ms)} queries, p50 {np.percentile(ms, 50):.1f} ms, "
+            f"p99 {np.percentile(ms, 99):.1f} ms, max {ms.max():.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Query latency during a large ingest")
+    parser.add_argument("--files", type=int, default=1000, help="Files in the background ingest")
+    parser.add_argument("--seed-files", type=int, default=50, help="Files ingested before the test")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent query clients")
+    parser.add_argument("--baseline-queries", type=int, default=200, help="Total queries in the idle baseline")
+    parser.add_argument("--token-delay", type=float, default=0.002, help="Fake LLM seconds per token")
+    args = parser.parse_args()
+
+    server = start_fake_llm(args.token_delay)
+    os.environ["GROQ_API_KEY"] = "load-test"
+    os.environ["GROQ_BASE_URL"] = f"http://127.0.0.1:{server.server_port}"
+
+    from rag_system import RAGSystem
+    from rag_service import RAGService
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        write_corpus(tmp / "seed", args.seed_files, rng)
+        write_corpus(tmp / "bulk", args.files, rng)
+
+        # Answer cache off so every query really retrieves and generates
+        rag = RAGSystem(vector_store_path=str(tmp / "db"), answer_cache_size=0)
+        service = RAGService(rag)
+        try:
+            service.wait_for_job(service.submit_ingest(str(tmp / "seed")).job_id)
+
+            def load(stop: threading.Event, per_client: int = None):
+                latencies = [[] for _ in range(args.concurrency)]
+                clients = [
+                    threading.Thread(target=run_queries, args=(service, stop, latencies[i], i, per_client))
+                    for i in range(args.concurrency)
+                ]
+                for client in clients:
+                    client.start()
+                return clients, latencies
+
+            # Idle baseline
+            stop = threading.Event()
+            clients, latencies = load(stop, args.baseline_queries // args.concurrency)
+            for client in clients:
+                client.join()
+            baseline = [x for per_client in latencies for x in per_client]
+
+            # Same load while the bulk ingest runs
+            job = service.submit_ingest(str(tmp / "bulk"))
+            stop = threading.Event()
+            clients, latencies = load(stop)
+            last_report = 0.0
+            while not job.finished:
+                if time.time() - last_report > 5:
+                    print(f"  ingest {job.files_done}/{job.files_total} files")
+                    last_report = time.time()
+                time.sleep(0.1)
+            stop.set()
+            for client in clients:
+                client.join()
+            during = [x for per_client in latencies for x in per_client]
+
+            ingest_time = job.finished_at - job.started_at
+            print(f"\nIngest of {args.files} files: {job.status} in {ingest_time:.1f}s "
+                  f"({job.stats.get('chunks_embedded', 0) if job.stats else 0} chunks embedded)")
+            print(f"Concurrency {args.concurrency}")
+            print(f"  idle:          {percentiles(baseline)}")
+            print(f"  during ingest: {percentiles(during)}")
+            print(f"Embedding batches: {service.batcher.get_stats()}")
+        finally:
+            service.close()
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Extraction Throughput Benchmark
+Compares the serial extraction path against the multi-process ExtractionPipeline.
+
+Usage (from the project root):
+    python benchmarks/extraction_benchmark.py --files 3000 --workers 2 4 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from document_processor import DocumentProcessor
+from extraction_pipeline import ExtractionPipeline
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+WORDS = (
+    "retrieval augmented generation vector embedding chunk overlap document "
+    "similarity search context window language model token latency throughput "
+    "index query answer source metadata pipeline process worker batch"
+).split()
+
+
+def make_paragraph(rng: random.Random, sentences: int) -> str:
+    out = []
+    for _ in range(sentences):
+        words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+        out.append(" ".join(words).capitalize() + rng.choice([".", "!", "?"]))
+    return " ".join(out)
+
+
+def build_corpus(root: Path, num_files: int, seed: int = 42) -> None:
+    """Write a synthetic corpus of text, markdown and (if bs4 is installed) HTML files."""
+    rng = random.Random(seed)
+    extensions = [".txt", ".md"] + ([".html"] if BeautifulSoup else [])
+    for i in range(num_files):
+        ext = extensions[i % len(extensions)]
+        paragraphs = [make_paragraph(rng, rng.randint(5, 15)) for _ in range(rng.randint(3, 12))]
+        if ext == ".html":
+            body = "".join(f"<p>{p}</p>" for p in paragraphs)
+            text = f"<html><body><h1>Doc {i}</h1>{body}</body></html>"
+        elif ext == ".md":
+            text = f"# Doc {i}\n\n" + "\n\n".join(paragraphs)
+        else:
+            text = "\n\n".join(paragraphs)
+        subdir = root / f"part_{i % 16:02d}"
+        subdir.mkdir(exist_ok=True)
+        (subdir / f"doc_{i:05d}{ext}").write_text(text, encoding="utf-8")
+
+
+def run(processor: DocumentProcessor, files, workers: int):
+    pipeline = ExtractionPipeline(processor, num_workers=workers)
+    start = time.perf_counter()
+    chunk_ids = []
+    for _, chunks, error in pipeline.iter_chunks(files):
+        if error:
+            raise RuntimeError(error)
+        chunk_ids.extend(chunk.chunk_id for chunk in chunks)
+    return time.perf_counter() - start, chunk_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serial vs parallel extraction throughput")
+    parser.add_argument("--files", type=int, default=3000, help="Number of synthetic files")
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, 4, os.cpu_count() or 4])
+    args = parser.parse_args()
+
+    processor = DocumentProcessor()
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        print(f"🔄 Building synthetic corpus of {args.files} files...")
+        build_corpus(root, args.files)
+        files = sorted(p for p in root.rglob("*") if p.is_file())
+
+        serial_time, serial_ids = run(processor, files, workers=1)
+        print(f"\n{'mode':<14}{'files/s':>10}{'chunks/s':>12}{'speedup':>10}")
+        print(f"{'serial':<14}{len(files) / serial_time:>10.0f}{len(serial_ids) / serial_time:>12.0f}{1.0:>10.2f}")
+
+        for workers in sorted(set(args.workers)):
+            if workers <= 1:
+                continue
+            elapsed, ids = run(processor, files, workers=workers)
+            if ids != serial_ids:
+                raise AssertionError(f"Chunk ids differ from the serial path with {workers} workers")
+            print(f"{f'{workers} workers':<14}{len(files) / elapsed:>10.0f}"
+                  f"{len(ids) / elapsed:>12.0f}{serial_time / elapsed:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+PDF Extraction Benchmark
+Pages/sec of every installed PDF backend, in-process and with one PDF's
+pages sharded across worker processes.
+
+Usage (from the project root):
+    python benchmarks/pdf_extraction_benchmark.py --pages 400 --workers 1 2 4
+"""
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from pdf_extraction import PDF_BACKENDS, get_pdf_backend, iter_pdf_pages
+
+WORDS = (
+    "retrieval augmented generation vector embedding chunk overlap document "
+    "similarity search context window language model token latency throughput "
+    "index query answer source metadata pipeline process worker batch"
+).split()
+
+
+def write_pdf(path: Path, pages: int, lines_per_page: int, seed: int = 0):
+    """Write a text-only PDF (Helvetica, one content stream per page)."""
+    rng = random.Random(seed)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>"
+         % (" ".join(f"{4 + 2 * i} 0 R" for i in range(pages)), pages)).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i in range(pages):
+        lines = [" ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + "." for _ in range(lines_per_page)]
+        objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                        f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>").encode())
+        content = ("BT /F1 9 Tf 11 TL 36 760 Td " + " ".join(f"({line}) Tj T*" for line in lines) + " ET").encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF pages/sec per backend and worker count")
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--lines-per-page", type=int, default=60)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--shard-pages", type=int, default=32)
+    args = parser.parse_args()
+
+    backends = [name for name, backend in PDF_BACKENDS.items() if backend.available()]
+    if not backends:
+        sys.exit("❌ No PDF backend installed (pip install pypdfium2 or PyPDF2)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = Path(tmp) / "large.pdf"
+        write_pdf(pdf, args.pages, args.lines_per_page)
+        print(f"{args.pages}-page PDF, {pdf.stat().st_size / 2**20:.1f} MiB; "
+              f"auto-selected backend: {get_pdf_backend().name}\n")
+
+        print(f"{'backend':<10}{'workers':>8}{'seconds':>10}{'pages/s':>10}{'chars':>12}")
+        for name in backends:
+            backend = get_pdf_backend(name)
+            for workers in args.workers:
+                start = time.perf_counter()
+                chars = sum(len(page) for page in iter_pdf_pages(pdf, backend, workers, args.shard_pages))
+                elapsed = time.perf_counter() - start
+                print(f"{name:<10}{workers:>8}{elapsed:>10.2f}{args.pages / elapsed:>10.0f}{chars:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""
+Retrieval Evaluation Benchmark
+Measures retrieval quality and speed of DocumentProcessor + ChromaVectorStore
+for every combination of chunk size, chunk overlap, embedding model and k.
+
+For each configuration the corpus is chunked and ingested into a fresh store,
+then every question is searched one at a time. Reported per configuration:
+recall@k, MRR@k, ingest docs/sec and chunks/sec, and query p50/p99 latency.
+With --rerank-model every configuration is also run with the cross-encoder
+re-ranking stage (over-fetch --rerank-candidates, keep k), so its recall
+gain and net latency cost show up side by side.
+
+The labeled corpus is a directory of documents plus a questions.json file:
+
+    [{"question": "...", "source": "doc_00001.txt", "answer": "..."}, ...]
+
+`answer` is a passage copied from `source`; a retrieved chunk counts as a
+hit when it covers at least half of that passage, so the labels do not
+depend on how the corpus is chunked. Without --corpus a synthetic labeled
+corpus is generated.
+
+Everything runs offline: Hugging Face downloads are disabled, so models must
+be local paths or already cached. The built-in "hashing" model needs no
+download at all (a feature-hashing bag of words, a lexical baseline).
+
+Usage (from the project root):
+    python benchmarks/retrieval_eval.py --models hashing all-MiniLM-L6-v2 \\
+        --chunk-sizes 300 1000 --overlaps 0 100 --k 1 4 10 --json results.json
+"""
+
+import argparse
+import contextlib
+import hashlib
+import io
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Never reach out to the Hugging Face hub
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from document_processor import DocumentProcessor
+from embedding_models import register_embedding_model
+from reranker import CrossEncoderReranker
+from vector_store import ChromaVectorStore
+
+TOPICS = ["python", "databases", "vector search", "embeddings", "transformers",
+          "retrieval", "caching", "latency", "gpu", "tokenization"]
+VERBS = ["improves", "explains", "slows down", "speeds up", "depends on", "replaces"]
+ATTRIBUTES = ["audit logs", "user sessions", "nightly backups", "model weights",
+              "billing records", "search index", "thumbnails", "feature flags"]
+PLACES = ["a Postgres cluster", "an S3 bucket", "Redis", "a local SQLite file",
+          "a Kafka topic", "Google Cloud Storage", "a shared NFS volume", "ClickHouse"]
+SYLLABLES = ["ka", "lo", "mi", "ra", "zen", "tor", "vu", "shi", "pel", "dor", "qua", "nix"]
+
+HASHING_MODEL = "hashing"
+_TOKEN = re.compile(r"\w+")
+
+
+class HashingEmbeddingModel:
+    """
+    Offline lexical embedding: hashed unigram and bigram counts, L2-normalized.
+
+    Stands in for a sentence transformer where no model can be loaded and
+    gives a keyword-matching baseline to compare real models against.
+    """
+
+    is_loaded = True
+
+    def __init__(self, dimension: int = 384):
+        self.dimension = dimension
+
+    def _bucket(self, token: str) -> int:
+        return int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little") % self.dimension
+
+    def encode(self, texts, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = [w.lower() for w in _TOKEN.findall(text)]
+            for token in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+                vectors[row, self._bucket(token)] += 1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+
+# ---- corpus ----------------------------------------------------------
+
+def codename(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(3)).title()
+
+
+def filler(rng: random.Random) -> str:
+    return f"{rng.choice(TOPICS).title()} {rng.choice(VERBS)} {rng.choice(TOPICS)} in case {rng.randint(0, 10**6)}."
+
+
+def generate_corpus(directory: Path, docs: int, facts_per_doc: int, seed: int = 0):
+    """
+    Write a synthetic labeled corpus.
+
+    Each document mixes filler sentences with facts of the form "The <name>
+    service keeps its <attribute> in <place>." and every fact gets one
+    paraphrased question. Attributes and places repeat across documents, so
+    only the made-up service name singles out the right passage.
+    """
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+    used_names = set()
+    questions = []
+    for i in range(docs):
+        filename = f"doc_{i:05d}.txt"
+        paragraphs = []
+        for _ in range(facts_per_doc):
+            name = codename(rng)
+            while name in used_names:
+                name = codename(rng)
+            used_names.add(name)
+            attribute, place = rng.choice(ATTRIBUTES), rng.choice(PLACES)
+            fact = f"The {name} service keeps its {attribute} in {place}."
+            questions.append({
+                "question": f"Where does the {name} service store {attribute}?",
+                "source": filename,
+                "answer": fact
+            })
+            sentences = [filler(rng) for _ in range(rng.randint(4, 10))]
+            sentences.insert(rng.randint(0, len(sentences)), fact)
+            paragraphs.append(" ".join(sentences))
+        (directory / filename).write_text("\n\n".join(paragraphs), encoding="utf-8")
+    (directory / "questions.json").write_text(json.dumps(questions, indent=2), encoding="utf-8")
+
+
+def load_questions(directory: Path):
+    """
+    Read questions.json and locate each answer passage in its cleaned document.
+
+    Returns:
+        (questions, gold) where gold[i] is (filename, start, end) in the same
+        character offsets DocumentProcessor stores as start_index/end_index
+    """
+    questions = json.loads((directory / "questions.json").read_text(encoding="utf-8"))
+    cleaner = DocumentProcessor()
+    texts = {}
+    labeled, gold = [], []
+    for item in questions:
+        source = directory / item["source"]
+        if source not in texts:
+            texts[source] = cleaner._clean_text(cleaner.supported_extensions[source.suffix.lower()](source))
+        answer = cleaner._clean_text(item["answer"])
+        start = texts[source].find(answer)
+        if start < 0:
+            print(f"⚠️ Answer for {item['question']!r} not found in {item['source']}; skipped")
+            continue
+        labeled.append(item)
+        gold.append((source.name, start, start + len(answer)))
+    return labeled, gold
+
+
+# ---- evaluation ------------------------------------------------------
+
+def is_hit(doc, gold) -> bool:
+    """Whether a retrieved chunk covers at least half of the gold passage."""
+    filename, start, end = gold
+    metadata = doc["metadata"]
+    if metadata.get("filename") != filename:
+        return False
+    covered = min(end, metadata["end_index"]) - max(start, metadata["start_index"])
+    return covered * 2 >= end - start
+
+
+def percentile_ms(latencies, q: float) -> float:
+    return float(np.percentile(np.array(latencies) * 1000, q))
+
+
+def evaluate(corpus: Path, questions, gold, model: str, chunk_size: int, overlap: int,
+             ks, workdir: Path, verbose: bool, reranker=None, rerank_candidates: int = 20):
+    """Ingest the corpus with one chunking/model configuration and score every k."""
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    with quiet:
+        # Embedding cache off so every configuration really encodes its chunks
+        store = ChromaVectorStore(persist_directory=str(workdir), embedding_model=model,
+                                  embedding_cache_size=0)
+        processor = DocumentProcessor(chunk_size=chunk_size, chunk_overlap=overlap)
+
+        start = time.perf_counter()
+        chunks = processor.process_directory(str(corpus), num_workers=1)
+        for i in range(0, len(chunks), 1000):
+            batch = chunks[i:i + 1000]
+            store.add_documents([c.content for c in batch], [c.metadata for c in batch],
+                                [c.chunk_id for c in batch])
+        ingest_time = time.perf_counter() - start
+
+        # Warm up the model and the index outside the timed queries
+        store.similarity_search(questions[0]["question"], k=max(ks))
+
+        def reranked_search(question, k):
+            candidates = store.similarity_search(question, k=max(k, rerank_candidates))
+            return reranker.rerank(question, candidates, k).docs
+
+        searches = [(None, lambda question, k: store.similarity_search(question, k=k))]
+        if reranker is not None:
+            reranker.rerank(questions[0]["question"], store.similarity_search(questions[0]["question"], k=1), 1)
+            searches.append((reranker.model_name, reranked_search))
+
+        results = []
+        for (rerank_model, search), k in itertools.product(searches, ks):
+            latencies, hits, reciprocal_ranks = [], 0, 0.0
+            for item, target in zip(questions, gold):
+                start = time.perf_counter()
+                docs = search(item["question"], k)
+                latencies.append(time.perf_counter() - start)
+                rank = next((r for r, doc in enumerate(docs, 1) if is_hit(doc, target)), None)
+                if rank is not None:
+                    hits += 1
+                    reciprocal_ranks += 1.0 / rank
+            results.append({
+                "model": model,
+                "chunk_size": chunk_size,
+                "chunk_overlap": overlap,
+                "k": k,
+                "rerank_model": rerank_model,
+                "chunks": len(chunks),
+                "questions": len(questions),
+                "recall_at_k": hits / len(questions),
+                "mrr": reciprocal_ranks / len(questions),
+                "ingest_seconds": ingest_time,
+                "ingest_docs_per_sec": len({c.metadata["filename"] for c in chunks}) / ingest_time,
+                "ingest_chunks_per_sec": len(chunks) / ingest_time,
+                "query_p50_ms": percentile_ms(latencies, 50),
+                "query_p99_ms": percentile_ms(latencies, 99)
+            })
+        store.client.clear_system_cache()
+    return results
+
+
+def print_table(rows):
+    header = (f"{'model':<24}{'size':>6}{'overlap':>8}{'k':>4}{'rerank':>7}{'chunks':>8}"
+              f"{'recall@k':>10}{'MRR':>7}{'docs/s':>9}{'p50 ms':>8}{'p99 ms':>8}")
+    print(header)
+    print("-" * len(header))
+    for row in rows:
+        print(f"{row['model'][-24:]:<24}{row['chunk_size']:>6}{row['chunk_overlap']:>8}{row['k']:>4}"
+              f"{'yes' if row['rerank_model'] else 'no':>7}{row['chunks']:>8}{row['recall_at_k']:>10.3f}{row['mrr']:>7.3f}"
+              f"{row['ingest_docs_per_sec']:>9.1f}{row['query_p50_ms']:>8.2f}{row['query_p99_ms']:>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Retrieval quality and latency across chunking/model settings")
+    parser.add_argument("--corpus", type=Path, help="Labeled corpus directory (default: generate one)")
+    parser.add_argument("--docs", type=int, default=200, help="Generated documents")
+    parser.add_argument("--facts-per-doc", type=int, default=3, help="Generated questions per document")
+    parser.add_argument("--models", nargs="+", default=[HASHING_MODEL, "sentence-transformers/all-MiniLM-L6-v2"],
+                        help=f"Embedding models: local paths, cached hub names or '{HASHING_MODEL}'")
+    parser.add_argument("--chunk-sizes", type=int, nargs="+", default=[300, 1000])
+    parser.add_argument("--overlaps", type=int, nargs="+", default=[0, 100])
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 4, 10])
+    parser.add_argument("--rerank-model", help="Also evaluate with this local cross-encoder re-ranking")
+    parser.add_argument("--rerank-candidates", type=int, default=20, help="Chunks fetched for the re-ranker")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--verbose", action="store_true", help="Show ingestion output")
+    args = parser.parse_args()
+
+    register_embedding_model(HASHING_MODEL, HashingEmbeddingModel())
+    # No score cache or budget: every query pays the full re-ranking cost
+    reranker = None
+    if args.rerank_model:
+        reranker = CrossEncoderReranker(args.rerank_model, latency_budget=None, cache_size=0)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        corpus = args.corpus
+        if corpus is None:
+            corpus = tmp / "corpus"
+            generate_corpus(corpus, args.docs, args.facts_per_doc)
+        questions, gold = load_questions(corpus)
+        if not questions:
+            sys.exit("❌ No usable questions in the corpus")
+        print(f"📚 {len(questions)} questions over {len(set(g[0] for g in gold))} documents")
+
+        rows = []
+        failed_models = set()
+        configs = list(itertools.product(args.models, args.chunk_sizes, args.overlaps))
+        for n, (model, chunk_size, overlap) in enumerate(configs):
+            if overlap >= chunk_size:
+                print(f"⚠️ Skipping chunk_size={chunk_size} overlap={overlap}: overlap must be smaller")
+                continue
+            if model in failed_models:
+                continue
+            print(f"🔄 [{n + 1}/{len(configs)}] {model} chunk_size={chunk_size} overlap={overlap}")
+            try:
+                rows.extend(evaluate(corpus, questions, gold, model, chunk_size, overlap,
+                                     sorted(args.k), tmp / f"db_{n}", args.verbose,
+                                     reranker, args.rerank_candidates))
+            except Exception as e:
+                # Typically a model that is neither a local path nor cached
+                print(f"❌ {model} chunk_size={chunk_size} overlap={overlap} failed: {e}")
+                failed_models.add(model)
+
+    print()
+    print_table(rows)
+    if args.json:
+        args.json.write_text(json.dumps(rows, indent=2), encoding="utf-8")
+        print(f"\n✅ Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Snapshot Benchmark
+Compares restoring a populated vector store from a snapshot (export_snapshot /
+load_snapshot) against re-ingesting it, i.e. re-embedding every chunk.
+
+Re-ingestion time is the embedding time of a sample of chunks, extrapolated
+linearly (so a 1M-chunk comparison does not take hours with a real model),
+plus the measured time of inserting every chunk with precomputed vectors.
+
+Usage (from the project root):
+    python benchmarks/snapshot_benchmark.py --chunks 1000000 --model hashing
+    python benchmarks/snapshot_benchmark.py --chunks 100000 --model sentence-transformers/all-MiniLM-L6-v2
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from embedding_models import register_embedding_model
+from retrieval_eval import HASHING_MODEL, HashingEmbeddingModel, filler
+from vector_store import ChromaVectorStore
+
+
+def dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot load vs re-ingestion time")
+    parser.add_argument("--chunks", type=int, default=100_000, help="Chunks in the store")
+    parser.add_argument("--model", default=HASHING_MODEL, help="Embedding model used for re-ingestion")
+    parser.add_argument("--reingest-sample", type=int, default=10_000, help="Chunks re-embedded to extrapolate from")
+    parser.add_argument("--storage-mode", default="float32", choices=["float32", "int8", "float16"])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    register_embedding_model(HASHING_MODEL, HashingEmbeddingModel())
+    rng = random.Random(0)
+    texts = [" ".join(filler(rng) for _ in range(6)) for _ in range(args.chunks)]
+    ids = [f"doc_{i // 10}.txt_chunk_{i % 10}" for i in range(args.chunks)]
+    metadatas = [{'source': f"docs/doc_{i // 10}.txt", 'filename': f"doc_{i // 10}.txt",
+                  'chunk_id': i % 10, 'start_index': (i % 10) * 800, 'end_index': (i % 10) * 800 + len(text)}
+                 for i, text in enumerate(texts)]
+
+    with tempfile.TemporaryDirectory() as tmp, contextlib.redirect_stdout(io.StringIO()):
+        tmp = Path(tmp)
+
+        def open_store(name):
+            return ChromaVectorStore(str(tmp / name), embedding_model=args.model,
+                                     embedding_cache_size=0, storage_mode=args.storage_mode)
+
+        # Embedding cost of re-ingestion, on a sample
+        source = open_store("source")
+        sample = min(args.reingest_sample, args.chunks)
+        source.embed_documents(texts[:8])  # Load the model outside the timing
+        start = time.perf_counter()
+        for i in range(0, sample, args.batch_size):
+            source.embed_documents(texts[i:min(i + args.batch_size, sample)])
+        embed_time = (time.perf_counter() - start) * args.chunks / sample
+        dim = source.embedding_model.get_sentence_embedding_dimension()
+
+        # Insert cost of re-ingestion: populate the source store with precomputed vectors
+        vectors = np.random.default_rng(0).normal(size=(args.chunks, dim)).astype(np.float32)
+        start = time.perf_counter()
+        for i in range(0, args.chunks, args.batch_size):
+            source.add_documents(texts[i:i + args.batch_size], metadatas[i:i + args.batch_size],
+                                 ids[i:i + args.batch_size], embeddings=vectors[i:i + args.batch_size])
+        insert_time = time.perf_counter() - start
+        reingest = embed_time + insert_time
+        del vectors
+
+        start = time.perf_counter()
+        source.export_snapshot(str(tmp / "snapshot"), batch_size=args.batch_size)
+        export_time = time.perf_counter() - start
+
+        target = open_store("target")
+        start = time.perf_counter()
+        target.load_snapshot(str(tmp / "snapshot"), batch_size=args.batch_size)
+        load_time = time.perf_counter() - start
+        loaded = target.collection.count()
+        snapshot_mib = dir_size(tmp / "snapshot") / 2**20
+        store_mib = dir_size(tmp / "source") / 2**20
+
+    print(f"{args.chunks} chunks, {dim}-d embeddings, model {args.model}, storage {args.storage_mode}")
+    print(f"  store on disk:     {store_mib:10.1f} MiB")
+    print(f"  snapshot on disk:  {snapshot_mib:10.1f} MiB")
+    print(f"  export:            {export_time:10.1f} s")
+    print(f"  load snapshot:     {load_time:10.1f} s  ({loaded} chunks)")
+    print(f"  re-ingest (est.):  {reingest:10.1f} s  "
+          f"(embed {embed_time:.1f} s from {sample} chunks + insert {insert_time:.1f} s)")
+    print(f"  load / re-ingest:  {load_time / reingest:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Cold-Start Benchmark
+Times a fresh process from `import app` to a built Gradio interface, and
+separately the first query (opening a vector store and embedding the
+question, which is where the model is now loaded).
+
+Run it against two checkouts to compare before/after a change:
+    python benchmarks/startup_benchmark.py --repeat 5
+    python benchmarks/startup_benchmark.py --repeat 5 --src /path/to/old/checkout/src
+
+Without network access to the Hugging Face Hub, --stand-in-model writes a
+model with the same architecture as all-MiniLM-L6-v2 (random weights,
+synthetic vocabulary) where the model name resolves to a local directory,
+so load times match the real model.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+
+STARTUP_SNIPPET = """
+import time
+start = time.perf_counter()
+import app
+rag_app = app.RAGChatApp()
+rag_app.create_interface()
+ready = time.perf_counter()
+from vector_store import ChromaVectorStore
+store = ChromaVectorStore(persist_directory=rag_app.vector_store_path)
+store.embedding_model.encode(["warm up"])
+store.similarity_search("warm up", k=1)
+print(f"{ready - start:.4f} {time.perf_counter() - ready:.4f}")
+"""
+
+
+def build_stand_in_model(workdir: str):
+    """Save an untrained all-MiniLM-L6-v2-shaped model at ./<MODEL_NAME> in workdir."""
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    base = Path(workdir) / "stand_in_bert"
+    base.mkdir(parents=True, exist_ok=True)
+    specials = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]"]
+    letters = [chr(c) for c in range(33, 127)]
+    filler = [f"tok{i}" for i in range(30522 - len(specials) - 2 * len(letters))]
+    (base / "vocab.txt").write_text("\n".join(specials + letters + [f"##{c}" for c in letters] + filler))
+
+    config = BertConfig(vocab_size=30522, hidden_size=384, num_hidden_layers=6, num_attention_heads=12,
+                        intermediate_size=1536, max_position_embeddings=512)
+    BertModel(config).save_pretrained(base)
+    BertTokenizerFast(vocab_file=str(base / "vocab.txt")).save_pretrained(base)
+
+    transformer = models.Transformer(str(base), max_seq_length=256)
+    pooling = models.Pooling(transformer.get_word_embedding_dimension(), pooling_mode="mean")
+    SentenceTransformer(modules=[transformer, pooling, models.Normalize()]).save(str(Path(workdir) / MODEL_NAME))
+
+
+def run_once(workdir: str, src_dir: Path) -> tuple:
+    env = dict(os.environ, PYTHONPATH=str(src_dir), ANONYMIZED_TELEMETRY="False")
+    result = subprocess.run(
+        [sys.executable, "-c", STARTUP_SNIPPET],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+    ready, first_query = result.stdout.strip().splitlines()[-1].split()
+    return float(ready), float(first_query)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure RAG app cold-start time")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--src", type=Path, default=SRC_DIR, help="src directory of the checkout to measure")
+    parser.add_argument("--stand-in-model", action="store_true",
+                        help="use a local same-architecture model instead of downloading the real one")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if args.stand_in_model:
+            build_stand_in_model(workdir)
+        runs = [run_once(workdir, args.src) for _ in range(args.repeat)]
+
+    ready = [r[0] for r in runs]
+    first_query = [r[1] for r in runs]
+    print(f"Interface ready:  median {statistics.median(ready):.2f}s  (min {min(ready):.2f}s)")
+    print(f"First query:      median {statistics.median(first_query):.2f}s  (min {min(first_query):.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""
+Semantic Answer Cache
+Reuses generated answers for near-duplicate questions that retrieve the same chunks.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Optional, Set
+
+import numpy as np
+
+
+class _Entry:
+    __slots__ = ('embedding', 'chunk_ids', 'value', 'created_at')
+
+    def __init__(self, embedding: np.ndarray, chunk_ids: frozenset, value: Any, created_at: float):
+        self.embedding = embedding
+        self.chunk_ids = chunk_ids
+        self.value = value
+        self.created_at = created_at
+
+
+class SemanticAnswerCache:
+    """
+    In-memory cache of answers keyed by query embedding and retrieved chunk ids.
+
+    A lookup hits when a live entry retrieved exactly the same chunk ids and
+    its query embedding has cosine similarity >= `similarity_threshold` with
+    the new query. Entries expire after `ttl` seconds, the least recently
+    used entry is evicted beyond `max_entries`, and entries backed by a chunk
+    are dropped when that chunk is re-ingested or removed.
+
+    Answers are generated after retrieval, so a chunk can change while one is
+    being written. Callers call begin() when they retrieve, pass the returned
+    generation to put(), and hand it back with end() whether or not they put;
+    the answer is discarded if any of its chunks was invalidated since.
+    Invalidations older than every answer still in flight are forgotten, so
+    that bookkeeping stays bounded however many chunks are re-ingested.
+    """
+
+    def __init__(self,
+                 max_entries: int = 256,
+                 ttl: Optional[float] = 3600.0,
+                 similarity_threshold: float = 0.95,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the answer cache.
+
+        Args:
+            max_entries: Maximum number of cached answers
+            ttl: Seconds an answer stays valid (None disables expiry)
+            similarity_threshold: Minimum query cosine similarity for a hit
+            clock: Time source (monotonic seconds)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self._clock = clock
+
+        self._entries: 'OrderedDict[int, _Entry]' = OrderedDict()
+        self._by_chunks: Dict[frozenset, Set[int]] = {}
+        self._by_chunk_id: Dict[str, Set[int]] = {}
+        self._next_key = 0
+        self._lock = threading.Lock()
+
+        # Invalidation counter, and the count at which each chunk id last changed
+        self._generation = 0
+        self._invalidated_at: Dict[str, int] = {}
+        # Generations handed out by begin() and not yet ended, with their counts
+        self._in_flight: Dict[int, int] = {}
+        # Invalidations up to here were forgotten; older generations can't be checked
+        self._forgotten_through = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.stale_puts = 0
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        embedding = np.asarray(embedding, dtype=np.float32).reshape(-1)
+        return embedding / max(float(np.linalg.norm(embedding)), 1e-12)
+
+    def _expired(self, entry: _Entry, now: float) -> bool:
+        return self.ttl is not None and now - entry.created_at > self.ttl
+
+    def _remove(self, key: int):
+        entry = self._entries.pop(key)
+        keys = self._by_chunks[entry.chunk_ids]
+        keys.discard(key)
+        if not keys:
+            del self._by_chunks[entry.chunk_ids]
+        for chunk_id in entry.chunk_ids:
+            keys = self._by_chunk_id[chunk_id]
+            keys.discard(key)
+            if not keys:
+                del self._by_chunk_id[chunk_id]
+
+    def get(self, query_embedding, chunk_ids: Iterable[str]) -> Optional[Any]:
+        """
+        Look up a cached answer.
+
+        Args:
+            query_embedding: Embedding of the new question
+            chunk_ids: Ids of the chunks retrieved for it
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        chunk_ids = frozenset(chunk_ids)
+        query = self._normalize(query_embedding)
+
+        with self._lock:
+            now = self._clock()
+            best_key, best_similarity = None, self.similarity_threshold
+            # Only entries with the same retrieved chunks are candidates
+            for key in list(self._by_chunks.get(chunk_ids, ())):
+                entry = self._entries[key]
+                if self._expired(entry, now):
+                    self._remove(key)
+                    continue
+                similarity = float(entry.embedding @ query)
+                if similarity >= best_similarity:
+                    best_key, best_similarity = key, similarity
+
+            if best_key is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return self._entries[best_key].value
+
+    @property
+    def generation(self) -> int:
+        """Number of invalidations so far."""
+        return self._generation
+
+    def begin(self) -> int:
+        """Current generation, held until end(); call it when the backing chunks are retrieved."""
+        with self._lock:
+            self._in_flight[self._generation] = self._in_flight.get(self._generation, 0) + 1
+            return self._generation
+
+    def end(self, generation: int):
+        """Release a generation from begin() once its answer is put or abandoned."""
+        with self._lock:
+            remaining = self._in_flight.pop(generation, 0) - 1
+            if remaining > 0:
+                self._in_flight[generation] = remaining
+            self._forget_invalidations()
+
+    def _forget_invalidations(self):
+        # No put can still need an invalidation at or below the oldest generation in flight
+        oldest = min(self._in_flight, default=self._generation)
+        if oldest <= self._forgotten_through:
+            return
+        self._invalidated_at = {
+            chunk_id: generation for chunk_id, generation in self._invalidated_at.items() if generation > oldest
+        }
+        self._forgotten_through = oldest
+
+    def put(self, query_embedding, chunk_ids: Iterable[str], value: Any, generation: Optional[int] = None):
+        """
+        Cache a value for a question and the chunks that backed it.
+
+        Args:
+            query_embedding: Embedding of the question
+            chunk_ids: Ids of the chunks the value was built from
+            value: Value to cache
+            generation: From begin() when the chunks were retrieved; the value
+                is dropped if any of them has been invalidated since
+        """
+        if self.max_entries <= 0:
+            return
+        chunk_ids = frozenset(chunk_ids)
+
+        with self._lock:
+            if generation is not None and (
+                # Not held with begin(), and what changed since has been forgotten
+                generation < self._forgotten_through
+                or any(self._invalidated_at.get(chunk_id, -1) > generation for chunk_id in chunk_ids)
+            ):
+                self.stale_puts += 1
+                return
+            key = self._next_key
+            self._next_key += 1
+            self._entries[key] = _Entry(self._normalize(query_embedding), chunk_ids, value, self._clock())
+            self._by_chunks.setdefault(chunk_ids, set()).add(key)
+            for chunk_id in chunk_ids:
+                self._by_chunk_id.setdefault(chunk_id, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate_chunks(self, chunk_ids: Iterable[str]) -> int:
+        """Drop every cached answer backed by any of these chunks; returns how many."""
+        with self._lock:
+            self._generation += 1
+            keys: Set[int] = set()
+            for chunk_id in chunk_ids:
+                # Recorded even without cached entries: an answer may be in flight
+                self._invalidated_at[chunk_id] = self._generation
+                keys.update(self._by_chunk_id.get(chunk_id, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            self._forget_invalidations()
+            return len(keys)
+
+    def clear(self):
+        """Remove all cached answers."""
+        with self._lock:
+            self._entries.clear()
+            self._by_chunks.clear()
+            self._by_chunk_id.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics."""
+        total = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+            'stale_puts': self.stale_puts
+        }
@@ -8,12 +8,15 @@ import os
 from pathlib import Path
 import json
 import time
-from typing import List, Tuple
+from typing import Iterator, List, Tuple
+from collections import Counter
 import shutil
 import signal
 import sys
+import threading
 
 from rag_system import RAGSystem, RAGResponse
+from rag_service import RAGService
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -23,8 +26,13 @@ class RAGChatApp:
     def __init__(self):
         """Initialize the RAG chat application."""
         self.rag_system = None
+        self.service = None
         self.chat_history = []
         
+        # Uploaded files still waiting for an ingestion job; deleted once none needs them
+        self._pending_uploads = Counter()
+        self._uploads_lock = threading.Lock()
+        
         # Check if vector store exists
         self.vector_store_path = "./chroma_db"
         self.has_documents = self._check_existing_documents()
@@ -40,9 +48,7 @@ class RAGChatApp:
         """Check if there are existing documents in the vector store."""
         try:
             from vector_store import ChromaVectorStore
-            temp_store = ChromaVectorStore(persist_directory=self.vector_store_path)
-            count = temp_store.collection.count()
-            return count > 0
+            return ChromaVectorStore.count_documents(self.vector_store_path) > 0
         except Exception:
             return False
     
@@ -51,20 +57,23 @@ class RAGChatApp:
         try:
             if self.rag_system is None:
                 self.rag_system = RAGSystem(vector_store_path=self.vector_store_path)
+                self.service = RAGService(self.rag_system)
             return True, "✅ RAG system initialized successfully!"
         except Exception as e:
             return False, f"❌ Error initializing RAG system: {str(e)}"
     
-    def upload_documents(self, files) -> Tuple[str, str]:
-        """Handle document upload and processing with improved error handling."""
+    def upload_documents(self, files) -> Iterator[Tuple[str, str]]:
+        """Queue uploaded documents for background ingestion and stream its progress."""
         if not files:
-            return "⚠️ No files uploaded.", ""
+            yield "⚠️ No files uploaded.", ""
+            return
         
         try:
             # Initialize RAG system if needed
             success, message = self.initialize_rag_system()
             if not success:
-                return message, ""
+                yield message, ""
+                return
             
             # Save uploaded files
             uploaded_files = []
@@ -86,82 +95,115 @@ class RAGChatApp:
                         skipped_files.append(f"{file.name} (error: {str(e)})")
             
             if not uploaded_files:
-                return "⚠️ No valid files found to process.", ""
+                yield "⚠️ No valid files found to process.", ""
+                return
+            
+            # Ingest in the background; chat keeps answering from the last committed batch
+            print(f"Processing {len(uploaded_files)} files...")
+            with self._uploads_lock:
+                self._pending_uploads.update(uploaded_files)
+            # Uploaded files are deleted after processing, so the upload dir
+            # never holds the full corpus; don't treat absent files as deleted.
+            job = self.service.submit_ingest(
+                str(self.upload_dir),
+                remove_missing=False,
+                on_done=lambda job: self._cleanup_uploads(uploaded_files)
+            )
+            
+            while not job.finished:
+                yield (f"⏳ Processing documents ({job.job_id}): {job.files_done}/{job.files_total} files "
+                       f"({job.progress:.0%})\nYou can keep chatting while this runs."), ""
+                time.sleep(0.5)
+            
+            if job.status == "failed":
+                yield f"❌ Error processing documents: {job.error}", ""
+                return
+            
+            stats = job.stats
+            self.has_documents = True
+            
+            # Format result message
+            result_message = f"""✅ Document Processing Complete!
             
-            # Process documents with proper cleanup and progress updates
-            try:
-                print(f"Processing {len(uploaded_files)} files...")
-                stats = self.rag_system.ingest_documents(str(self.upload_dir))
-                self.has_documents = True
-                
-                # Format result message
-                result_message = f"""✅ Document Processing Complete!
-                
 📊 Statistics:
 • Files processed successfully: {len(uploaded_files)}
 • Files skipped: {len(skipped_files)}
 • Chunks created: {stats.get('chunks_created', 0)}
+• Chunks embedded: {stats.get('chunks_embedded', 0)} (unchanged: {stats.get('chunks_unchanged', 0)}, removed: {stats.get('chunks_removed', 0)})
+• Unchanged files skipped: {stats.get('files_skipped', 0)}
 • Processing time: {stats.get('processing_time', 0):.2f}s
 • Total documents in store: {stats.get('vector_store_stats', {}).get('total_documents', 0)}
 
 """
-                # Add skipped files information if any
-                if skipped_files:
-                    result_message += "\n⚠️ Skipped files:\n" + "\n".join(f"- {f}" for f in skipped_files)
-                
-                result_message += "\n🎉 You can now start asking questions!"
-                
-                return result_message, "Documents processed successfully! Ask your first question below."
-                
-            except Exception as e:
-                return f"❌ Error processing documents: {str(e)}", ""
-                
-            finally:
-                # Clean up uploaded files after processing
-                for file_path in uploaded_files:
-                    try:
-                        if os.path.exists(file_path):
-                            os.remove(file_path)
-                    except Exception as e:
-                        print(f"Warning: Could not remove temporary file {file_path}: {e}")
+            # Add skipped files information if any
+            if skipped_files:
+                result_message += "\n⚠️ Skipped files:\n" + "\n".join(f"- {f}" for f in skipped_files)
+            
+            result_message += "\n🎉 You can now start asking questions!"
+            
+            yield result_message, "Documents processed successfully! Ask your first question below."
                     
         except Exception as e:
-            return f"❌ Error during upload: {str(e)}", ""
+            yield f"❌ Error during upload: {str(e)}", ""
     
-    def chat(self, message: str, history: List[List[str]]) -> Tuple[str, List[List[str]]]:
-        """Handle chat interactions."""
+    def _cleanup_uploads(self, uploaded_files: List[str]):
+        """Delete uploaded files once no queued ingestion job still needs them."""
+        with self._uploads_lock:
+            for file_path in uploaded_files:
+                self._pending_uploads[file_path] -= 1
+                if self._pending_uploads[file_path] > 0:
+                    continue
+                del self._pending_uploads[file_path]
+                try:
+                    if os.path.exists(file_path):
+                        os.remove(file_path)
+                except Exception as e:
+                    print(f"Warning: Could not remove temporary file {file_path}: {e}")
+    
+    def chat(self, message: str, history: List[List[str]]) -> Iterator[Tuple[str, List[List[str]]]]:
+        """Handle chat interactions, streaming the answer into the chat as it is generated."""
         if not message.strip():
-            return "", history
+            yield "", history
+            return
         
+        streaming = False
         try:
             # Initialize RAG system if needed
             if self.rag_system is None:
                 success, init_message = self.initialize_rag_system()
                 if not success:
                     history.append([message, init_message])
-                    return "", history
+                    yield "", history
+                    return
             
-            # Check if documents are available
+            # Check if documents are available (the first upload may still be committing batches)
+            if not self.has_documents:
+                self.has_documents = self.rag_system.vector_store.collection.count() > 0
             if not self.has_documents:
                 response = "⚠️ No documents have been uploaded yet. Please upload some documents first to enable Q&A."
                 history.append([message, response])
-                return "", history
+                yield "", history
+                return
             
-            # Get response from RAG system
-            rag_response = self.rag_system.query(message, k=4)
-            
-            # Format response with sources
-            formatted_response = self._format_response(rag_response)
-            
-            # Add to history
-            history.append([message, formatted_response])
-            
-            return "", history
+            # Show the answer token by token, then replace it with the formatted response
+            history.append([message, "🤖 **Answer:**\n▌"])
+            streaming = True
+            answer = ""
+            for item in self.service.query_stream(message, k=4):
+                if isinstance(item, RAGResponse):
+                    history[-1][1] = self._format_response(item)
+                else:
+                    answer += item
+                    history[-1][1] = f"🤖 **Answer:**\n{answer}▌"
+                yield "", history
             
         except Exception as e:
             error_response = f"❌ Error processing your question: {str(e)}"
-            history.append([message, error_response])
-            return "", history
+            if streaming:
+                history[-1][1] = error_response
+            else:
+                history.append([message, error_response])
+            yield "", history
     
     def _format_response(self, rag_response: RAGResponse) -> str:
         """Format the RAG response for display."""
@@ -172,17 +214,48 @@ class RAGChatApp:
         if rag_response.sources:
             response_parts.append("\n📚 **Sources:**")
             for i, source in enumerate(rag_response.sources, 1):
-                similarity_bar = "🟢" if source['similarity'] > 0.8 else "🟡" if source['similarity'] > 0.6 else "🟠"
+                similarity = source['similarity']
+                if similarity is None:
+                    # Found by the keyword index only
+                    response_parts.append(
+                        f"{i}. 🔤 **{source['source']}** (keyword match)\n"
+                        f"   _{source['content']}_"
+                    )
+                    continue
+                similarity_bar = "🟢" if similarity > 0.8 else "🟡" if similarity > 0.6 else "🟠"
+                rerank = ""
+                if source.get('rerank_score') is not None:
+                    rerank = f", re-rank: {source['rerank_score']:.2f}"
                 response_parts.append(
-                    f"{i}. {similarity_bar} **{source['source']}** (similarity: {source['similarity']:.3f})\n"
+                    f"{i}. {similarity_bar} **{source['source']}** (similarity: {similarity:.3f}{rerank})\n"
                     f"   _{source['content']}_"
                 )
         
+        if rag_response.cache_hit:
+            generation = "cached answer"
+        elif rag_response.time_to_first_token is not None:
+            generation = (f"{rag_response.generation_time:.3f}s "
+                          f"(first token {rag_response.time_to_first_token:.3f}s)")
+        else:
+            generation = f"{rag_response.generation_time:.3f}s"
+        rerank = ""
+        if rag_response.rerank_time is not None:
+            rerank = f"Re-rank: {rag_response.rerank_time:.3f}s | "
+        total = ""
+        if rag_response.total_time is not None:
+            total = f"Total: {rag_response.total_time:.3f}s | "
         response_parts.append(
             f"\n⏱️ *Retrieval: {rag_response.retrieval_time:.3f}s | "
-            f"Generation: {rag_response.generation_time:.3f}s | "
+            f"{rerank}"
+            f"Generation: {generation} | "
+            f"{total}"
             f"Model: {rag_response.model_used}*"
         )
+        if rag_response.context_tokens is not None:
+            response_parts.append(
+                f"*Context: {rag_response.context_tokens} tokens "
+                f"({rag_response.tokens_saved} saved by merging overlaps and duplicates)*"
+            )
         
         return "\n".join(response_parts)
     
@@ -200,7 +273,11 @@ class RAGChatApp:
 
 **LLM Provider:** {stats['llm_provider']} ({stats['llm_model']})
 **Vector Store:** ChromaDB with {stats['vector_store']['total_documents']} documents
-**Embedding Model:** {stats['vector_store']['embedding_model']} dimensions
+**Embedding Model:** {self._format_embedding_model(stats['vector_store'])}
+**Embedding Cache:** {self._format_cache_stats(stats['vector_store'].get('embedding_cache'))}
+**Keyword Index:** {self._format_keyword_index(stats.get('keyword_index'))}
+**Answer Cache:** {self._format_cache_stats(stats.get('answer_cache'))}
+**Re-ranker:** {self._format_reranker(stats.get('reranker'))}
 **Chunk Size:** {stats['document_processor']['chunk_size']} characters
 **Supported Formats:** {', '.join(stats['document_processor']['supported_formats'])}
 
@@ -211,6 +288,33 @@ class RAGChatApp:
         except Exception as e:
             return f"❌ Error getting system info: {str(e)}"
     
+    def _format_embedding_model(self, vector_stats) -> str:
+        """Format the embedding model line (the model is only loaded on first use)."""
+        dimension = vector_stats.get('embedding_model')
+        name = vector_stats.get('embedding_model_name', '')
+        if dimension is None:
+            return f"{name} (loads on first use)"
+        return f"{name} ({dimension} dimensions)"
+    
+    def _format_cache_stats(self, cache_stats) -> str:
+        """Format cache counters for display."""
+        if not cache_stats:
+            return "disabled"
+        return (f"{cache_stats['entries']} entries, {cache_stats['hits']} hits / "
+                f"{cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%} hit rate)")
+    
+    def _format_reranker(self, reranker_stats) -> str:
+        """Format re-ranker model and score cache for display."""
+        if not reranker_stats:
+            return "disabled"
+        return f"{reranker_stats['model']}; score cache {self._format_cache_stats(reranker_stats)}"
+    
+    def _format_keyword_index(self, index_stats) -> str:
+        """Format BM25 index size for display."""
+        if not index_stats:
+            return "disabled (vector search only)"
+        return f"BM25 over {index_stats['documents']} chunks, {index_stats['terms']} terms"
+    
     def clear_chat(self):
         """Clear chat history."""
         return []
@@ -339,6 +443,9 @@ class RAGChatApp:
             # Clean up temporary upload directory
             shutil.rmtree(self.upload_dir, ignore_errors=True)
             
+            if self.service is not None:
+                self.service.close()
+            
             # Close ChromaDB client if exists
             if self.rag_system and self.rag_system.vector_store:
                 self.rag_system.vector_store.client._client.close()
@@ -374,6 +481,8 @@ def main():
         print("🚀 Starting RAG Chat Application...")
         print("💡 Open http://localhost:7860 in your browser")
         
+        # Chat and upload are separate queued events, so a running upload never blocks chat
+        interface.queue()
         interface.launch(
             server_name="0.0.0.0",
             server_port=7860,
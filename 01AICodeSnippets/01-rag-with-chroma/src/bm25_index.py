@@ -0,0 +1,381 @@
+"""
+BM25 Keyword Index
+Incremental inverted index with array-backed postings, used alongside dense retrieval.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+
+import numpy as np
+
+_TOKEN = re.compile(r'\w+(?:[-.:/]\w+)*')
+_PART = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase word tokens.
+
+    Compound tokens such as error codes ("ERR-404", "v1.2.3") are kept whole
+    and also split into their parts, so both exact and partial lookups match.
+    """
+    tokens = []
+    for match in _TOKEN.finditer(text.lower()):
+        token = match.group()
+        tokens.append(token)
+        if not token.isalnum():
+            tokens.extend(_PART.findall(token))
+    return tokens
+
+
+def reciprocal_rank_fusion(rankings: Iterable[List[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Fuse ranked id lists with reciprocal-rank fusion.
+
+    Args:
+        rankings: Ranked lists of ids, best first
+        k: RRF damping constant
+
+    Returns:
+        (id, fused score) pairs, best first
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class _Segment:
+    """
+    Immutable batch of documents with CSR postings.
+
+    Postings of term t are doc_rows/tfs[offsets[t]:offsets[t + 1]], where rows
+    are local to the segment. Deleted rows are masked out via `live`.
+    """
+
+    def __init__(self,
+                 name: str,
+                 ids: List[str],
+                 doc_lengths: np.ndarray,
+                 terms: Dict[str, int],
+                 offsets: np.ndarray,
+                 doc_rows: np.ndarray,
+                 tfs: np.ndarray):
+        self.name = name
+        self.ids = ids
+        self.doc_lengths = doc_lengths
+        self.terms = terms
+        self.offsets = offsets
+        self.doc_rows = doc_rows
+        self.tfs = tfs
+        self.live = np.ones(len(ids), dtype=bool)
+        self.saved = False
+
+    @classmethod
+    def build(cls, name: str, ids: List[str], token_counts: List[Counter]) -> '_Segment':
+        """Build a segment from per-document term counts."""
+        postings: Dict[str, Tuple[List[int], List[int]]] = {}
+        for row, counts in enumerate(token_counts):
+            for term, tf in counts.items():
+                rows, tfs = postings.setdefault(term, ([], []))
+                rows.append(row)
+                tfs.append(tf)
+
+        terms = sorted(postings)
+        sizes = np.fromiter((len(postings[t][0]) for t in terms), dtype=np.int64, count=len(terms))
+        offsets = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(sizes, out=offsets[1:])
+        doc_rows = np.fromiter((r for t in terms for r in postings[t][0]), dtype=np.int32, count=int(offsets[-1]))
+        tfs = np.fromiter((f for t in terms for f in postings[t][1]), dtype=np.int32, count=int(offsets[-1]))
+        doc_lengths = np.fromiter((sum(c.values()) for c in token_counts), dtype=np.int32, count=len(ids))
+        return cls(name, list(ids), doc_lengths, {t: i for i, t in enumerate(terms)}, offsets, doc_rows, tfs)
+
+    @classmethod
+    def merge(cls, name: str, segments: List['_Segment']) -> '_Segment':
+        """Merge segments into one, dropping deleted documents."""
+        ids: List[str] = []
+        token_counts: List[Counter] = []
+        for segment in segments:
+            inverse: List[Counter] = [Counter() for _ in segment.ids]
+            for term, t in segment.terms.items():
+                start, end = segment.offsets[t], segment.offsets[t + 1]
+                for row, tf in zip(segment.doc_rows[start:end].tolist(), segment.tfs[start:end].tolist()):
+                    inverse[row][term] = tf
+            for row, chunk_id in enumerate(segment.ids):
+                if segment.live[row]:
+                    ids.append(chunk_id)
+                    token_counts.append(inverse[row])
+        return cls.build(name, ids, token_counts)
+
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Live (rows, term frequencies) for a term."""
+        t = self.terms.get(term)
+        if t is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        start, end = self.offsets[t], self.offsets[t + 1]
+        rows, tfs = self.doc_rows[start:end], self.tfs[start:end]
+        keep = self.live[rows]
+        return rows[keep], tfs[keep]
+
+    def save(self, path: Path):
+        terms = sorted(self.terms, key=self.terms.get)
+        with open(path, 'wb') as f:
+            np.savez(
+                f,
+                ids=np.array(self.ids, dtype=str),
+                doc_lengths=self.doc_lengths,
+                terms=np.array(terms, dtype=str),
+                offsets=self.offsets,
+                doc_rows=self.doc_rows,
+                tfs=self.tfs
+            )
+        self.saved = True
+
+    @classmethod
+    def load(cls, name: str, path: Path) -> '_Segment':
+        with np.load(path, allow_pickle=False) as data:
+            terms = data['terms'].tolist()
+            segment = cls(
+                name,
+                data['ids'].tolist(),
+                data['doc_lengths'],
+                {t: i for i, t in enumerate(terms)},
+                data['offsets'],
+                data['doc_rows'],
+                data['tfs']
+            )
+        segment.saved = True
+        return segment
+
+
+class BM25Index:
+    """
+    Okapi BM25 index over chunk texts, keyed by chunk id.
+
+    Documents are added in batches that each become an in-memory segment;
+    `commit()` merges the batches written since the last commit into one
+    segment file, and compacts everything once there are too many segments
+    or too many deleted documents. Deletes only mark rows dead, so nothing
+    is rebuilt on a normal ingest.
+    """
+
+    MAX_SEGMENTS = 8
+    MAX_DELETED_RATIO = 0.25
+
+    def __init__(self, directory: str, k1: float = 1.5, b: float = 0.75):
+        """
+        Open (or create) a BM25 index.
+
+        Args:
+            directory: Directory holding the index segments
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.k1 = k1
+        self.b = b
+
+        self.segments: List[_Segment] = []
+        self.locations: Dict[str, Tuple[_Segment, int]] = {}
+        self.deleted: List[Tuple[str, int]] = []   # Tombstones not yet written
+        self._next_segment = 0
+        self._lock = threading.RLock()
+        self._load()
+
+    # ---- persistence -------------------------------------------------
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name
+
+    def _load(self):
+        meta_path = self._path('meta.json')
+        if not meta_path.exists():
+            return
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        self._next_segment = meta['next_segment']
+        for name in meta['segments']:
+            segment = _Segment.load(name, self._path(f"{name}.npz"))
+            self.segments.append(segment)
+
+        by_name = {segment.name: segment for segment in self.segments}
+        if self._path('deleted.txt').exists():
+            with open(self._path('deleted.txt'), 'r', encoding='utf-8') as f:
+                for line in f:
+                    name, _, row = line.strip().partition(' ')
+                    if name in by_name:
+                        by_name[name].live[int(row)] = False
+
+        # Later segments win if an id was re-added
+        for segment in self.segments:
+            for row, chunk_id in enumerate(segment.ids):
+                if segment.live[row]:
+                    self.locations[chunk_id] = (segment, row)
+
+    def _save_meta(self):
+        tmp = self._path('meta.json.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({
+                'next_segment': self._next_segment,
+                'segments': [segment.name for segment in self.segments]
+            }, f)
+        os.replace(tmp, self._path('meta.json'))
+
+    def _new_segment_name(self) -> str:
+        name = f"seg_{self._next_segment:06d}"
+        self._next_segment += 1
+        return name
+
+    def commit(self):
+        """Persist documents added and deleted since the last commit."""
+        with self._lock:
+            unsaved = [segment for segment in self.segments if not segment.saved]
+            if len(unsaved) > 1:
+                merged = _Segment.merge(self._new_segment_name(), unsaved)
+                self._replace_segments(unsaved, merged)
+            for segment in self.segments:
+                if not segment.saved:
+                    segment.save(self._path(f"{segment.name}.npz"))
+
+            total = sum(len(segment.ids) for segment in self.segments)
+            deleted = total - len(self.locations)
+            if (len(self.segments) > self.MAX_SEGMENTS
+                    or (total and deleted / total > self.MAX_DELETED_RATIO)):
+                self._compact()
+                return
+
+            if self.deleted:
+                with open(self._path('deleted.txt'), 'a', encoding='utf-8') as f:
+                    f.writelines(f"{name} {row}\n" for name, row in self.deleted)
+                self.deleted.clear()
+            self._save_meta()
+
+    def _replace_segments(self, old: List[_Segment], merged: _Segment):
+        """Swap `old` segments for `merged` (which holds their live documents)."""
+        old_ids = {id(segment) for segment in old}
+        position = min(i for i, s in enumerate(self.segments) if id(s) in old_ids)
+        remaining = [s for s in self.segments if id(s) not in old_ids]
+        remaining.insert(min(position, len(remaining)), merged)
+        self.segments = remaining
+        for row, chunk_id in enumerate(merged.ids):
+            self.locations[chunk_id] = (merged, row)
+        old_names = {segment.name for segment in old}
+        self.deleted = [(name, row) for name, row in self.deleted if name not in old_names]
+
+    def _compact(self):
+        """Rewrite all live documents into a single segment."""
+        old = list(self.segments)
+        if old:
+            merged = _Segment.merge(self._new_segment_name(), old)
+            self._replace_segments(old, merged)
+            merged.save(self._path(f"{merged.name}.npz"))
+        self.deleted.clear()
+        self._save_meta()
+
+        live_files = {f"{segment.name}.npz" for segment in self.segments} | {'meta.json'}
+        for path in self.directory.iterdir():
+            if path.name not in live_files:
+                path.unlink()
+
+    # ---- writes ------------------------------------------------------
+
+    def add(self, ids: List[str], texts: List[str]):
+        """Add (or replace) documents; visible to searches immediately, durable after commit()."""
+        if not ids:
+            return
+        with self._lock:
+            self.delete(ids)
+            segment = _Segment.build(
+                self._new_segment_name(), ids, [Counter(tokenize(text)) for text in texts]
+            )
+            self.segments.append(segment)
+            for row, chunk_id in enumerate(ids):
+                self.locations[chunk_id] = (segment, row)
+
+    def delete(self, ids: List[str]):
+        """Mark documents deleted."""
+        with self._lock:
+            for chunk_id in ids:
+                location = self.locations.pop(chunk_id, None)
+                if location is None:
+                    continue
+                segment, row = location
+                segment.live[row] = False
+                if segment.saved:
+                    self.deleted.append((segment.name, row))
+
+    # ---- search ------------------------------------------------------
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Score documents against a query with BM25.
+
+        Args:
+            query: Query text
+            k: Number of results
+
+        Returns:
+            (chunk id, BM25 score) pairs, best first
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            n_docs = len(self.locations)
+            if not terms or n_docs == 0 or k <= 0:
+                return []
+
+            total_length = sum(int(s.doc_lengths[s.live].sum()) for s in self.segments)
+            avg_length = max(total_length / n_docs, 1e-9)
+
+            # Postings per term and segment, and live document frequencies
+            postings = {term: [segment.postings(term) for segment in self.segments] for term in terms}
+            scores = [np.zeros(len(segment.ids), dtype=np.float32) for segment in self.segments]
+            for term, per_segment in postings.items():
+                df = sum(len(rows) for rows, _ in per_segment)
+                if df == 0:
+                    continue
+                idf = np.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+                for segment, segment_scores, (rows, tfs) in zip(self.segments, scores, per_segment):
+                    if not len(rows):
+                        continue
+                    tf = tfs.astype(np.float32)
+                    norm = self.k1 * (1 - self.b + self.b * segment.doc_lengths[rows] / avg_length)
+                    segment_scores[rows] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+            all_scores = np.concatenate(scores)
+            matched = int(np.count_nonzero(all_scores))
+            if matched == 0:
+                return []
+            n = min(k, matched)
+            top = np.argpartition(-all_scores, n - 1)[:n]
+            top = top[np.argsort(-all_scores[top])]
+
+            bounds = np.cumsum([0] + [len(segment.ids) for segment in self.segments])
+            results = []
+            for index in top.tolist():
+                s = int(np.searchsorted(bounds, index, side='right')) - 1
+                results.append((self.segments[s].ids[index - bounds[s]], float(all_scores[index])))
+            return results
+
+    # ---- stats -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Index size statistics."""
+        with self._lock:
+            return {
+                'documents': len(self.locations),
+                'segments': len(self.segments),
+                'terms': len(set().union(*(segment.terms for segment in self.segments))),
+                'postings': sum(len(segment.doc_rows) for segment in self.segments),
+                'disk_bytes': sum(p.stat().st_size for p in self.directory.iterdir() if p.is_file())
+            }
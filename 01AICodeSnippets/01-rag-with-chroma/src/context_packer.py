@@ -0,0 +1,251 @@
+"""
+Context Packer
+Merges overlapping chunks, drops near-duplicate passages and fits the
+retrieved context into a token budget before it is sent to the LLM.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+_WORD = re.compile(r'\w+')
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken when available, else ~4 characters per token."""
+
+    def __init__(self, encoding_name: str = "cl100k_base"):
+        self._encoding = None
+        if tiktoken is not None:
+            try:
+                self._encoding = tiktoken.get_encoding(encoding_name)
+            except Exception as e:
+                # The BPE file is downloaded on first use and may be unavailable offline
+                print(f"⚠️ tiktoken unavailable ({e}); estimating tokens from length")
+
+    def count(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text))
+        return (len(text) + 3) // 4
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Cut text at a word boundary so it fits in max_tokens."""
+        if self.count(text) <= max_tokens:
+            return text
+        if self._encoding is not None:
+            text = self._encoding.decode(self._encoding.encode(text)[:max_tokens])
+        else:
+            text = text[:max_tokens * 4]
+        cut = text.rfind(' ')
+        return (text[:cut] if cut > 0 else text) + " ..."
+
+
+@dataclass
+class PackedContext:
+    passages: List[Dict[str, Any]]   # {'content', 'metadata', 'chunk_ids'} in rank order
+    tokens: int                      # Tokens of the packed context
+    tokens_saved: int                # Versus concatenating every chunk verbatim
+    chunks_merged: int = 0
+    chunks_dropped: int = 0          # Near duplicates and chunks that did not fit the budget
+    truncated: bool = False
+    dropped_ids: List[str] = field(default_factory=list)
+
+
+class ContextPacker:
+    """
+    Assembles retrieved chunks into a compact context.
+
+    1. Chunks from the same source whose `start_index`/`end_index` ranges
+       overlap or touch are stitched into one passage, removing the repeated
+       overlap text.
+    2. Passages whose word 5-gram shingles are mostly contained in a
+       higher-ranked passage are dropped as near duplicates.
+    3. Passages are added in rank order until the token budget is spent; the
+       first passage that does not fit is truncated if enough budget is left.
+    """
+
+    SHINGLE_SIZE = 5
+    MIN_TRUNCATED_TOKENS = 64
+
+    def __init__(self,
+                 token_budget: Optional[int] = 3000,
+                 duplicate_threshold: float = 0.9,
+                 token_counter: Optional[TokenCounter] = None):
+        """
+        Initialize the packer.
+
+        Args:
+            token_budget: Max context tokens (None = unlimited)
+            duplicate_threshold: Shingle containment above which a passage is a near duplicate
+            token_counter: Token counter (default: tiktoken cl100k_base or an estimate)
+        """
+        self.token_budget = token_budget
+        self.duplicate_threshold = duplicate_threshold
+        self.token_counter = token_counter or TokenCounter()
+
+    @staticmethod
+    def format_passage(index: int, content: str) -> str:
+        """One context entry as it appears in the prompt."""
+        return f"Document {index}: {content}"
+
+    def pack(self, docs: List[Dict[str, Any]]) -> PackedContext:
+        """
+        Pack retrieved documents (best first) into context passages.
+
+        Args:
+            docs: Retrieved chunks with 'id', 'content' and 'metadata'
+
+        Returns:
+            The packed passages and token accounting
+        """
+        naive_tokens = self._context_tokens([doc['content'] for doc in docs])
+
+        passages = self._merge_overlapping(docs)
+        chunks_merged = len(docs) - len(passages)
+
+        kept = []
+        kept_shingles: List[Set[tuple]] = []
+        dropped_ids = []
+        for passage in passages:
+            shingles = self._shingles(passage['content'])
+            if any(self._contained(shingles, other) for other in kept_shingles):
+                dropped_ids.extend(passage['chunk_ids'])
+                continue
+            kept.append(passage)
+            kept_shingles.append(shingles)
+
+        packed, truncated, over_budget = self._fit_budget(kept)
+        for passage in over_budget:
+            dropped_ids.extend(passage['chunk_ids'])
+
+        tokens = self._context_tokens([passage['content'] for passage in packed])
+        return PackedContext(
+            passages=packed,
+            tokens=tokens,
+            tokens_saved=max(naive_tokens - tokens, 0),
+            chunks_merged=chunks_merged,
+            chunks_dropped=len(dropped_ids),
+            truncated=truncated,
+            dropped_ids=dropped_ids
+        )
+
+    def _context_tokens(self, contents: List[str]) -> int:
+        return self.token_counter.count("\n\n".join(
+            self.format_passage(i + 1, content) for i, content in enumerate(contents)
+        ))
+
+    def _merge_overlapping(self, docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Stitch chunks of the same source with overlapping offsets; keep best-rank order."""
+        groups: Dict[str, List[tuple]] = {}
+        for rank, doc in enumerate(docs):
+            metadata = doc.get('metadata') or {}
+            source = metadata.get('source') or metadata.get('filename')
+            if source is None or 'start_index' not in metadata or 'end_index' not in metadata:
+                source = f"__unpositioned_{rank}"
+            groups.setdefault(source, []).append((rank, doc))
+
+        passages = []
+        for members in groups.values():
+            members.sort(key=lambda item: (item[1].get('metadata') or {}).get('start_index') or 0)
+            current = None
+            for rank, doc in members:
+                metadata = doc.get('metadata') or {}
+                if current is not None:
+                    merged = self._stitch(current, doc)
+                    if merged is not None:
+                        current = merged
+                        current['rank'] = min(current['rank'], rank)
+                        continue
+                    passages.append(current)
+                current = {
+                    'content': doc['content'],
+                    'metadata': metadata,
+                    'chunk_ids': [doc['id']],
+                    'start_index': metadata.get('start_index'),
+                    'end_index': metadata.get('end_index'),
+                    'rank': rank
+                }
+            passages.append(current)
+
+        passages.sort(key=lambda passage: passage['rank'])
+        return passages
+
+    @staticmethod
+    def _stitch(passage: Dict[str, Any], doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Append doc to passage if their ranges overlap or touch and the overlap text matches."""
+        metadata = doc.get('metadata') or {}
+        start, end = metadata.get('start_index'), metadata.get('end_index')
+        if passage['end_index'] is None or start is None or start > passage['end_index']:
+            return None
+
+        text, addition = passage['content'], doc['content']
+        if end <= passage['end_index']:
+            # Fully inside the passage already
+            if addition in text:
+                passage['chunk_ids'].append(doc['id'])
+                return passage
+            return None
+
+        if start == passage['end_index']:
+            stitched = f"{text} {addition}"
+        else:
+            # Stored contents are stripped, so the overlap can be off by a character or two
+            expected = passage['end_index'] - start
+            overlap = next(
+                (n for n in range(min(expected + 2, len(addition)), max(expected - 3, 0), -1)
+                 if text.endswith(addition[:n])),
+                None
+            )
+            if overlap is not None:
+                stitched = text + addition[overlap:]
+            elif expected <= 2:
+                # The shared characters were only whitespace
+                stitched = f"{text} {addition}"
+            else:
+                return None
+
+        passage['content'] = stitched
+        passage['chunk_ids'].append(doc['id'])
+        passage['end_index'] = end
+        return passage
+
+    def _shingles(self, text: str) -> Set[tuple]:
+        words = [w.lower() for w in _WORD.findall(text)]
+        if len(words) < self.SHINGLE_SIZE:
+            return {tuple(words)} if words else set()
+        return {tuple(words[i:i + self.SHINGLE_SIZE]) for i in range(len(words) - self.SHINGLE_SIZE + 1)}
+
+    def _contained(self, shingles: Set[tuple], other: Set[tuple]) -> bool:
+        """Whether `shingles` is (almost) entirely contained in `other`."""
+        if not shingles:
+            return True
+        return len(shingles & other) / len(shingles) >= self.duplicate_threshold
+
+    def _fit_budget(self, passages: List[Dict[str, Any]]):
+        """Keep passages in rank order while they fit; returns (packed, truncated, dropped)."""
+        if self.token_budget is None:
+            return passages, False, []
+
+        # Running total: each passage is counted once, with its prefix and separator
+        used = 0
+        packed = []
+        for i, passage in enumerate(passages):
+            entry = self.format_passage(len(packed) + 1, passage['content'])
+            cost = self.token_counter.count(f"\n\n{entry}" if packed else entry)
+            if used + cost <= self.token_budget:
+                packed.append(passage)
+                used += cost
+                continue
+
+            # Leave room for the "Document i: " prefix and separator
+            remaining = self.token_budget - used - 8
+            if remaining >= self.MIN_TRUNCATED_TOKENS or not packed:
+                shortened = dict(passage, content=self.token_counter.truncate(passage['content'], max(remaining, 1)))
+                return packed + [shortened], True, passages[i + 1:]
+            return packed, False, passages[i:]
+        return packed, False, []
@@ -4,16 +4,16 @@ Handles various document formats and converts them to searchable chunks.
 """
 
 import os
+import codecs
+import hashlib
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Iterator, Optional
 import re
 from dataclasses import dataclass
 
 # Document processing imports
-try:
-    import PyPDF2
-except ImportError:
-    PyPDF2 = None
+from pdf_extraction import PDFBackend, get_pdf_backend, iter_pdf_pages
 
 try:
     from docx import Document as DocxDocument
@@ -37,10 +37,18 @@ class DocumentChunk:
     chunk_id: str
 
 class DocumentProcessor:
+    _WHITESPACE = re.compile(r'\s+')
+    # Sentence ending in cleaned text, where whitespace is always a single space
+    _SENTENCE_END = re.compile(r'[.!?] ')
+    
     def __init__(self, 
                  chunk_size: int = 1000,
                  chunk_overlap: int = 200,
-                 min_chunk_size: int = 100):
+                 min_chunk_size: int = 100,
+                 streaming: bool = False,
+                 pdf_backend: Optional[str] = None,
+                 pdf_workers: int = 1,
+                 pdf_shard_pages: int = 32):
         """
         Initialize document processor.
         
@@ -48,10 +56,20 @@ class DocumentProcessor:
             chunk_size: Maximum size of each chunk
             chunk_overlap: Overlap between chunks
             min_chunk_size: Minimum size for a chunk to be kept
+            streaming: Chunk files page by page / line by line instead of
+                loading the whole extracted text first
+            pdf_backend: "pdfium", "pypdf2" or None to pick the fastest installed one
+            pdf_workers: Processes one PDF's pages are sharded across (1 = in-process)
+            pdf_shard_pages: Pages per shard when a PDF is split across processes
         """
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
         self.min_chunk_size = min_chunk_size
+        self.streaming = streaming
+        self.pdf_backend = pdf_backend
+        self.pdf_workers = pdf_workers
+        self.pdf_shard_pages = pdf_shard_pages
+        self._pdf_extractor: Optional[PDFBackend] = None
         
         # Supported file extensions
         self.supported_extensions = {
@@ -63,30 +81,55 @@ class DocumentProcessor:
             '.html': self._process_html,
             '.htm': self._process_html
         }
+        
+        # Extractors that yield text piece by piece for streaming mode
+        self.streaming_extractors = {
+            '.txt': self._iter_text,
+            '.md': self._iter_text,
+            '.pdf': self._iter_pdf,
+            '.docx': self._iter_docx,
+            '.pptx': self._iter_pptx,
+            '.html': self._iter_html,
+            '.htm': self._iter_html
+        }
     
-    def process_directory(self, directory_path: str) -> List[DocumentChunk]:
+    def process_directory(self,
+                          directory_path: str,
+                          num_workers: Optional[int] = 1,
+                          file_timeout: Optional[float] = 120.0) -> List[DocumentChunk]:
         """
         Process all supported documents in a directory.
         
         Args:
             directory_path: Path to directory containing documents
+            num_workers: Extraction worker processes (None = CPU count)
+            file_timeout: Per-file timeout in seconds (None = no timeout; with one
+                worker that also means serial in-process extraction)
             
         Returns:
             List of document chunks
         """
+        from extraction_pipeline import ExtractionPipeline
+        
         directory = Path(directory_path)
         all_chunks = []
         
         print(f"🔄 Processing documents in: {directory}")
         
-        for file_path in directory.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in self.supported_extensions:
-                try:
-                    chunks = self.process_file(str(file_path))
-                    all_chunks.extend(chunks)
-                    print(f"✅ Processed: {file_path.name} ({len(chunks)} chunks)")
-                except Exception as e:
-                    print(f"❌ Error processing {file_path.name}: {str(e)}")
+        # Sorted so chunk order is deterministic regardless of filesystem order
+        file_paths = sorted(
+            file_path for file_path in directory.rglob("*")
+            if file_path.is_file() and file_path.suffix.lower() in self.supported_extensions
+        )
+        
+        pipeline = ExtractionPipeline(self, num_workers=num_workers, file_timeout=file_timeout)
+        for file_path, chunks, error in pipeline.iter_chunks(file_paths):
+            name = Path(file_path).name
+            if error:
+                print(f"❌ Error processing {name}: {error}")
+                continue
+            all_chunks.extend(chunks)
+            print(f"✅ Processed: {name} ({len(chunks)} chunks)")
         
         print(f"🎉 Total chunks created: {len(all_chunks)}")
         return all_chunks
@@ -101,6 +144,9 @@ class DocumentProcessor:
         Returns:
             List of document chunks
         """
+        if self.streaming:
+            return list(self.stream_file(file_path))
+        
         file_path = Path(file_path)
         extension = file_path.suffix.lower()
         
@@ -113,18 +159,72 @@ class DocumentProcessor:
         if not text or len(text.strip()) < self.min_chunk_size:
             return []
         
-        # Create base metadata
-        metadata = {
+        # Split text into chunks
+        chunks = self._create_chunks(text, self._file_metadata(file_path))
+        
+        return chunks
+    
+    def stream_file(self, file_path: str) -> Iterator[DocumentChunk]:
+        """
+        Stream a single file into chunks without materializing its full text.
+        
+        Yields the same chunks as process_file, reading PDFs page by page and
+        text files line by line.
+        
+        Args:
+            file_path: Path to the file
+            
+        Yields:
+            Document chunks
+        """
+        file_path = Path(file_path)
+        extension = file_path.suffix.lower()
+        
+        if extension not in self.streaming_extractors:
+            raise ValueError(f"Unsupported file type: {extension}")
+        
+        metadata = self._file_metadata(file_path)
+        yield from self.iter_chunks(self.streaming_extractors[extension](file_path), metadata)
+    
+    def chunk_pages(self, file_path: str, pages: List[str]) -> List[DocumentChunk]:
+        """
+        Chunk already extracted pages of a file exactly as process_file would.
+        
+        Args:
+            file_path: Path the pages came from (for metadata)
+            pages: Page texts in order
+            
+        Returns:
+            List of document chunks
+        """
+        file_path = Path(file_path)
+        if self.streaming:
+            return list(self.iter_chunks(pages, self._file_metadata(file_path)))
+        
+        text = "".join(pages)
+        if not text or len(text.strip()) < self.min_chunk_size:
+            return []
+        return self._create_chunks(text, self._file_metadata(file_path))
+    
+    @staticmethod
+    def _file_metadata(file_path: Path) -> Dict[str, Any]:
+        """Base metadata shared by every chunk of a file."""
+        return {
             'source': str(file_path),
             'filename': file_path.name,
-            'file_type': extension,
+            'file_type': file_path.suffix.lower(),
             'file_size': file_path.stat().st_size,
         }
+    
+    @staticmethod
+    def chunk_id_prefix(source: str, filename: str) -> str:
+        """Chunk id prefix for one source file.
         
-        # Split text into chunks
-        chunks = self._create_chunks(text, metadata)
-        
-        return chunks
+        Includes a hash of the full source path, so files with the same name
+        in different directories never share chunk ids.
+        """
+        source_hash = hashlib.sha256(source.encode('utf-8')).hexdigest()[:12]
+        return f"{filename}_{source_hash}"
     
     def _process_text(self, file_path: Path) -> str:
         """Process plain text files."""
@@ -135,79 +235,78 @@ class DocumentProcessor:
             with open(file_path, 'r', encoding='latin-1') as f:
                 return f.read()
     
+    def _iter_text(self, file_path: Path) -> Iterator[str]:
+        """Stream plain text files line by line."""
+        encoding = 'utf-8' if self._is_utf8(file_path) else 'latin-1'
+        with open(file_path, 'r', encoding=encoding) as f:
+            yield from f
+    
+    @staticmethod
+    def _is_utf8(file_path: Path) -> bool:
+        """Check a file decodes as UTF-8 without reading it into memory."""
+        decoder = codecs.getincrementaldecoder('utf-8')()
+        try:
+            with open(file_path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    decoder.decode(block)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            return False
+        return True
+    
     def _process_pdf(self, file_path: Path) -> str:
         """Process PDF files with improved error handling."""
-        if PyPDF2 is None:
-            raise ImportError("PyPDF2 is required for PDF processing. Install with: pip install PyPDF2")
+        text = "".join(self._iter_pdf(file_path))
         
-        # Use general warnings instead of PyPDF2-specific warnings
-        import warnings
-        warnings.filterwarnings('ignore')
+        if not text.strip():
+            print(f"Warning: No text extracted from PDF: {file_path}")
+            return ""
         
-        text = ""
+        print(f"✅ Successfully processed PDF: {file_path.name}")
+        return text
+    
+    def _iter_pdf(self, file_path: Path) -> Iterator[str]:
+        """Stream the text of a PDF one page at a time (page shards in parallel if configured)."""
+        backend = self.get_pdf_extractor()
         try:
-            with open(file_path, 'rb') as f:
-                pdf_reader = PyPDF2.PdfReader(f)
-                total_pages = len(pdf_reader.pages)
-                print(f"Processing PDF: {file_path.name} ({total_pages} pages)")
-                
-                # Add timeout protection for each page
-                for page_num in range(total_pages):
-                    try:
-                        page = pdf_reader.pages[page_num]
-                        # Extract text with error handling
-                        try:
-                            page_text = page.extract_text()
-                            if page_text:
-                                text += page_text + "\n"
-                        except Exception as e:
-                            print(f"Warning: Could not extract text from page {page_num}: {e}")
-                            continue
-                    except Exception as e:
-                        print(f"Warning: Could not process page {page_num}: {e}")
-                        continue
-                    
-                    # Add progress indication
-                    if page_num % 5 == 0:  # Show progress every 5 pages
-                        print(f"📄 Progress: {page_num + 1}/{total_pages} pages")
-            
-            if not text.strip():
-                print(f"Warning: No text extracted from PDF: {file_path}")
-                return ""
-            
-            print(f"✅ Successfully processed PDF: {file_path.name}")
-            return text
-        
+            yield from iter_pdf_pages(file_path, backend, self.pdf_workers, self.pdf_shard_pages)
         except Exception as e:
             print(f"Error processing PDF {file_path}: {e}")
-            return ""
+    
+    def get_pdf_extractor(self) -> PDFBackend:
+        """The configured PDF backend (raises ImportError if none is installed)."""
+        if self._pdf_extractor is None:
+            self._pdf_extractor = get_pdf_backend(self.pdf_backend)
+        return self._pdf_extractor
     
     def _process_docx(self, file_path: Path) -> str:
         """Process DOCX files."""
+        return "".join(self._iter_docx(file_path))
+    
+    def _iter_docx(self, file_path: Path) -> Iterator[str]:
+        """Stream DOCX paragraphs."""
         if DocxDocument is None:
             raise ImportError("python-docx is required for DOCX processing. Install with: pip install python-docx")
         
         doc = DocxDocument(file_path)
-        text = ""
         for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        
-        return text
+            yield paragraph.text + "\n"
     
     def _process_pptx(self, file_path: Path) -> str:
         """Process PPTX files."""
+        return "".join(self._iter_pptx(file_path))
+    
+    def _iter_pptx(self, file_path: Path) -> Iterator[str]:
+        """Stream PPTX shape texts."""
         if Presentation is None:
             raise ImportError("python-pptx is required for PPTX processing. Install with: pip install python-pptx")
         
         prs = Presentation(file_path)
-        text = ""
         
         for slide in prs.slides:
             for shape in slide.shapes:
                 if hasattr(shape, "text"):
-                    text += shape.text + "\n"
-        
-        return text
+                    yield shape.text + "\n"
     
     def _process_html(self, file_path: Path) -> str:
         """Process HTML files."""
@@ -218,6 +317,10 @@ class DocumentProcessor:
             soup = BeautifulSoup(f.read(), 'html.parser')
             return soup.get_text()
     
+    def _iter_html(self, file_path: Path) -> Iterator[str]:
+        """HTML needs the whole tree parsed, so it is a single piece."""
+        yield self._process_html(file_path)
+    
     def _create_chunks(self, text: str, base_metadata: Dict[str, Any]) -> List[DocumentChunk]:
         """
         Split text into overlapping chunks.
@@ -229,38 +332,68 @@ class DocumentProcessor:
         Returns:
             List of document chunks
         """
-        # Clean and normalize text
-        text = self._clean_text(text)
+        return list(self.iter_chunks([text], base_metadata))
+    
+    def iter_chunks(self, pieces: Iterable[str], base_metadata: Dict[str, Any]) -> Iterator[DocumentChunk]:
+        """
+        Split a stream of text pieces (pages, lines, ...) into overlapping chunks.
         
-        if len(text) < self.min_chunk_size:
-            return []
+        Chunk boundaries are the same as chunking the concatenated text: each
+        window of chunk_size characters ends at its last sentence ending, or
+        else drops its last (possibly partial) word. Only a rolling buffer of
+        about chunk_size characters plus the current piece is kept, and sentence
+        endings are found in a single pass as text enters the buffer.
         
-        chunks = []
+        Args:
+            pieces: Raw text pieces, in document order
+            base_metadata: Metadata to apply to all chunks
+            
+        Yields:
+            Document chunks
+        """
+        segments = self._iter_clean_text(pieces)
+        id_prefix = self.chunk_id_prefix(base_metadata.get('source', base_metadata['filename']),
+                                         base_metadata['filename'])
+        buffer = ""          # Cleaned text starting at absolute offset buffer_start
+        buffer_start = 0
+        exhausted = False
+        sentence_ends = []   # Absolute offsets just past each sentence ending, ascending
         start = 0
         chunk_num = 0
         
-        while start < len(text):
+        def fill(upto: int):
+            """Extend the buffer until it reaches offset `upto` or the text ends."""
+            nonlocal buffer, exhausted
+            while not exhausted and buffer_start + len(buffer) < upto:
+                segment = next(segments, None)
+                if segment is None:
+                    exhausted = True
+                    break
+                # A sentence ending may straddle the old buffer end
+                scan_from = max(len(buffer) - 1, 0)
+                buffer += segment
+                for match in self._SENTENCE_END.finditer(buffer, scan_from):
+                    sentence_ends.append(buffer_start + match.end())
+        
+        fill(self.chunk_size + 1)
+        while not exhausted or start < buffer_start + len(buffer):
             # Calculate end position
             end = start + self.chunk_size
             
             # If we're at the end, take everything
-            if end >= len(text):
-                chunk_text = text[start:]
+            if exhausted and end >= buffer_start + len(buffer):
+                chunk_text = buffer[start - buffer_start:]
             else:
-                # Try to break at sentence boundary
-                chunk_text = text[start:end]
-                
-                # Look for sentence endings near the boundary
-                sentence_ends = [m.end() for m in re.finditer(r'[.!?]\s+', chunk_text)]
-                if sentence_ends:
-                    # Use the last sentence ending as the boundary
-                    actual_end = start + sentence_ends[-1]
-                    chunk_text = text[start:actual_end]
+                # Break at the last sentence ending inside the window
+                i = bisect_right(sentence_ends, end)
+                if i and sentence_ends[i - 1] >= start + 2:
+                    chunk_text = buffer[start - buffer_start:sentence_ends[i - 1] - buffer_start]
                 else:
-                    # Fall back to word boundary
-                    words = chunk_text.split()
-                    if len(words) > 1:
-                        chunk_text = ' '.join(words[:-1])
+                    # Fall back to word boundary (drop the last word)
+                    window = buffer[start - buffer_start:end - buffer_start]
+                    lead = 1 if window.startswith(' ') else 0
+                    last_space = window.rstrip(' ').rfind(' ')
+                    chunk_text = window[lead:last_space] if last_space >= lead else window
             
             # Only add chunk if it's large enough
             if len(chunk_text.strip()) >= self.min_chunk_size:
@@ -272,35 +405,56 @@ class DocumentProcessor:
                     'end_index': start + len(chunk_text)
                 })
                 
-                chunks.append(DocumentChunk(
+                yield DocumentChunk(
                     content=chunk_text.strip(),
                     metadata=chunk_metadata,
-                    chunk_id=f"{base_metadata['filename']}_chunk_{chunk_num}"
-                ))
+                    chunk_id=f"{id_prefix}_chunk_{chunk_num}"
+                )
                 
                 chunk_num += 1
             
-            # Move start position
-            start = start + len(chunk_text) - self.chunk_overlap
+            # Move start position; always make progress, even when a chunk is
+            # no longer than the overlap (that used to loop forever)
+            if len(chunk_text) > self.chunk_overlap:
+                start = start + len(chunk_text) - self.chunk_overlap
+            else:
+                start = start + len(chunk_text)
             
             # Prevent infinite loop
-            if start + self.chunk_size >= len(text):
+            fill(start + self.chunk_size + 1)
+            if exhausted and start + self.chunk_size >= buffer_start + len(buffer):
                 break
+            
+            # Drop text and sentence endings the next windows can no longer use
+            buffer = buffer[start - buffer_start:]
+            buffer_start = start
+            del sentence_ends[:bisect_left(sentence_ends, start + 2)]
+    
+    def _iter_clean_text(self, pieces: Iterable[str]) -> Iterator[str]:
+        """
+        Normalize whitespace across a stream of pieces.
         
-        return chunks
+        The concatenated output equals _clean_text applied to the joined input:
+        every whitespace run (even one spanning pieces) becomes one space, with
+        no leading or trailing whitespace.
+        """
+        started = False
+        pending_space = False
+        for piece in pieces:
+            piece = self._WHITESPACE.sub(' ', piece)
+            core = piece.strip(' ')
+            if not core:
+                pending_space = pending_space or (started and bool(piece))
+                continue
+            if started and (pending_space or piece[0] == ' '):
+                core = ' ' + core
+            started = True
+            pending_space = piece[-1] == ' '
+            yield core
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text."""
-        # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
-        # Remove excessive newlines
-        text = re.sub(r'\n\s*\n', '\n\n', text)
-        
-        # Strip leading/trailing whitespace
-        text = text.strip()
-        
-        return text
+        return "".join(self._iter_clean_text([text]))
 
 if __name__ == "__main__":
     # Test the document processor
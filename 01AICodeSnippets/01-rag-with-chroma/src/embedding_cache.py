@@ -0,0 +1,162 @@
+"""
+Persistent Embedding Cache
+SQLite-backed cache of embeddings keyed by (model name, SHA-256 of text) with LRU eviction.
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """
+    On-disk cache of float32 embeddings.
+
+    Entries are evicted least-recently-used first once the cache holds more
+    than `max_entries` vectors.
+    """
+
+    def __init__(self, db_path: str, max_entries: int = 100_000):
+        """
+        Open (or create) an embedding cache.
+
+        Args:
+            db_path: SQLite file to store embeddings in
+            max_entries: Maximum number of cached embeddings
+        """
+        self.db_path = db_path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON embeddings(last_used)")
+        self._conn.commit()
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get_many(self, model: str, texts: List[str]) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Look up embeddings for a batch of texts.
+
+        Args:
+            model: Embedding model name
+            texts: Texts to look up
+
+        Returns:
+            (position -> cached vector, positions that missed)
+        """
+        hashes = [self.text_hash(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            unique = list(set(hashes))
+            # Stay under SQLite's bound-parameter limit
+            for i in range(0, len(unique), 500):
+                batch = unique[i:i + 500]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? AND text_hash IN ({placeholders})",
+                    [model, *batch]
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+
+            if found:
+                now = time.time()
+                self._conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(now, model, text_hash) for text_hash in found]
+                )
+                self._conn.commit()
+
+            hits = {i: found[h] for i, h in enumerate(hashes) if h in found}
+            missing = [i for i, h in enumerate(hashes) if h not in found]
+            self.hits += len(hits)
+            self.misses += len(missing)
+
+        return hits, missing
+
+    def put_many(self, model: str, texts: List[str], vectors: np.ndarray):
+        """Store embeddings for texts, evicting the least recently used if over capacity."""
+        if not texts:
+            return
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        now = time.time()
+        # One row per distinct text; a repeated text keeps its last vector
+        rows = {
+            self.text_hash(text): (model, self.text_hash(text), vector.tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        }
+
+        with self._lock:
+            # Only genuinely new rows change the count; texts another caller
+            # stored meanwhile are refreshed in place
+            inserted = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings (model, text_hash, vector, last_used) VALUES (?, ?, ?, ?)",
+                list(rows.values())
+            ).rowcount
+            if inserted < len(rows):
+                self._conn.executemany(
+                    "UPDATE embeddings SET vector = ?, last_used = ? WHERE model = ? AND text_hash = ?",
+                    [(vector, used, row_model, text_hash) for row_model, text_hash, vector, used in rows.values()]
+                )
+            self._count += inserted
+            if self._count > self.max_entries:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """Drop least recently used entries down to 90% of capacity (amortizes eviction)."""
+        target = int(self.max_entries * 0.9)
+        excess = self._count - target
+        deleted = self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN "
+            "(SELECT rowid FROM embeddings ORDER BY last_used ASC LIMIT ?)",
+            (excess,)
+        ).rowcount
+        self._count -= deleted
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics."""
+        total = self.hits + self.misses
+        return {
+            'entries': self._count,
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0
+        }
+
+    def clear(self):
+        """Remove all cached embeddings."""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+            self._count = 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
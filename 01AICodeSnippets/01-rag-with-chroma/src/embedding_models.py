@@ -0,0 +1,63 @@
+"""
+Shared Embedding Models
+Process-wide registry of lazily loaded sentence transformer models.
+"""
+
+import threading
+from typing import Dict
+
+
+class LazyEmbeddingModel:
+    """
+    SentenceTransformer stand-in that only loads the model on first use.
+
+    Importing sentence_transformers (and torch) and loading weights takes
+    seconds, so it is deferred until something actually needs an embedding.
+    """
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._model = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._model is not None
+
+    def _load(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    print(f"🔄 Loading embedding model: {self.model_name}")
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def encode(self, *args, **kwargs):
+        return self._load().encode(*args, **kwargs)
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._load().get_sentence_embedding_dimension()
+
+
+_models: Dict[str, LazyEmbeddingModel] = {}
+_models_lock = threading.Lock()
+
+
+def register_embedding_model(model_name: str, model) -> None:
+    """
+    Make `model` the process-wide model for a name.
+
+    Any object with SentenceTransformer's encode() and
+    get_sentence_embedding_dimension() works, e.g. an offline stand-in.
+    """
+    with _models_lock:
+        _models[model_name] = model
+
+
+def get_embedding_model(model_name: str) -> LazyEmbeddingModel:
+    """Return the process-wide (lazily loaded) model for a name."""
+    with _models_lock:
+        if model_name not in _models:
+            _models[model_name] = LazyEmbeddingModel(model_name)
+        return _models[model_name]
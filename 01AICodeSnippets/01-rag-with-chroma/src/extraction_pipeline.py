@@ -0,0 +1,321 @@
+"""
+Parallel Document Extraction Pipeline
+Spreads text extraction and chunking across worker processes while the caller embeds.
+Large PDFs are split into page ranges so one file can use every worker.
+"""
+
+import multiprocessing
+import multiprocessing.connection
+import os
+import queue
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from document_processor import DocumentProcessor, DocumentChunk
+from pdf_extraction import WORKER_START_METHOD, shard_ranges
+
+# (file path, chunks, error message or None)
+ExtractionResult = Tuple[str, List[DocumentChunk], Optional[str]]
+
+# (file index, shard number or None for the whole file)
+TaskKey = Tuple[int, Optional[int]]
+PageRange = Optional[Tuple[int, int]]
+
+
+def _worker_main(processor_class: type,
+                 processor_config: Dict[str, Any],
+                 task_queue,
+                 result_conn):
+    """
+    Worker loop until told to stop: a whole file is extracted and chunked,
+    a PDF page range is only extracted (the parent chunks the joined pages).
+
+    Results go back over this worker's own pipe, so killing it mid-send can
+    only garble a pipe the parent throws away with it.
+    """
+    processor = processor_class(**processor_config)
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+        key, file_path, page_range = task
+        try:
+            if page_range is None:
+                payload = processor.process_file(file_path)
+            else:
+                payload = processor.get_pdf_extractor().extract_pages(Path(file_path), *page_range)
+        except Exception as e:
+            result_conn.send((key, [], str(e)))
+        else:
+            result_conn.send((key, payload, None))
+
+
+class _Worker:
+    """Handle on a worker process and the tasks queued on it."""
+
+    # Tasks queued per worker so it never idles waiting on the parent
+    PREFETCH = 2
+
+    def __init__(self,
+                 worker_id: int,
+                 context,
+                 processor_class: type,
+                 processor_config: Dict[str, Any]):
+        self.worker_id = worker_id
+        self.task_queue = context.Queue(maxsize=self.PREFETCH + 1)
+        self.result_conn, child_conn = context.Pipe(duplex=False)
+        self.process = context.Process(
+            target=_worker_main,
+            args=(processor_class, processor_config, self.task_queue, child_conn),
+            daemon=True
+        )
+        self.process.start()
+        # Only the child holds the write end, so its death reads as EOF here
+        child_conn.close()
+        self.tasks = deque()   # (key, page range) in the order the worker runs them
+        self.started_at = 0.0
+
+    @property
+    def current(self) -> Optional[TaskKey]:
+        """Key of the task the worker is currently working on."""
+        return self.tasks[0][0] if self.tasks else None
+
+    def has_capacity(self) -> bool:
+        return len(self.tasks) < self.PREFETCH
+
+    def assign(self, key: TaskKey, file_path: str, page_range: PageRange = None):
+        if not self.tasks:
+            self.started_at = time.monotonic()
+        self.tasks.append((key, page_range))
+        self.task_queue.put((key, file_path, page_range))
+
+    def complete(self):
+        """Mark the current task done; the next queued task starts now."""
+        self.tasks.popleft()
+        self.started_at = time.monotonic()
+
+    def stop(self):
+        if self.process.is_alive():
+            try:
+                self.task_queue.put_nowait(None)
+            except queue.Full:
+                pass
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(timeout=1)
+        self.result_conn.close()
+
+
+class ExtractionPipeline:
+    """
+    Process-pool extraction stage.
+
+    Files are handed to worker processes one at a time, at most `max_pending`
+    files are in flight or waiting to be yielded, and results are yielded in
+    input order so chunk order (and ids) match the serial path. A PDF with
+    more than `pdf_shard_pages` pages is split into page ranges that run on
+    different workers; its pages are re-assembled in order and chunked here.
+
+    A timeout can only be enforced on a process, so with file_timeout set
+    even num_workers=1 runs one worker; without it, one worker means serial
+    in-process extraction. Workers are started with the "spawn" method, so
+    they never inherit a multithreaded parent's state.
+    """
+
+    def __init__(self,
+                 processor: DocumentProcessor,
+                 num_workers: Optional[int] = 1,
+                 file_timeout: Optional[float] = 120.0,
+                 max_pending: Optional[int] = None,
+                 pdf_shard_pages: Optional[int] = 32,
+                 start_method: str = WORKER_START_METHOD):
+        """
+        Initialize the extraction pipeline.
+
+        Args:
+            processor: Processor whose chunking settings the workers copy
+            num_workers: Worker processes (None = CPU count)
+            file_timeout: Seconds before a file's worker is killed (None disables it, and
+                with num_workers=1 extracts serially in-process)
+            max_pending: Bound on dispatched-but-unyielded files (default: 4 per worker)
+            pdf_shard_pages: Pages per PDF shard across workers (None = whole files only);
+                file_timeout then applies to each shard
+            start_method: multiprocessing start method for workers
+                ("spawn" by default; "fork" starts faster but is unsafe in
+                a process that runs other threads)
+        """
+        self.processor = processor
+        self.num_workers = max(1, num_workers or os.cpu_count() or 1)
+        self.file_timeout = file_timeout
+        self.max_pending = max_pending or self.num_workers * 4
+        self.pdf_shard_pages = pdf_shard_pages
+        self.start_method = start_method
+
+    def _processor_config(self) -> Dict[str, Any]:
+        return {
+            'chunk_size': self.processor.chunk_size,
+            'chunk_overlap': self.processor.chunk_overlap,
+            'min_chunk_size': self.processor.min_chunk_size,
+            'streaming': self.processor.streaming,
+            'pdf_backend': self.processor.pdf_backend
+        }
+
+    def _page_ranges(self, file_path: str) -> List[PageRange]:
+        """One task per file, or one per page range for a large PDF."""
+        if self.pdf_shard_pages is None or Path(file_path).suffix.lower() != '.pdf':
+            return [None]
+        try:
+            total_pages = self.processor.get_pdf_extractor().page_count(Path(file_path))
+        except Exception:
+            # Unreadable here too; let a worker report the error for the whole file
+            return [None]
+        if total_pages <= self.pdf_shard_pages:
+            return [None]
+        return shard_ranges(total_pages, self.pdf_shard_pages)
+
+    def iter_chunks(self, file_paths: Iterable[str]) -> Iterator[ExtractionResult]:
+        """
+        Extract and chunk files, yielding results in input order.
+
+        Args:
+            file_paths: Files to process
+
+        Yields:
+            (file path, chunks, error) per file; error is None on success
+        """
+        file_paths = [str(p) for p in file_paths]
+        if self.file_timeout is None and (self.num_workers == 1 or len(file_paths) <= 1):
+            yield from self._iter_serial(file_paths)
+        else:
+            yield from self._iter_parallel(file_paths)
+
+    def _iter_serial(self, file_paths: List[str]) -> Iterator[ExtractionResult]:
+        for file_path in file_paths:
+            try:
+                yield file_path, self.processor.process_file(file_path), None
+            except Exception as e:
+                yield file_path, [], str(e)
+
+    def _iter_parallel(self, file_paths: List[str]) -> Iterator[ExtractionResult]:
+        context = multiprocessing.get_context(self.start_method)
+        processor_class = type(self.processor)
+        config = self._processor_config()
+        next_worker_id = 0
+        workers: Dict[int, _Worker] = {}
+
+        def spawn():
+            nonlocal next_worker_id
+            worker = _Worker(next_worker_id, context, processor_class, config)
+            workers[worker.worker_id] = worker
+            next_worker_id += 1
+
+        for _ in range(min(self.num_workers, len(file_paths))):
+            spawn()
+
+        results: Dict[int, ExtractionResult] = {}
+        shard_pages: Dict[int, Dict[int, List[str]]] = {}   # file index -> shard -> pages
+        shard_counts: Dict[int, int] = {}
+        queued = deque()   # (key, page range) of dispatched files not yet on a worker
+        retry = deque()
+        next_dispatch = 0
+        next_yield = 0
+
+        def record(key: TaskKey, payload, error: Optional[str]):
+            index, shard = key
+            if index in results:
+                # Another shard of this file already failed
+                return
+            if shard is None or error:
+                results[index] = (file_paths[index], payload if not error else [], error)
+                shard_pages.pop(index, None)
+                return
+            shard_pages[index][shard] = payload
+            if len(shard_pages[index]) == shard_counts[index]:
+                shards = shard_pages.pop(index)
+                pages = [page for number in range(shard_counts[index]) for page in shards[number]]
+                try:
+                    results[index] = (file_paths[index], self.processor.chunk_pages(file_paths[index], pages), None)
+                except Exception as e:
+                    results[index] = (file_paths[index], [], str(e))
+
+        try:
+            while next_yield < len(file_paths):
+                # Keep worker queues topped up without running too far ahead of the consumer
+                for worker in list(workers.values()):
+                    while worker.has_capacity():
+                        if retry:
+                            key, page_range = retry.popleft()
+                        elif queued:
+                            key, page_range = queued.popleft()
+                        elif (next_dispatch < len(file_paths)
+                                and next_dispatch < next_yield + self.max_pending):
+                            ranges = self._page_ranges(file_paths[next_dispatch])
+                            if len(ranges) > 1:
+                                shard_pages[next_dispatch] = {}
+                                shard_counts[next_dispatch] = len(ranges)
+                                queued.extend(((next_dispatch, shard), page_range)
+                                              for shard, page_range in enumerate(ranges))
+                            else:
+                                queued.append(((next_dispatch, None), None))
+                            next_dispatch += 1
+                            continue
+                        else:
+                            break
+                        if key[0] in results:
+                            continue
+                        worker.assign(key, file_paths[key[0]], page_range)
+
+                # Collect finished work (wait briefly for the first, then drain)
+                pipes = {worker.result_conn: worker for worker in workers.values()}
+                wait = 0.05
+                while pipes:
+                    ready = multiprocessing.connection.wait(list(pipes), timeout=wait)
+                    if not ready:
+                        break
+                    wait = 0
+                    for conn in ready:
+                        try:
+                            key, payload, error = conn.recv()
+                        except (EOFError, OSError):
+                            # The worker died; the liveness check below replaces it
+                            del pipes[conn]
+                            continue
+                        worker = pipes[conn]
+                        if worker.current == key:
+                            worker.complete()
+                            record(key, payload, error)
+
+                # Kill workers that hang or die mid-task and replace them
+                now = time.monotonic()
+                for worker in list(workers.values()):
+                    if worker.current is None:
+                        if not worker.process.is_alive():
+                            del workers[worker.worker_id]
+                            spawn()
+                        continue
+                    timed_out = (self.file_timeout is not None
+                                 and now - worker.started_at > self.file_timeout)
+                    if timed_out or not worker.process.is_alive():
+                        reason = (f"timed out after {self.file_timeout:g}s" if timed_out
+                                  else "worker process exited unexpectedly")
+                        record(worker.current, [], reason)
+                        worker.kill()
+                        del workers[worker.worker_id]
+                        spawn()
+                        # Tasks queued behind the failed one go back to the front of the line
+                        retry.extend(list(worker.tasks)[1:])
+
+                # Yield in input order
+                while next_yield in results:
+                    yield results.pop(next_yield)
+                    next_yield += 1
+        finally:
+            for worker in workers.values():
+                worker.stop()
+            for worker in workers.values():
+                worker.process.join(timeout=1)
+                worker.kill()
@@ -0,0 +1,148 @@
+"""
+Ingestion Manifest
+Tracks content hashes of ingested files and chunks so re-ingestion only touches what changed.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Any, Optional
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex SHA-256 digest of raw bytes."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_text(text: str) -> str:
+    """Return the hex SHA-256 digest of a text string."""
+    return hash_bytes(text.encode('utf-8'))
+
+
+def hash_file(file_path: Path, block_size: int = 1 << 20) -> str:
+    """Hash a file's contents without loading it into memory at once."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IngestManifest:
+    """
+    Persisted record of what has been ingested into the vector store.
+
+    Layout of the manifest file::
+
+        {
+          "version": 2,
+          "files": {
+            "<source path>": {
+              "file_hash": "<sha256 of file bytes>",
+              "chunks": {"<chunk id>": "<sha256 of chunk text>", ...}
+            }
+          }
+        }
+    """
+
+    VERSION = 2
+
+    def __init__(self, manifest_path: str):
+        """
+        Load (or start) a manifest.
+
+        Args:
+            manifest_path: JSON file the manifest is persisted to
+        """
+        self.manifest_path = Path(manifest_path)
+        self.files: Dict[str, Dict[str, Any]] = {}
+        # Chunk ids recorded by an older manifest format, to be deleted before re-ingesting
+        self.legacy_chunk_ids: List[str] = []
+        self._load()
+
+    def _load(self):
+        """Read the manifest from disk, starting empty if missing or unreadable."""
+        if not self.manifest_path.exists():
+            return
+
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == self.VERSION:
+                self.files = data.get('files', {})
+            elif data.get('version') == 1:
+                # Version 1 chunk ids were built from the bare filename, so
+                # same-named files in different directories collided; every
+                # file is re-ingested under path-based ids
+                self.legacy_chunk_ids = [
+                    chunk_id
+                    for entry in data.get('files', {}).values()
+                    for chunk_id in entry['chunks']
+                ]
+                print(f"🔁 Upgrading ingest manifest {self.manifest_path}; all files will be re-ingested")
+            else:
+                print(f"⚠️ Ignoring manifest with unknown version: {self.manifest_path}")
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read ingest manifest {self.manifest_path}: {e}")
+
+    def save(self):
+        """Atomically write the manifest next to the vector store."""
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_suffix(self.manifest_path.suffix + '.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.VERSION, 'files': self.files}, f)
+        os.replace(tmp_path, self.manifest_path)
+        self.legacy_chunk_ids = []
+
+    def file_hash(self, source: str) -> Optional[str]:
+        """Stored hash for a source file, or None if it was never ingested."""
+        entry = self.files.get(source)
+        return entry['file_hash'] if entry else None
+
+    def chunk_hashes(self, source: str) -> Dict[str, str]:
+        """Stored chunk id -> chunk hash mapping for a source file."""
+        entry = self.files.get(source)
+        return dict(entry['chunks']) if entry else {}
+
+    def is_unchanged(self, source: str, file_hash: str) -> bool:
+        """Whether a file with this hash was already ingested from this source."""
+        return self.file_hash(source) == file_hash
+
+    def record_file(self, source: str, file_hash: Optional[str], chunk_hashes: Dict[str, str]):
+        """Record the current state of an ingested file (file_hash None = unknown, re-extract next time)."""
+        self.files[source] = {
+            'file_hash': file_hash,
+            'chunks': chunk_hashes
+        }
+
+    def remove_file(self, source: str) -> List[str]:
+        """Forget a source file and return the chunk ids it owned."""
+        entry = self.files.pop(source, None)
+        return list(entry['chunks'].keys()) if entry else []
+
+    def sources_under(self, directory: str) -> List[str]:
+        """All recorded sources located under a directory."""
+        root = Path(directory).resolve()
+        sources = []
+        for source in self.files:
+            try:
+                Path(source).resolve().relative_to(root)
+            except ValueError:
+                continue
+            sources.append(source)
+        return sources
+
+    @staticmethod
+    def diff_chunks(old: Dict[str, str], new: Dict[str, str]) -> Dict[str, List[str]]:
+        """
+        Compare old and new chunk hashes of one file.
+
+        Returns:
+            Dict with 'changed' (new or modified ids that need embedding),
+            'unchanged' (same id and content) and 'removed' ids
+        """
+        changed = [chunk_id for chunk_id, h in new.items() if old.get(chunk_id) != h]
+        unchanged = [chunk_id for chunk_id, h in new.items() if old.get(chunk_id) == h]
+        removed = [chunk_id for chunk_id in old if chunk_id not in new]
+        return {'changed': changed, 'unchanged': unchanged, 'removed': removed}
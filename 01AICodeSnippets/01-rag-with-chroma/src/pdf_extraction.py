@@ -0,0 +1,193 @@
+"""
+PDF Text Extraction Backends
+Pluggable per-page PDF text extraction (pypdfium2 when installed, else PyPDF2)
+and page-range sharding of one PDF across worker processes.
+"""
+
+import multiprocessing
+import time
+import warnings
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+try:
+    import PyPDF2
+except ImportError:
+    PyPDF2 = None
+
+# Worker processes start fresh instead of forking a parent that may be running
+# Gradio / torch threads (a forked copy can inherit a lock held by another thread)
+WORKER_START_METHOD = "spawn"
+
+
+class PDFBackend(ABC):
+    """Extracts the text of a page range; each page's text ends with a newline."""
+
+    name = ""
+
+    @classmethod
+    @abstractmethod
+    def available(cls) -> bool:
+        """Whether the backend's library is installed."""
+
+    @abstractmethod
+    def page_count(self, file_path: Path) -> int:
+        """Number of pages in a PDF."""
+
+    @abstractmethod
+    def extract_pages(self, file_path: Path, start: int, end: int) -> List[str]:
+        """Text of pages [start, end), one entry per page."""
+
+
+class PdfiumBackend(PDFBackend):
+    """PDFium (C++) text extraction: several times faster than PyPDF2."""
+
+    name = "pdfium"
+
+    @classmethod
+    def available(cls) -> bool:
+        return pdfium is not None
+
+    def page_count(self, file_path: Path) -> int:
+        pdf = pdfium.PdfDocument(str(file_path))
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def extract_pages(self, file_path: Path, start: int, end: int) -> List[str]:
+        pdf = pdfium.PdfDocument(str(file_path))
+        pages = []
+        try:
+            for page_num in range(start, min(end, len(pdf))):
+                try:
+                    page = pdf[page_num]
+                    textpage = page.get_textpage()
+                    text = textpage.get_text_range()
+                    textpage.close()
+                    page.close()
+                except Exception as e:
+                    print(f"Warning: Could not extract text from page {page_num}: {e}")
+                    text = ""
+                pages.append(text.replace("\r\n", "\n") + "\n" if text else "")
+        finally:
+            pdf.close()
+        return pages
+
+
+class PyPDF2Backend(PDFBackend):
+    """Pure-Python fallback."""
+
+    name = "pypdf2"
+
+    @classmethod
+    def available(cls) -> bool:
+        return PyPDF2 is not None
+
+    def page_count(self, file_path: Path) -> int:
+        with open(file_path, 'rb') as f:
+            return len(PyPDF2.PdfReader(f).pages)
+
+    def extract_pages(self, file_path: Path, start: int, end: int) -> List[str]:
+        pages = []
+        # PyPDF2 warns about every malformed object; keep that local to the read
+        with warnings.catch_warnings(), open(file_path, 'rb') as f:
+            warnings.simplefilter('ignore')
+            reader = PyPDF2.PdfReader(f)
+            for page_num in range(start, min(end, len(reader.pages))):
+                try:
+                    text = reader.pages[page_num].extract_text()
+                except Exception as e:
+                    print(f"Warning: Could not extract text from page {page_num}: {e}")
+                    text = ""
+                pages.append(text + "\n" if text else "")
+        return pages
+
+
+# Preference order for automatic selection
+PDF_BACKENDS: Dict[str, Type[PDFBackend]] = {
+    PdfiumBackend.name: PdfiumBackend,
+    PyPDF2Backend.name: PyPDF2Backend,
+}
+
+
+def get_pdf_backend(name: Optional[str] = None) -> PDFBackend:
+    """
+    Return a PDF backend by name, or the fastest installed one for None/"auto".
+
+    Raises:
+        ImportError: If the requested (or any) backend is not installed
+    """
+    if name in (None, "auto"):
+        for backend in PDF_BACKENDS.values():
+            if backend.available():
+                return backend()
+        raise ImportError("PDF processing needs pypdfium2 or PyPDF2. Install with: pip install pypdfium2")
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend: {name}. Use one of {list(PDF_BACKENDS)}")
+    if not PDF_BACKENDS[name].available():
+        raise ImportError(f"The {name} PDF backend is not installed")
+    return PDF_BACKENDS[name]()
+
+
+def shard_ranges(total_pages: int, shard_pages: int) -> List[Tuple[int, int]]:
+    """Split [0, total_pages) into consecutive ranges of at most shard_pages pages."""
+    return [(start, min(start + shard_pages, total_pages)) for start in range(0, total_pages, shard_pages)]
+
+
+def _extract_shard(backend_name: str, file_path: str, start: int, end: int) -> List[str]:
+    return get_pdf_backend(backend_name).extract_pages(Path(file_path), start, end)
+
+
+def can_spawn_workers() -> bool:
+    """Daemon processes (e.g. ExtractionPipeline workers) cannot start their own pool."""
+    return not multiprocessing.current_process().daemon
+
+
+def iter_pdf_pages(file_path: Path,
+                   backend: PDFBackend,
+                   workers: int = 1,
+                   shard_pages: int = 32) -> Iterator[str]:
+    """
+    Yield the text of every page of a PDF, in order.
+
+    With workers > 1 and more than one shard of pages, page ranges are
+    extracted by a process pool and yielded in page order as they complete.
+
+    Args:
+        file_path: PDF to read
+        backend: Extraction backend
+        workers: Processes to shard pages across (1 = in-process)
+        shard_pages: Pages per shard
+
+    Yields:
+        Page texts (empty string for pages without text)
+    """
+    start_time = time.perf_counter()
+    total_pages = backend.page_count(file_path)
+    shards = shard_ranges(total_pages, shard_pages)
+
+    if workers > 1 and len(shards) > 1 and can_spawn_workers():
+        context = multiprocessing.get_context(WORKER_START_METHOD)
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards)), mp_context=context) as pool:
+            # map() returns results in submission order
+            results = pool.map(
+                _extract_shard,
+                *zip(*[(backend.name, str(file_path), start, end) for start, end in shards])
+            )
+            for pages in results:
+                yield from pages
+    else:
+        for start, end in shards:
+            yield from backend.extract_pages(file_path, start, end)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"📄 {file_path.name}: {total_pages} pages with {backend.name} "
+          f"({total_pages / elapsed if elapsed > 0 else 0:.0f} pages/s)")
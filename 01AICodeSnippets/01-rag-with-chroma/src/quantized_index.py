@@ -0,0 +1,384 @@
+"""
+Quantized Vector Index
+Compact int8 / float16 embedding storage in memory-mapped side files, with float16 re-ranking.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+import numpy as np
+
+
+class QuantizedVectorIndex:
+    """
+    Brute-force cosine index over quantized embeddings.
+
+    Vectors are L2-normalized and kept in memory-mapped files. In int8 mode
+    each vector is stored with a per-vector scale for the scan plus a float16
+    copy; the top `rerank_factor * k` int8 candidates are re-scored in float32
+    arithmetic against the float16 copy, which is only paged in for those
+    rows. In float16 mode the float16 matrix is scanned directly. Resident
+    (scanned) memory is 1/4 (int8) or 1/2 (float16) of a float32 index and
+    disk use is about 3/4 (int8) or 1/2 (float16).
+
+    Rows are append-only; deleting or overwriting an id tombstones its row.
+    Once tombstones pass COMPACT_RATIO of the rows, live rows are copied into
+    fresh files and the old ones replaced.
+    """
+
+    DTYPES = ('int8', 'float16')
+    SCAN_BLOCK = 65536  # Rows dequantized at once during a scan
+    COMPACT_RATIO = 0.25
+    COMPACT_MIN_ROWS = 1024  # Small indexes are not worth rewriting
+    # 3: float16 re-rank copy again (version 2 kept a float32 copy in both modes)
+    VERSION = 3
+
+    def __init__(self, directory: str, dtype: str = 'int8', rerank_factor: int = 4):
+        """
+        Open (or create) a quantized index.
+
+        Args:
+            directory: Directory holding the index files
+            dtype: 'int8' or 'float16'
+            rerank_factor: int8 only; candidates re-scored against float16 per requested result
+        """
+        if dtype not in self.DTYPES:
+            raise ValueError(f"Unsupported compact dtype: {dtype}. Use one of {self.DTYPES}")
+
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.dtype = dtype
+        self.rerank_factor = rerank_factor
+
+        self.dim: Optional[int] = None
+        self.size = 0          # Rows written
+        self.capacity = 0      # Rows allocated in the memmaps
+        self.row_ids: List[str] = []
+        self.id_to_row: Dict[str, int] = {}
+        self.deleted: Set[int] = set()
+        self._live = np.zeros(0, dtype=bool)   # Per-row mask of rows that are not tombstoned
+
+        self._quantized = None
+        self._scales = None
+        self._rerank = None
+        self._load()
+
+    # ---- persistence -------------------------------------------------
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name
+
+    def _load(self):
+        meta_path = self._path('meta.json')
+        if not meta_path.exists():
+            return
+
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['dtype'] != self.dtype:
+            raise ValueError(
+                f"Index at {self.directory} stores {meta['dtype']} vectors, not {self.dtype}"
+            )
+        self.dim = meta['dim']
+        self.capacity = meta['capacity']
+        if meta.get('compacting'):
+            # Interrupted after the compacted files were complete: finish the swap
+            self._replace_with_compacted()
+            self._save_meta()
+
+        with open(self._path('ids.txt'), 'r', encoding='utf-8') as f:
+            self.row_ids = [line.rstrip('\n') for line in f]
+        self.size = len(self.row_ids)
+
+        if self._path('deleted.txt').exists():
+            with open(self._path('deleted.txt'), 'r', encoding='utf-8') as f:
+                self.deleted = {int(line) for line in f if line.strip()}
+
+        self.id_to_row = {
+            chunk_id: row for row, chunk_id in enumerate(self.row_ids) if row not in self.deleted
+        }
+        self._live = np.zeros(self.capacity, dtype=bool)
+        self._live[:self.size] = True
+        self._live[list(self.deleted)] = False
+        if meta.get('version', 1) == 2:
+            self._upgrade_v2()
+        self._open_memmaps()
+
+    def _upgrade_v2(self):
+        """Replace the float32 copy of a version 2 index with the float16 one (version 1 needs nothing)."""
+        print(f"🔁 Upgrading compact index at {self.directory} (dropping the float32 copy)")
+        if self.dtype == 'int8':
+            exact = np.memmap(self._path('vectors.float32'), dtype=np.float32, mode='r',
+                              shape=(self.capacity, self.dim))
+            rerank = np.memmap(self._path('vectors.float16'), dtype=np.float16, mode='w+',
+                               shape=(self.capacity, self.dim))
+            for start in range(0, self.size, self.SCAN_BLOCK):
+                end = min(start + self.SCAN_BLOCK, self.size)
+                rerank[start:end] = exact[start:end]
+            rerank.flush()
+            del exact, rerank
+        self._path('vectors.float32').unlink()
+        self._save_meta()
+
+    def _save_meta(self, compacting: bool = False):
+        tmp = self._path('meta.json.tmp')
+        meta = {'version': self.VERSION, 'dim': self.dim, 'dtype': self.dtype, 'capacity': self.capacity}
+        if compacting:
+            meta['compacting'] = True
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+        os.replace(tmp, self._path('meta.json'))
+
+    def _files(self) -> List[Tuple[str, Any, int]]:
+        """(file name, dtype, values per row) of every memmap for this mode."""
+        files = [('vectors.float16', np.float16, self.dim)]
+        if self.dtype == 'int8':
+            files += [('vectors.int8', np.int8, self.dim), ('scales.float32', np.float32, 1)]
+        return files
+
+    def _open_memmaps(self):
+        arrays = {
+            name: np.memmap(self._path(name), dtype=dtype, mode='r+',
+                            shape=(self.capacity, width) if width > 1 else (self.capacity,))
+            for name, dtype, width in self._files()
+        }
+        self._rerank = arrays['vectors.float16']
+        if self.dtype == 'int8':
+            self._quantized = arrays['vectors.int8']
+            self._scales = arrays['scales.float32']
+        else:
+            self._quantized = self._rerank
+
+    def _ensure_capacity(self, rows: int):
+        """Grow the memmap files (by 1.5x) so they can hold `rows` rows."""
+        if rows <= self.capacity:
+            return
+
+        new_capacity = max(rows, int(self.capacity * 1.5), 1024)
+        self._flush()
+        self._quantized = self._rerank = self._scales = None
+
+        # Extending with truncate leaves a sparse tail until rows are written
+        for name, dtype, width in self._files():
+            with open(self._path(name), 'ab') as f:
+                f.truncate(new_capacity * width * np.dtype(dtype).itemsize)
+
+        self.capacity = new_capacity
+        self._live = np.concatenate([self._live, np.zeros(new_capacity - len(self._live), dtype=bool)])
+        self._open_memmaps()
+        self._save_meta()
+
+    def _flush(self):
+        for array in (self._quantized, self._rerank, self._scales):
+            if array is not None:
+                array.flush()
+
+    # ---- compaction --------------------------------------------------
+
+    def _data_files(self) -> List[str]:
+        return [name for name, _, _ in self._files()] + ['ids.txt', 'deleted.txt']
+
+    def _replace_with_compacted(self):
+        for name in self._data_files():
+            compacted = self._path(name + '.compact')
+            if compacted.exists():
+                os.replace(compacted, self._path(name))
+
+    def compact(self):
+        """
+        Copy live rows into new files, dropping tombstoned rows.
+
+        The new files are written next to the old ones as *.compact; meta.json
+        marked 'compacting' is the commit point, after which an interrupted
+        swap is finished on the next open.
+        """
+        if not self.deleted:
+            return
+
+        rows = np.flatnonzero(self._live[:self.size])
+        capacity = max(len(rows), 1024)
+        self._flush()
+        for name, dtype, width in self._files():
+            shape = (capacity, width) if width > 1 else (capacity,)
+            target = np.memmap(self._path(name + '.compact'), dtype=dtype, mode='w+', shape=shape)
+            source = {'vectors.float16': self._rerank, 'vectors.int8': self._quantized,
+                      'scales.float32': self._scales}[name]
+            for start in range(0, len(rows), self.SCAN_BLOCK):
+                block = rows[start:start + self.SCAN_BLOCK]
+                target[start:start + len(block)] = source[block]
+            target.flush()
+            del target
+
+        row_ids = [self.row_ids[row] for row in rows]
+        with open(self._path('ids.txt.compact'), 'w', encoding='utf-8') as f:
+            f.writelines(f"{chunk_id}\n" for chunk_id in row_ids)
+        open(self._path('deleted.txt.compact'), 'w').close()
+
+        self._quantized = self._rerank = self._scales = None
+        self.capacity = capacity
+        self._save_meta(compacting=True)
+        self._replace_with_compacted()
+        self._save_meta()
+
+        self.row_ids = row_ids
+        self.size = len(row_ids)
+        self.id_to_row = {chunk_id: row for row, chunk_id in enumerate(row_ids)}
+        self.deleted = set()
+        self._live = np.zeros(capacity, dtype=bool)
+        self._live[:self.size] = True
+        self._open_memmaps()
+
+    def _maybe_compact(self):
+        if len(self.deleted) >= self.COMPACT_MIN_ROWS and len(self.deleted) > self.COMPACT_RATIO * self.size:
+            self.compact()
+
+    # ---- writes ------------------------------------------------------
+
+    def add(self, ids: List[str], embeddings: np.ndarray):
+        """
+        Add (or overwrite) vectors for chunk ids.
+
+        An id repeated within the batch keeps its last vector.
+
+        Args:
+            ids: Chunk ids
+            embeddings: (n, dim) array; written straight into the memmaps
+        """
+        if not ids:
+            return
+
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        last = {chunk_id: i for i, chunk_id in enumerate(ids)}
+        if len(last) < len(ids):
+            keep = sorted(last.values())
+            ids = [ids[i] for i in keep]
+            embeddings = embeddings[keep]
+        if self.dim is None:
+            self.dim = embeddings.shape[1]
+        elif embeddings.shape[1] != self.dim:
+            raise ValueError(f"Expected {self.dim}-dimensional embeddings, got {embeddings.shape[1]}")
+
+        # Overwrites tombstone the old row
+        self.delete([chunk_id for chunk_id in ids if chunk_id in self.id_to_row])
+
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        normalized = embeddings / np.maximum(norms, 1e-12)
+
+        start, end = self.size, self.size + len(ids)
+        self._ensure_capacity(end)
+        self._rerank[start:end] = normalized
+        if self.dtype == 'int8':
+            scales = np.abs(normalized).max(axis=1) / 127.0
+            scales = np.maximum(scales, 1e-12)
+            self._quantized[start:end] = np.round(normalized / scales[:, None]).astype(np.int8)
+            self._scales[start:end] = scales
+        self._flush()
+        self._live[start:end] = True
+
+        with open(self._path('ids.txt'), 'a', encoding='utf-8') as f:
+            f.writelines(f"{chunk_id}\n" for chunk_id in ids)
+        for offset, chunk_id in enumerate(ids):
+            self.id_to_row[chunk_id] = start + offset
+        self.row_ids.extend(ids)
+        self.size = end
+
+    def delete(self, ids: List[str]):
+        """Tombstone the rows of chunk ids, compacting once too many rows are dead."""
+        rows = [self.id_to_row.pop(chunk_id) for chunk_id in ids if chunk_id in self.id_to_row]
+        if not rows:
+            return
+        self.deleted.update(rows)
+        self._live[rows] = False
+        with open(self._path('deleted.txt'), 'a', encoding='utf-8') as f:
+            f.writelines(f"{row}\n" for row in rows)
+        self._maybe_compact()
+
+    def get_vectors(self, ids: List[str]) -> np.ndarray:
+        """Normalized vectors (float16 precision, as float32) for ids, in order; all must exist."""
+        if not ids:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        rows = [self.id_to_row[chunk_id] for chunk_id in ids]
+        return np.array(self._rerank[rows], dtype=np.float32)
+
+    # ---- search ------------------------------------------------------
+
+    def search(self,
+               query: np.ndarray,
+               k: int,
+               allowed_ids: Optional[Set[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Find the k most similar chunks to a query.
+
+        Args:
+            query: Query embedding
+            k: Number of results
+            allowed_ids: Restrict results to these ids (metadata filtering)
+
+        Returns:
+            (chunk id, cosine similarity) pairs, best first
+        """
+        if self.size == 0 or k <= 0:
+            return []
+
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        # Approximate (int8) or final (float16) scores, a block at a time
+        scores = np.empty(self.size, dtype=np.float32)
+        for start in range(0, self.size, self.SCAN_BLOCK):
+            end = min(start + self.SCAN_BLOCK, self.size)
+            block = self._quantized[start:end].astype(np.float32) @ query
+            if self.dtype == 'int8':
+                block *= self._scales[start:end]
+            scores[start:end] = block
+
+        if allowed_ids is None:
+            valid = self._live[:self.size]
+            available = len(self.id_to_row)
+        else:
+            rows = [self.id_to_row[i] for i in allowed_ids if i in self.id_to_row]
+            valid = np.zeros(self.size, dtype=bool)
+            valid[rows] = True
+            available = len(rows)
+        if available == 0:
+            return []
+        scores[~valid] = -np.inf
+
+        # int8 over-fetches candidates, then re-scores them from the float16 copy
+        rerank_factor = self.rerank_factor if self.dtype == 'int8' else 1
+        n_candidates = min(available, max(k * rerank_factor, k))
+        candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        candidates.sort()  # Sequential reads from the memmap
+        if self.dtype == 'int8':
+            candidate_scores = self._rerank[candidates].astype(np.float32) @ query
+        else:
+            candidate_scores = scores[candidates]
+
+        order = np.argsort(-candidate_scores)[:k]
+        return [(self.row_ids[candidates[i]], float(candidate_scores[i])) for i in order]
+
+    # ---- stats -------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.id_to_row)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Sizes of the scanned (resident) data versus a float32 index."""
+        dim = self.dim or 0
+        scan_bytes = self.size * (dim + 4 if self.dtype == 'int8' else 2 * dim)
+        # Count allocated blocks where available, since memmap tails are sparse
+        disk_bytes = 0
+        for path in self.directory.iterdir():
+            if path.is_file():
+                stat = path.stat()
+                disk_bytes += stat.st_blocks * 512 if hasattr(stat, 'st_blocks') else stat.st_size
+        return {
+            'dtype': self.dtype,
+            'vectors': len(self),
+            'tombstoned_rows': len(self.deleted),
+            'scan_bytes': scan_bytes,
+            'float32_bytes': self.size * 4 * dim,
+            'disk_bytes': disk_bytes
+        }
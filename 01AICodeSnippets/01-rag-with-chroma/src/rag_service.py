@@ -0,0 +1,330 @@
+"""
+RAG Service
+asyncio job layer around RAGSystem: background ingestion jobs with progress,
+and concurrent queries that share one embedding model through a batching queue.
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from rag_system import RAGSystem, RAGResponse
+
+
+@dataclass
+class IngestJob:
+    job_id: str
+    documents_path: str
+    remove_missing: bool = True
+    status: str = "queued"   # queued | running | done | failed
+    files_done: int = 0
+    files_total: int = 0
+    stats: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def progress(self) -> float:
+        """Fraction of files processed (1.0 once the job has finished)."""
+        if self.status in ("done", "failed"):
+            return 1.0
+        return self.files_done / self.files_total if self.files_total else 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "failed")
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent embedding requests into batched model calls.
+
+    Requests wait at most `max_wait` seconds for others to join, and a batch
+    holds at most `max_batch_size` texts. Runs on the service's event loop;
+    the model itself is called on a worker thread.
+    """
+
+    def __init__(self,
+                 embed_fn: Callable[[List[str]], np.ndarray],
+                 max_batch_size: int = 32,
+                 max_wait: float = 0.005):
+        self.embed_fn = embed_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.requests = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        self._queue = asyncio.Queue()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    async def embed(self, text: str) -> np.ndarray:
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            texts = [text for text, _ in batch]
+            try:
+                vectors = await loop.run_in_executor(None, self.embed_fn, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'batches': self.batches,
+            'requests': self.requests,
+            'mean_batch_size': self.requests / self.batches if self.batches else 0.0
+        }
+
+
+class RAGService:
+    """
+    Runs a RAGSystem behind an asyncio event loop on a background thread.
+
+    Ingestion jobs run one at a time off the loop and report progress while
+    queries keep being answered from the last committed snapshot. Query
+    embeddings from concurrent callers are encoded together in batches.
+    The public methods are safe to call from any thread; the `a`-prefixed
+    coroutines can be awaited from any event loop. Finished jobs are kept
+    for `finished_job_ttl` seconds, and only the newest `max_finished_jobs`
+    of them, so a long-lived service polled by the UI stays bounded.
+    """
+
+    def __init__(self,
+                 rag_system: RAGSystem,
+                 max_batch_size: int = 32,
+                 batch_wait: float = 0.005,
+                 query_workers: int = 8,
+                 finished_job_ttl: Optional[float] = 3600.0,
+                 max_finished_jobs: int = 100):
+        """
+        Start the service.
+
+        Args:
+            rag_system: System to serve
+            max_batch_size: Max questions embedded in one model call
+            batch_wait: Seconds a question waits for others to share its batch
+            query_workers: Threads answering queries concurrently
+            finished_job_ttl: Seconds a finished job stays available to get_job (None = no expiry)
+            max_finished_jobs: Finished jobs kept at most; the oldest are dropped first
+        """
+        self.rag_system = rag_system
+        self.finished_job_ttl = finished_job_ttl
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs: Dict[str, IngestJob] = {}
+        self._jobs_lock = threading.Lock()
+        self._job_done: Dict[str, asyncio.Event] = {}
+        self._job_ids = itertools.count(1)
+        self._query_pool = ThreadPoolExecutor(max_workers=query_workers, thread_name_prefix="rag-query")
+        self._ingest_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="rag-ingest")
+        self.batcher = EmbeddingBatcher(
+            rag_system.vector_store.embed_queries,
+            max_batch_size=max_batch_size,
+            max_wait=batch_wait
+        )
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="rag-service", daemon=True)
+        self._thread.start()
+        self._call(self._start()).result()
+
+    # ---- loop plumbing -----------------------------------------------
+
+    def _call(self, coro) -> Future:
+        """Schedule a coroutine on the service loop from any thread."""
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    async def _start(self):
+        self._ingest_lock = asyncio.Lock()
+        self.batcher.start()
+
+    def close(self):
+        """Stop the event loop and worker threads (running ingestion finishes first)."""
+        if not self._loop.is_running():
+            return
+        self._call(self.batcher.stop()).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._query_pool.shutdown(wait=False)
+        self._ingest_pool.shutdown(wait=True)
+
+    # ---- ingestion ---------------------------------------------------
+
+    def submit_ingest(self,
+                      documents_path: str,
+                      remove_missing: bool = True,
+                      on_done: Optional[Callable[[IngestJob], None]] = None) -> IngestJob:
+        """
+        Queue an ingestion job and return immediately; poll it with get_job().
+
+        Args:
+            documents_path: Directory to ingest
+            remove_missing: Passed through to RAGSystem.ingest_documents
+            on_done: Called with the job once it finishes (on the service thread)
+        """
+        job = IngestJob(f"job-{next(self._job_ids)}", str(documents_path), remove_missing)
+        with self._jobs_lock:
+            self._evict_finished_jobs()
+            self.jobs[job.job_id] = job
+        self._call(self._run_ingest(job, on_done))
+        return job
+
+    def _evict_finished_jobs(self):
+        """Drop expired finished jobs, then the oldest beyond max_finished_jobs (hold _jobs_lock)."""
+        finished = sorted((job for job in self.jobs.values() if job.finished_at is not None),
+                          key=lambda job: job.finished_at)
+        if self.finished_job_ttl is not None:
+            cutoff = time.time() - self.finished_job_ttl
+            expired = [job for job in finished if job.finished_at < cutoff]
+            finished = finished[len(expired):]
+        else:
+            expired = []
+        expired += finished[:max(0, len(finished) - self.max_finished_jobs)]
+        for job in expired:
+            del self.jobs[job.job_id]
+            self._job_done.pop(job.job_id, None)
+
+    def _done_event(self, job: IngestJob) -> asyncio.Event:
+        # Created lazily on the loop thread
+        return self._job_done.setdefault(job.job_id, asyncio.Event())
+
+    async def aingest(self, documents_path: str, remove_missing: bool = True) -> IngestJob:
+        """Run an ingestion job and wait for it to finish."""
+        job = self.submit_ingest(documents_path, remove_missing)
+        await asyncio.wrap_future(self._call(self._wait_for(job)))
+        return job
+
+    def get_job(self, job_id: str) -> Optional[IngestJob]:
+        """A queued, running or recently finished job (None once it has been evicted)."""
+        with self._jobs_lock:
+            self._evict_finished_jobs()
+            return self.jobs.get(job_id)
+
+    def wait_for_job(self, job_id: str, timeout: Optional[float] = None) -> IngestJob:
+        """Block until a job finishes."""
+        with self._jobs_lock:
+            job = self.jobs[job_id]
+        self._call(self._wait_for(job)).result(timeout)
+        return job
+
+    async def _wait_for(self, job: IngestJob):
+        # An evicted job has no event left to wait on
+        if job.finished_at is None:
+            await self._done_event(job).wait()
+
+    async def _run_ingest(self, job: IngestJob, on_done: Optional[Callable[[IngestJob], None]] = None):
+        loop = asyncio.get_running_loop()
+
+        def on_progress(files_done: int, files_total: int):
+            job.files_done = files_done
+            job.files_total = files_total
+
+        # One ingestion at a time; queued jobs wait here without blocking queries
+        async with self._ingest_lock:
+            job.status = "running"
+            job.started_at = time.time()
+            try:
+                job.stats = await loop.run_in_executor(
+                    self._ingest_pool,
+                    lambda: self.rag_system.ingest_documents(
+                        job.documents_path,
+                        remove_missing=job.remove_missing,
+                        progress_callback=on_progress
+                    )
+                )
+                job.status = "done"
+            except Exception as e:
+                job.error = str(e)
+                job.status = "failed"
+            finally:
+                job.finished_at = time.time()
+                self._done_event(job).set()
+                with self._jobs_lock:
+                    self._evict_finished_jobs()
+                if on_done is not None:
+                    try:
+                        on_done(job)
+                    except Exception as e:
+                        print(f"⚠️ Ingestion job callback failed: {e}")
+
+    # ---- queries -----------------------------------------------------
+
+    def embed_query(self, question: str) -> np.ndarray:
+        """Embed a question through the shared batching queue (blocking)."""
+        return self._call(self.batcher.embed(question)).result()
+
+    async def _query(self, question: str, k: int, include_sources: bool) -> RAGResponse:
+        embedding = await self.batcher.embed(question)
+        return await asyncio.get_running_loop().run_in_executor(
+            self._query_pool,
+            lambda: self.rag_system.query(question, k=k, include_sources=include_sources,
+                                          query_embedding=embedding)
+        )
+
+    def query(self, question: str, k: int = 4, include_sources: bool = True) -> RAGResponse:
+        """Answer a question (blocking; safe to call from many threads at once)."""
+        return self._call(self._query(question, k, include_sources)).result()
+
+    async def aquery(self, question: str, k: int = 4, include_sources: bool = True) -> RAGResponse:
+        """Answer a question from any event loop."""
+        return await asyncio.wrap_future(self._call(self._query(question, k, include_sources)))
+
+    def query_stream(self,
+                     question: str,
+                     k: int = 4,
+                     include_sources: bool = True) -> Iterator[Union[str, RAGResponse]]:
+        """Stream an answer on the calling thread, with the question embedded by the batcher."""
+        embedding = self.embed_query(question)
+        yield from self.rag_system.query_stream(question, k=k, include_sources=include_sources,
+                                                query_embedding=embedding)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Job counts and embedding batch statistics."""
+        with self._jobs_lock:
+            statuses = [job.status for job in self.jobs.values()]
+        return {
+            'jobs': {status: statuses.count(status) for status in ("queued", "running", "done", "failed")},
+            'embedding_batches': self.batcher.get_stats()
+        }
@@ -5,16 +5,23 @@ Combines document retrieval with LLM generation using free APIs.
 
 import os
 import time
-from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple, Union
+from dataclasses import dataclass, replace
 import json
+import numpy as np
 from pathlib import Path
-import gc
-import psutil
 
 # Import our components
 from vector_store import ChromaVectorStore
 from document_processor import DocumentProcessor, DocumentChunk
+from extraction_pipeline import ExtractionPipeline
+from ingest_manifest import IngestManifest, hash_file, hash_text
+from bm25_index import BM25Index, reciprocal_rank_fusion
+from answer_cache import SemanticAnswerCache
+from rw_lock import ReadWriteLock
+from context_packer import ContextPacker
+from reranker import CrossEncoderReranker
 
 # LLM imports
 try:
@@ -37,29 +44,107 @@ class RAGResponse:
     query: str
     model_used: str
     retrieval_time: float
-    generation_time: float
+    generation_time: float  # Total seconds spent generating the answer
+    cache_hit: bool = False
+    time_to_first_token: Optional[float] = None  # Seconds from generation start to first token
+    context_tokens: Optional[int] = None  # Tokens of context sent to the LLM
+    tokens_saved: int = 0  # Context tokens removed by merging, dedup and the budget
+    rerank_time: Optional[float] = None  # Seconds spent re-ranking (None when re-ranking is off)
+    total_time: Optional[float] = None  # End-to-end seconds, retrieval through last token
 
 class RAGSystem:
     def __init__(self,
                  vector_store_path: str = "./chroma_db",
+                 embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
                  chunk_size: int = 1000,
-                 chunk_overlap: int = 200):
+                 chunk_overlap: int = 200,
+                 extraction_workers: Optional[int] = 1,
+                 file_timeout: Optional[float] = 120.0,
+                 hybrid_search: bool = True,
+                 rrf_k: int = 60,
+                 answer_cache_size: int = 256,
+                 answer_cache_ttl: Optional[float] = 3600.0,
+                 answer_cache_threshold: float = 0.95,
+                 context_token_budget: Optional[int] = 3000,
+                 duplicate_threshold: float = 0.9,
+                 rerank_model: Optional[str] = None,
+                 rerank_candidates: int = 20,
+                 rerank_budget: Optional[float] = 0.5):
         """
         Initialize RAG system with free components.
         
         Args:
             vector_store_path: Path to ChromaDB storage
+            embedding_model: Sentence transformer model name (see embedding_models)
             chunk_size: Size of document chunks
             chunk_overlap: Overlap between chunks
+            extraction_workers: Processes used to extract documents (None = CPU count);
+                workers are spawned, not forked
+            file_timeout: Seconds a single file may take to extract before it is skipped
+                (None = no limit; with one worker that also extracts serially in-process)
+            hybrid_search: Fuse BM25 keyword results with vector results
+            rrf_k: Reciprocal-rank fusion constant
+            answer_cache_size: Max answers reused for near-duplicate questions (0 disables it)
+            answer_cache_ttl: Seconds a cached answer stays valid (None = until invalidated)
+            answer_cache_threshold: Query cosine similarity needed to reuse an answer
+            context_token_budget: Max tokens of retrieved context in the prompt (None = no limit)
+            duplicate_threshold: Overlap above which a retrieved passage counts as a duplicate
+            rerank_model: Local cross-encoder used to re-rank retrieved chunks (None = off)
+            rerank_candidates: Chunks retrieved for the re-ranker to choose the top k from
+            rerank_budget: Seconds the re-ranker may spend before it stops starting new batches
         """
         self.vector_store_path = vector_store_path
         
         # Initialize components
-        self.vector_store = ChromaVectorStore(persist_directory=vector_store_path)
+        self.vector_store = ChromaVectorStore(persist_directory=vector_store_path,
+                                              embedding_model=embedding_model)
         self.document_processor = DocumentProcessor(
             chunk_size=chunk_size,
             chunk_overlap=chunk_overlap
         )
+        self.extraction_pipeline = ExtractionPipeline(
+            self.document_processor,
+            num_workers=extraction_workers,
+            file_timeout=file_timeout
+        )
+        
+        # Merges overlapping chunks and trims context before generation
+        self.context_packer = ContextPacker(
+            token_budget=context_token_budget,
+            duplicate_threshold=duplicate_threshold
+        )
+        
+        # Optional precision stage: over-fetch, re-score with a cross-encoder, keep the top k
+        self.reranker = None
+        self.rerank_candidates = rerank_candidates
+        if rerank_model:
+            self.reranker = CrossEncoderReranker(rerank_model, latency_budget=rerank_budget)
+        
+        # Queries read under this lock; ingestion takes it only to commit a batch
+        self._snapshot_lock = ReadWriteLock()
+        
+        # Content hashes of everything already ingested, kept next to the store
+        self.manifest = IngestManifest(os.path.join(vector_store_path, "ingest_manifest.json"))
+        
+        # Keyword index for exact-term lookups (error codes, names), queried alongside vectors
+        self.hybrid_search = hybrid_search
+        self.rrf_k = rrf_k
+        self.keyword_index = None
+        self._retrieval_pool = None
+        if hybrid_search:
+            self.keyword_index = BM25Index(os.path.join(vector_store_path, "bm25_index"))
+            # Two tasks per query; sized for a handful of concurrent queries
+            self._retrieval_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="retrieval")
+            self._backfill_keyword_index()
+        
+        # Answers for near-duplicate questions that retrieve the same chunks
+        self.answer_cache = None
+        if answer_cache_size > 0:
+            self.answer_cache = SemanticAnswerCache(
+                max_entries=answer_cache_size,
+                ttl=answer_cache_ttl,
+                similarity_threshold=answer_cache_threshold
+            )
         
         # Initialize LLM (prioritize free APIs)
         self.llm_client = None
@@ -68,6 +153,15 @@ class RAGSystem:
         
         print(f"🤖 RAG System initialized with {self.llm_provider} LLM")
     
+    def _backfill_keyword_index(self):
+        """Index documents ingested before the keyword index existed."""
+        if len(self.keyword_index) > 0 or self.vector_store.collection.count() == 0:
+            return
+        print("🔤 Building keyword index from existing documents...")
+        for ids, texts in self.vector_store.iter_documents():
+            self.keyword_index.add(ids, texts)
+        self.keyword_index.commit()
+    
     def _initialize_llm(self):
         """Initialize LLM client with available free APIs."""
         # Try Groq first (fastest free API)
@@ -101,85 +195,244 @@ class RAGSystem:
             "- Google AI: https://makersuite.google.com/app/apikey"
         )
     
-    def ingest_documents(self, documents_path: str) -> Dict[str, Any]:
-        """Ingest documents with memory management."""
+    def ingest_documents(self,
+                         documents_path: str,
+                         remove_missing: bool = True,
+                         progress_callback: Optional[Callable[[int, int], None]] = None) -> Dict[str, Any]:
+        """
+        Incrementally ingest documents.
+        
+        Files whose content hash matches the manifest are skipped, modified files
+        only re-embed the chunks whose text changed, and (optionally) files that
+        disappeared from the directory have their chunks removed. Extraction runs
+        in worker processes while this process embeds finished files.
+        
+        Changes are committed in batches of whole files. Each batch is embedded
+        first and then written under the snapshot lock, so concurrent queries
+        see the store as of the last committed batch, never half a file.
+        
+        Args:
+            documents_path: Directory to ingest
+            remove_missing: Remove chunks of previously ingested files under
+                documents_path that no longer exist
+            progress_callback: Called with (files done, total files) as files finish
+            
+        Returns:
+            Ingestion statistics
+        """
         try:
             start_time = time.time()
             print(f"📄 Starting document ingestion from: {documents_path}")
             
-            # Process documents in smaller batches if needed
-            chunks = []
-            batch_size = 10  # Process 10 files at a time
-            
-            # Get all files
-            all_files = list(Path(documents_path).rglob("*"))
-            supported_files = [f for f in all_files if f.suffix.lower() in self.document_processor.supported_extensions]
+            # Chunks stored under an older manifest's id scheme are all replaced
+            stale_ids = list(self.manifest.legacy_chunk_ids)
+            file_records = {}
+            chunks_created = 0
+            chunks_embedded = 0
+            chunks_unchanged = 0
+            files_skipped = 0
+            files_removed = 0
             
-            for i in range(0, len(supported_files), batch_size):
-                batch_files = supported_files[i:i + batch_size]
-                print(f"Processing batch {i//batch_size + 1}/{(len(supported_files)-1)//batch_size + 1}")
-                
-                # Process batch
-                batch_chunks = []
-                for file_path in batch_files:
-                    try:
-                        file_chunks = self.document_processor.process_file(str(file_path))
-                        batch_chunks.extend(file_chunks)
-                    except Exception as e:
-                        print(f"Error processing {file_path.name}: {e}")
-                        continue
-                
-                chunks.extend(batch_chunks)
-                
-                # Force garbage collection between batches
-                gc.collect()
-                
-                # Check memory usage
-                memory_usage = psutil.Process().memory_info().rss / 1024 / 1024  # MB
-                if memory_usage > 1000:  # If using more than 1GB
-                    print(f"High memory usage detected: {memory_usage:.2f}MB. Cleaning up...")
-                    gc.collect()
+            # Get all files, sorted so chunk order is deterministic
+            supported_files = sorted(
+                f for f in Path(documents_path).rglob("*")
+                if f.is_file() and f.suffix.lower() in self.document_processor.supported_extensions
+            )
             
-            if not chunks:
+            if not supported_files and not stale_ids and not (remove_missing and self.manifest.sources_under(documents_path)):
                 print("⚠️ No documents found or processed!")
                 return {"status": "no_documents", "chunks_created": 0}
             
-            # Prepare data for vector store
-            texts = [chunk.content for chunk in chunks]
-            metadatas = [chunk.metadata for chunk in chunks]
-            ids = [chunk.chunk_id for chunk in chunks]
+            # Drop files that were ingested before but no longer exist
+            if remove_missing:
+                present = {str(f) for f in supported_files}
+                for source in self.manifest.sources_under(documents_path):
+                    if source not in present:
+                        stale_ids.extend(self.manifest.remove_file(source))
+                        files_removed += 1
+            
+            files_done = 0
+            
+            def report_progress():
+                if progress_callback is not None:
+                    progress_callback(files_done, len(supported_files))
+            
+            # Skip files whose bytes haven't changed since the last ingest
+            file_hashes = {}
+            for file_path in supported_files:
+                source = str(file_path)
+                try:
+                    file_hash = hash_file(file_path)
+                except OSError as e:
+                    print(f"Error reading {file_path.name}: {e}")
+                    continue
+                if self.manifest.is_unchanged(source, file_hash):
+                    files_skipped += 1
+                    files_done += 1
+                else:
+                    file_hashes[source] = file_hash
+            report_progress()
+            
+            # Remove deleted files' chunks before writing anything new
+            with self._snapshot_lock.write():
+                self._delete_chunks(stale_ids)
             
-            # Add to vector store in batches
+            # Embed on this process while workers keep extracting
+            pending = []       # Chunks whose text changed and need embedding
+            pending_updates = []   # Chunks whose text is unchanged; only offsets/sizes may have moved
+            pending_removed = []
             batch_size = 100  # Smaller batch size for vector store
-            for i in range(0, len(texts), batch_size):
-                batch_end = min(i + batch_size, len(texts))
-                self.vector_store.add_documents(
-                    texts[i:batch_end],
-                    metadatas[i:batch_end],
-                    ids[i:batch_end]
-                )
-                print(f"Added batch {i//batch_size + 1}/{(len(texts)-1)//batch_size + 1} to vector store")
+            
+            def flush():
+                nonlocal chunks_embedded
+                if not (pending or pending_updates or pending_removed):
+                    return
+                # Embed outside the lock so queries keep running meanwhile
+                embeddings = self.vector_store.embed_documents([chunk.content for chunk in pending]) if pending else None
+                with self._snapshot_lock.write():
+                    self.vector_store.add_documents(
+                        [chunk.content for chunk in pending],
+                        [chunk.metadata for chunk in pending],
+                        [chunk.chunk_id for chunk in pending],
+                        upsert=True,
+                        embeddings=embeddings
+                    )
+                    if self.keyword_index is not None:
+                        self.keyword_index.add(
+                            [chunk.chunk_id for chunk in pending],
+                            [chunk.content for chunk in pending]
+                        )
+                    self._invalidate_answers([chunk.chunk_id for chunk in pending])
+                    self.vector_store.update_metadatas(
+                        [chunk.chunk_id for chunk in pending_updates],
+                        [chunk.metadata for chunk in pending_updates]
+                    )
+                    self._delete_chunks(pending_removed)
+                chunks_embedded += len(pending)
+                pending.clear()
+                pending_updates.clear()
+                pending_removed.clear()
+            
+            results = self.extraction_pipeline.iter_chunks(file_hashes.keys())
+            for source, file_chunks, error in results:
+                files_done += 1
+                if error:
+                    print(f"Error processing {Path(source).name}: {error}")
+                    report_progress()
+                    continue
+                
+                new_hashes = {chunk.chunk_id: hash_text(chunk.content) for chunk in file_chunks}
+                diff = IngestManifest.diff_chunks(self.manifest.chunk_hashes(source), new_hashes)
+                changed = set(diff['changed'])
+                
+                unchanged = [chunk for chunk in file_chunks if chunk.chunk_id not in changed]
+                pending_updates.extend(unchanged)
+                pending_removed.extend(diff['removed'])
+                stale_ids.extend(diff['removed'])
+                
+                pending.extend(chunk for chunk in file_chunks if chunk.chunk_id in changed)
+                if len(pending) + len(pending_updates) >= batch_size:
+                    flush()
+                
+                file_records[source] = (file_hashes[source], new_hashes)
+                chunks_created += len(file_chunks)
+                chunks_unchanged += len(unchanged)
+                report_progress()
+            flush()
+            
+            # Only persist the manifest once the vector store and keyword index reflect it
+            if self.keyword_index is not None:
+                self.keyword_index.commit()
+            for source, (file_hash, new_hashes) in file_records.items():
+                self.manifest.record_file(source, file_hash, new_hashes)
+            self.manifest.save()
             
             processing_time = time.time() - start_time
             
             stats = {
                 "status": "success",
-                "chunks_created": len(chunks),
+                "chunks_created": chunks_created,
+                "chunks_embedded": chunks_embedded,
+                "chunks_unchanged": chunks_unchanged,
+                "chunks_removed": len(stale_ids),
+                "files_skipped": files_skipped,
+                "files_updated": len(file_records),
+                "files_removed": files_removed,
                 "processing_time": processing_time,
                 "vector_store_stats": self.vector_store.get_stats()
             }
             
-            print(f"✅ Ingestion complete! {len(chunks)} chunks in {processing_time:.2f}s")
+            print(f"✅ Ingestion complete! {chunks_embedded} chunks embedded, "
+                  f"{files_skipped} files skipped, {files_removed} files removed in {processing_time:.2f}s")
             return stats
             
         except Exception as e:
             print(f"❌ Error during ingestion: {e}")
             raise
     
+    def load_snapshot(self, snapshot_dir: str, batch_size: int = 5000) -> Dict[str, Any]:
+        """
+        Restore an (empty) store from a snapshot and rebuild what derives from it.
+        
+        Besides the vector store (see ChromaVectorStore.load_snapshot), the
+        keyword index and ingest manifest are rebuilt from the loaded chunks and
+        cached answers are dropped. The snapshot holds no file hashes, so the
+        next ingest re-extracts each file once but only embeds chunks whose
+        text changed.
+        
+        Args:
+            snapshot_dir: Directory written by ChromaVectorStore.export_snapshot
+            batch_size: Documents inserted per call
+            
+        Returns:
+            Snapshot manifest plus the load time in seconds
+        """
+        with self._snapshot_lock.write():
+            snapshot = self.vector_store.load_snapshot(snapshot_dir, batch_size=batch_size)
+            
+            if self.keyword_index is not None:
+                self.keyword_index.delete(list(self.keyword_index.locations))
+            chunk_hashes: Dict[str, Dict[str, str]] = {}
+            for ids, texts, metadatas in self.vector_store.iter_records():
+                if self.keyword_index is not None:
+                    self.keyword_index.add(ids, texts)
+                for chunk_id, text, metadata in zip(ids, texts, metadatas):
+                    source = (metadata or {}).get('source')
+                    if source:
+                        chunk_hashes.setdefault(source, {})[chunk_id] = hash_text(text)
+            if self.keyword_index is not None:
+                self.keyword_index.commit()
+            
+            self.manifest.files = {}
+            for source, hashes in chunk_hashes.items():
+                self.manifest.record_file(source, None, hashes)
+            self.manifest.save()
+            
+            if self.answer_cache is not None:
+                self.answer_cache.clear()
+        
+        print(f"🔤 Rebuilt keyword index and manifest for {len(chunk_hashes)} files")
+        return snapshot
+    
+    def _delete_chunks(self, chunk_ids: List[str]):
+        """Remove chunks from the vector store and keyword index (caller holds the write lock)."""
+        if not chunk_ids:
+            return
+        self.vector_store.delete_documents(chunk_ids)
+        if self.keyword_index is not None:
+            self.keyword_index.delete(chunk_ids)
+        self._invalidate_answers(chunk_ids)
+    
+    def _invalidate_answers(self, chunk_ids: List[str]):
+        """Forget cached answers that were backed by re-ingested or removed chunks."""
+        if self.answer_cache is not None and chunk_ids:
+            self.answer_cache.invalidate_chunks(chunk_ids)
+    
     def query(self, 
               question: str,
               k: int = 4,
-              include_sources: bool = True) -> RAGResponse:
+              include_sources: bool = True,
+              query_embedding: Optional[np.ndarray] = None) -> RAGResponse:
         """
         Answer a question using RAG.
         
@@ -187,63 +440,206 @@ class RAGSystem:
             question: User's question
             k: Number of documents to retrieve
             include_sources: Whether to include source information
+            query_embedding: Precomputed question embedding (e.g. from a batched encode)
             
         Returns:
             RAG response with answer and sources
         """
-        import time
+        response = None
+        for item in self.query_stream(question, k=k, include_sources=include_sources,
+                                      query_embedding=query_embedding):
+            if isinstance(item, RAGResponse):
+                response = item
+        return response
+    
+    def query_stream(self,
+                     question: str,
+                     k: int = 4,
+                     include_sources: bool = True,
+                     query_embedding: Optional[np.ndarray] = None) -> Iterator[Union[str, RAGResponse]]:
+        """
+        Answer a question using RAG, streaming the answer as it is generated.
         
-        # Step 1: Retrieve relevant documents
+        Args:
+            question: User's question
+            k: Number of documents to retrieve
+            include_sources: Whether to include source information
+            query_embedding: Precomputed question embedding (e.g. from a batched encode)
+            
+        Yields:
+            Pieces of answer text as they arrive, then the complete RAGResponse
+        """
+        # Step 1: Retrieve relevant documents (more of them when re-ranking)
         retrieval_start = time.time()
-        relevant_docs = self.vector_store.similarity_search(question, k=k)
+        fetch_k = max(k, self.rerank_candidates) if self.reranker is not None else k
+        relevant_docs, cache_generation = self._retrieve(question, fetch_k, query_embedding)
         retrieval_time = time.time() - retrieval_start
         
-        if not relevant_docs:
-            return RAGResponse(
-                answer="I couldn't find any relevant information to answer your question.",
-                sources=[],
+        try:
+            rerank_time = None
+            if self.reranker is not None and relevant_docs:
+                reranked = self.reranker.rerank(question, relevant_docs, k)
+                relevant_docs = reranked.docs
+                rerank_time = reranked.seconds
+        
+            if not relevant_docs:
+                answer = "I couldn't find any relevant information to answer your question."
+                yield answer
+                yield RAGResponse(
+                    answer=answer,
+                    sources=[],
+                    query=question,
+                    model_used=f"{self.llm_provider}:{self.llm_model}",
+                    retrieval_time=retrieval_time,
+                    generation_time=0.0,
+                    total_time=time.time() - retrieval_start
+                )
+                return
+        
+            # Step 2: Reuse the answer to a near-identical question over the same chunks
+            chunk_ids = [doc['id'] for doc in relevant_docs]
+            if self.answer_cache is not None:
+                if query_embedding is None:
+                    query_embedding = self.vector_store.embed_query(question)
+                cached = self.answer_cache.get(query_embedding, chunk_ids)
+                if cached is not None:
+                    yield cached.answer
+                    yield replace(
+                        cached,
+                        sources=self._format_sources(relevant_docs) if include_sources else [],
+                        query=question,
+                        retrieval_time=retrieval_time,
+                        cache_hit=True,
+                        rerank_time=rerank_time,
+                        total_time=time.time() - retrieval_start
+                    )
+                    return
+        
+            # Step 3: Merge overlapping chunks and drop duplicates to fit the token budget
+            context = self.context_packer.pack(relevant_docs)
+        
+            # Step 4: Stream the answer from the LLM
+            pieces = []
+            failed = False
+            time_to_first_token = None
+            generation_start = time.time()
+            try:
+                for piece in self._stream_answer(question, context.passages):
+                    if time_to_first_token is None:
+                        time_to_first_token = time.time() - generation_start
+                    pieces.append(piece)
+                    yield piece
+            except Exception as e:
+                failed = True
+                provider = {"groq": "Groq", "google-ai": "Gemini"}.get(self.llm_provider, self.llm_provider)
+                error = f"Error generating response with {provider}: {str(e)}"
+                if pieces:
+                    error = "\n\n" + error
+                pieces.append(error)
+                yield error
+            generation_time = time.time() - generation_start
+        
+            response = RAGResponse(
+                answer="".join(pieces),
+                sources=self._format_sources(relevant_docs) if include_sources else [],
                 query=question,
                 model_used=f"{self.llm_provider}:{self.llm_model}",
                 retrieval_time=retrieval_time,
-                generation_time=0.0
+                generation_time=generation_time,
+                time_to_first_token=time_to_first_token,
+                context_tokens=context.tokens,
+                tokens_saved=context.tokens_saved,
+                rerank_time=rerank_time,
+                total_time=time.time() - retrieval_start
             )
+            # Failed generations must not be reused
+            if self.answer_cache is not None and not failed:
+                # Dropped if an ingest changed these chunks while the answer was generated
+                self.answer_cache.put(query_embedding, chunk_ids, response, generation=cache_generation)
+            yield response
+        finally:
+            if cache_generation is not None:
+                self.answer_cache.end(cache_generation)
+    
+    def _format_sources(self, relevant_docs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Source entries shown alongside an answer."""
+        sources = []
+        for doc in relevant_docs:
+            sources.append({
+                'content': doc['content'][:200] + "..." if len(doc['content']) > 200 else doc['content'],
+                'source': doc['metadata'].get('filename', 'Unknown'),
+                'similarity': doc['similarity'],
+                'rerank_score': doc.get('rerank_score'),
+                'chunk_id': doc['id']
+            })
+        return sources
+    
+    def _retrieve(self,
+                  question: str,
+                  k: int,
+                  query_embedding: Optional[np.ndarray] = None) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Retrieve the top-k chunks for a question from the last committed snapshot.
         
-        # Step 2: Generate answer using LLM
-        generation_start = time.time()
-        answer = self._generate_answer(question, relevant_docs)
-        generation_time = time.time() - generation_start
+        With hybrid search, vector and BM25 searches run in parallel over a
+        wider candidate pool and their rankings are merged with reciprocal-rank
+        fusion. Chunks only found by keyword carry similarity None.
         
-        # Step 3: Prepare sources
-        sources = []
-        if include_sources:
-            for doc in relevant_docs:
-                sources.append({
-                    'content': doc['content'][:200] + "..." if len(doc['content']) > 200 else doc['content'],
-                    'source': doc['metadata'].get('filename', 'Unknown'),
-                    'similarity': doc['similarity'],
-                    'chunk_id': doc['id']
-                })
-        
-        return RAGResponse(
-            answer=answer,
-            sources=sources,
-            query=question,
-            model_used=f"{self.llm_provider}:{self.llm_model}",
-            retrieval_time=retrieval_time,
-            generation_time=generation_time
+        Returns:
+            The chunks, and the answer cache generation of the snapshot they
+            came from (None without an answer cache); the caller must end() it
+        """
+        with self._snapshot_lock.read():
+            docs = self._retrieve_locked(question, k, query_embedding)
+            return docs, self.answer_cache.begin() if self.answer_cache is not None else None
+    
+    def _retrieve_locked(self,
+                         question: str,
+                         k: int,
+                         query_embedding: Optional[np.ndarray]) -> List[Dict[str, Any]]:
+        if self.keyword_index is None:
+            return self.vector_store.similarity_search(question, k=k, query_embedding=query_embedding)
+        
+        candidates = max(k * 3, 10)
+        vector_future = self._retrieval_pool.submit(
+            self.vector_store.similarity_search, question, candidates, query_embedding=query_embedding
         )
+        keyword_future = self._retrieval_pool.submit(self.keyword_index.search, question, candidates)
+        vector_docs = vector_future.result()
+        keyword_hits = keyword_future.result()
+        
+        fused = reciprocal_rank_fusion(
+            [[doc['id'] for doc in vector_docs], [doc_id for doc_id, _ in keyword_hits]],
+            k=self.rrf_k
+        )[:k]
+        
+        by_id = {doc['id']: doc for doc in vector_docs}
+        keyword_scores = dict(keyword_hits)
+        missing = [doc_id for doc_id, _ in fused if doc_id not in by_id]
+        for doc in self.vector_store.get_documents(missing):
+            doc['similarity'] = None
+            by_id[doc['id']] = doc
+        
+        results = []
+        for doc_id, score in fused:
+            if doc_id in by_id:
+                doc = by_id[doc_id]
+                doc['rrf_score'] = score
+                doc['bm25_score'] = keyword_scores.get(doc_id)
+                results.append(doc)
+        return results
     
-    def _generate_answer(self, question: str, relevant_docs: List[Dict]) -> str:
-        """Generate answer using LLM with retrieved context."""
+    def _build_prompt(self, question: str, relevant_docs: List[Dict]) -> str:
+        """Build the LLM prompt from the packed context passages."""
         
         # Build context from retrieved documents
         context = "\n\n".join([
-            f"Document {i+1}: {doc['content']}" 
+            self.context_packer.format_passage(i + 1, doc['content'])
             for i, doc in enumerate(relevant_docs)
         ])
         
         # Create prompt
-        prompt = f"""Based on the following context documents, please answer the user's question. 
+        return f"""Based on the following context documents, please answer the user's question. 
 If the answer cannot be found in the context, say so clearly.
 
 Context:
@@ -252,38 +648,40 @@ Context:
 Question: {question}
 
 Answer: Provide a clear, concise answer based solely on the information in the context documents above."""
+    
+    def _stream_answer(self, question: str, relevant_docs: List[Dict]) -> Iterator[str]:
+        """Stream an answer from the LLM with retrieved context."""
+        prompt = self._build_prompt(question, relevant_docs)
         
         # Generate response based on provider
         if self.llm_provider == "groq":
-            return self._groq_generate(prompt)
+            return self._groq_stream(prompt)
         elif self.llm_provider == "google-ai":
-            return self._gemini_generate(prompt)
+            return self._gemini_stream(prompt)
         else:
-            return "Error: No LLM provider available"
+            return iter(["Error: No LLM provider available"])
     
-    def _groq_generate(self, prompt: str) -> str:
-        """Generate response using Groq API."""
-        try:
-            chat_completion = self.llm_client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that answers questions based on provided context."},
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.llm_model,
-                temperature=0.1,
-                max_tokens=1000
-            )
-            return chat_completion.choices[0].message.content
-        except Exception as e:
-            return f"Error generating response with Groq: {str(e)}"
+    def _groq_stream(self, prompt: str) -> Iterator[str]:
+        """Stream response tokens from the Groq API."""
+        stream = self.llm_client.chat.completions.create(
+            messages=[
+                {"role": "system", "content": "You are a helpful assistant that answers questions based on provided context."},
+                {"role": "user", "content": prompt}
+            ],
+            model=self.llm_model,
+            temperature=0.1,
+            max_tokens=1000,
+            stream=True
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
     
-    def _gemini_generate(self, prompt: str) -> str:
-        """Generate response using Google Gemini API."""
-        try:
-            response = self.llm_client.generate_content(prompt)
-            return response.text
-        except Exception as e:
-            return f"Error generating response with Gemini: {str(e)}"
+    def _gemini_stream(self, prompt: str) -> Iterator[str]:
+        """Stream response text from the Google Gemini API."""
+        for chunk in self.llm_client.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
     
     def get_system_stats(self) -> Dict[str, Any]:
         """Get comprehensive system statistics."""
@@ -293,6 +691,9 @@ Answer: Provide a clear, concise answer based solely on the information in the c
             "llm_provider": self.llm_provider,
             "llm_model": self.llm_model,
             "vector_store": vector_stats,
+            "keyword_index": self.keyword_index.get_stats() if self.keyword_index else None,
+            "answer_cache": self.answer_cache.get_stats() if self.answer_cache else None,
+            "reranker": self.reranker.get_stats() if self.reranker else None,
             "document_processor": {
                 "chunk_size": self.document_processor.chunk_size,
                 "chunk_overlap": self.document_processor.chunk_overlap,
@@ -0,0 +1,166 @@
+"""
+Cross-Encoder Re-ranker
+Re-scores over-fetched retrieval candidates with a small local cross-encoder
+and keeps the best k, caching scores per (question, chunk).
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+@dataclass
+class RerankResult:
+    docs: List[Dict[str, Any]]   # Best k, each with 'rerank_score' (None if not scored in time)
+    seconds: float               # Time spent in the stage
+    scored: int = 0              # Pairs run through the model
+    cached: int = 0              # Pairs served from the score cache
+    budget_exceeded: bool = False
+
+
+class CrossEncoderReranker:
+    """
+    Re-ranks retrieved chunks by cross-encoder relevance to the question.
+
+    Candidates are scored in retrieval order, `batch_size` pairs per model
+    call. Once `latency_budget` seconds have passed, no further batches are
+    started: the candidates left unscored keep their retrieval order behind
+    the scored ones. Scores are cached per (question hash, chunk id) together
+    with a hash of the chunk text, so a re-ingested chunk is scored afresh.
+    """
+
+    def __init__(self,
+                 model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2",
+                 batch_size: int = 16,
+                 latency_budget: Optional[float] = 0.5,
+                 cache_size: int = 10_000,
+                 model=None):
+        """
+        Initialize the re-ranker.
+
+        Args:
+            model_name: Local path or cached name of a sentence-transformers CrossEncoder
+            batch_size: (question, chunk) pairs scored per model call
+            latency_budget: Seconds after which no new batch is started (None = score all)
+            cache_size: Max cached scores (0 disables the cache)
+            model: Object with CrossEncoder's predict(pairs, batch_size=...) (loaded lazily if None)
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.latency_budget = latency_budget
+        self.cache_size = cache_size
+        self._model = model
+        self._model_lock = threading.Lock()
+        self._cache: 'OrderedDict[Tuple[str, str], Tuple[str, float]]' = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+
+    def _load(self):
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import CrossEncoder
+                    print(f"🔄 Loading re-ranking model: {self.model_name}")
+                    self._model = CrossEncoder(self.model_name)
+        return self._model
+
+    def _cache_get(self, key: Tuple[str, str], content_hash: str) -> Optional[float]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is None or entry[0] != content_hash:
+                self.misses += 1
+                return None
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def _cache_put(self, items: List[Tuple[Tuple[str, str], str, float]]):
+        if self.cache_size <= 0:
+            return
+        with self._cache_lock:
+            for key, content_hash, score in items:
+                self._cache[key] = (content_hash, score)
+                self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def rerank(self, question: str, docs: List[Dict[str, Any]], k: int) -> RerankResult:
+        """
+        Re-score candidates and keep the best k.
+
+        Args:
+            question: User's question
+            docs: Retrieved candidates, best first
+            k: Number of documents to keep
+
+        Returns:
+            The re-ranked top k and stage statistics
+        """
+        start = time.perf_counter()
+        question_hash = _digest(question)
+        scores: List[Optional[float]] = [None] * len(docs)
+        pending = []
+        cached = 0
+        for i, doc in enumerate(docs):
+            content_hash = _digest(doc['content'])
+            score = self._cache_get((question_hash, doc['id']), content_hash)
+            if score is None:
+                pending.append((i, content_hash))
+            else:
+                scores[i] = score
+                cached += 1
+
+        scored = 0
+        budget_exceeded = False
+        for offset in range(0, len(pending), self.batch_size):
+            if self.latency_budget is not None and time.perf_counter() - start > self.latency_budget:
+                budget_exceeded = True
+                break
+            batch = pending[offset:offset + self.batch_size]
+            pairs = [(question, docs[i]['content']) for i, _ in batch]
+            batch_scores = self._load().predict(pairs, batch_size=self.batch_size)
+            new_entries = []
+            for (i, content_hash), score in zip(batch, batch_scores):
+                scores[i] = float(score)
+                new_entries.append(((question_hash, docs[i]['id']), content_hash, float(score)))
+            self._cache_put(new_entries)
+            scored += len(batch)
+
+        # Scored candidates by score, then unscored ones in retrieval order
+        order = sorted(
+            range(len(docs)),
+            key=lambda i: (scores[i] is None, -(scores[i] or 0.0), i)
+        )[:k]
+        results = []
+        for i in order:
+            doc = dict(docs[i])
+            doc['rerank_score'] = scores[i]
+            results.append(doc)
+
+        return RerankResult(
+            docs=results,
+            seconds=time.perf_counter() - start,
+            scored=scored,
+            cached=cached,
+            budget_exceeded=budget_exceeded
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'model': self.model_name,
+            'entries': len(self._cache),
+            'cache_size': self.cache_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
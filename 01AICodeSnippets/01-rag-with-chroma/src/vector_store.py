@@ -4,17 +4,34 @@ Handles embedding storage and similarity search using free tools.
 """
 
 import chromadb
+import json
 import os
-from typing import List, Dict, Any, Optional
-from sentence_transformers import SentenceTransformer
+import time
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import numpy as np
 from pathlib import Path
 
+from embedding_cache import EmbeddingCache
+from embedding_models import get_embedding_model
+from quantized_index import QuantizedVectorIndex
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+SNAPSHOT_VERSION = 1
+
 class ChromaVectorStore:
     def __init__(self, 
                  persist_directory: str = "./chroma_db",
                  collection_name: str = "rag_documents",
-                 embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2"):
+                 embedding_model: str = "sentence-transformers/all-MiniLM-L6-v2",
+                 embedding_cache_size: int = 100_000,
+                 storage_mode: str = "float32",
+                 rerank_factor: int = 4):
         """
         Initialize ChromaDB vector store with free embedding model.
         
@@ -22,29 +39,74 @@ class ChromaVectorStore:
             persist_directory: Where to store the database
             collection_name: Name of the collection
             embedding_model: Free sentence transformer model
+            embedding_cache_size: Max embeddings kept in the on-disk cache (0 disables it)
+            storage_mode: "float32" keeps vectors in Chroma; "int8" or "float16" keeps
+                them in a compact memory-mapped side index instead
+            rerank_factor: int8 mode only; candidates re-scored against float16 per result
         """
         self.persist_directory = persist_directory
         self.collection_name = collection_name
+        self.embedding_model_name = embedding_model
+        self.storage_mode = storage_mode
         
         # Initialize ChromaDB client
         self.client = chromadb.PersistentClient(path=persist_directory)
         
-        # Initialize free embedding model
-        print(f"🔄 Loading embedding model: {embedding_model}")
-        self.embedding_model = SentenceTransformer(embedding_model)
+        # Free embedding model, shared across stores and loaded on first encode
+        self.embedding_model = get_embedding_model(embedding_model)
+        
+        # Embeddings keyed by (model, text hash) so duplicates and repeat queries skip encoding
+        self.embedding_cache = None
+        if embedding_cache_size > 0:
+            self.embedding_cache = EmbeddingCache(
+                os.path.join(persist_directory, "embedding_cache.sqlite"),
+                max_entries=embedding_cache_size
+            )
         
         # Get or create collection
         self.collection = self.client.get_or_create_collection(
             name=collection_name,
             metadata={"hnsw:space": "cosine"}  # Use cosine similarity
         )
+        self._check_storage_mode()
+        
+        # Compact mode: Chroma only holds documents and metadata, vectors live here
+        self.compact_index = None
+        if storage_mode != "float32":
+            self.compact_index = QuantizedVectorIndex(
+                os.path.join(persist_directory, "compact_index"),
+                dtype=storage_mode,
+                rerank_factor=rerank_factor
+            )
         
         print(f"✅ ChromaDB initialized with {self.collection.count()} documents")
     
+    def _check_storage_mode(self):
+        """Refuse to open a non-empty collection in a different storage mode.
+        
+        Compact collections hold 1-d placeholder embeddings in Chroma, so a
+        collection built in one mode cannot take writes or queries in another.
+        """
+        if self.collection.count() == 0:
+            return
+        sample = self.collection.get(limit=1, include=['embeddings'])['embeddings']
+        stored = "float32"
+        if len(sample[0]) == 1:
+            meta_path = Path(self.persist_directory) / "compact_index" / "meta.json"
+            stored = json.loads(meta_path.read_text())['dtype'] if meta_path.exists() else "int8 or float16"
+        if stored != self.storage_mode:
+            raise ValueError(
+                f"Collection '{self.collection_name}' in {self.persist_directory} was built with "
+                f"storage_mode='{stored}', not '{self.storage_mode}'. Reopen it in its own mode, or "
+                f"export_snapshot() it and load_snapshot() into a new directory with the new mode."
+            )
+    
     def add_documents(self, 
                      texts: List[str], 
                      metadatas: List[Dict[str, Any]],
-                     ids: Optional[List[str]] = None) -> None:
+                     ids: Optional[List[str]] = None,
+                     upsert: bool = False,
+                     embeddings: Optional[np.ndarray] = None) -> None:
         """
         Add documents to the vector store.
         
@@ -52,13 +114,14 @@ class ChromaVectorStore:
             texts: List of document texts to embed
             metadatas: List of metadata dictionaries
             ids: Optional list of document IDs
+            upsert: Overwrite documents whose IDs already exist
+            embeddings: Precomputed embeddings from embed_documents (skips encoding)
         """
         if not texts:
             return
         
-        # Generate embeddings using free model
-        print(f"🔄 Generating embeddings for {len(texts)} documents...")
-        embeddings = self.embedding_model.encode(texts, show_progress_bar=True)
+        if embeddings is None:
+            embeddings = self.embed_documents(texts)
         
         # Generate IDs if not provided
         if ids is None:
@@ -66,19 +129,88 @@ class ChromaVectorStore:
             ids = [f"doc_{existing_count + i}" for i in range(len(texts))]
         
         # Add to ChromaDB
-        self.collection.add(
-            embeddings=embeddings.tolist(),
-            documents=texts,
-            metadatas=metadatas,
-            ids=ids
-        )
+        write = self.collection.upsert if upsert else self.collection.add
+        if self.compact_index is not None:
+            # Arrays go straight into the memmaps; Chroma gets 1-d placeholders
+            if upsert:
+                self.compact_index.add(ids, embeddings)
+            else:
+                new = [i for i, doc_id in enumerate(ids) if doc_id not in self.compact_index.id_to_row]
+                self.compact_index.add([ids[i] for i in new], embeddings[new])
+            write(
+                embeddings=np.ones((len(ids), 1), dtype=np.float32),
+                documents=texts,
+                metadatas=metadatas,
+                ids=ids
+            )
+        else:
+            # Hand the array over as-is rather than building per-float Python lists
+            write(
+                embeddings=embeddings,
+                documents=texts,
+                metadatas=metadatas,
+                ids=ids
+            )
         
         print(f"✅ Added {len(texts)} documents to vector store")
     
+    def _encode(self, texts: List[str], show_progress_bar: bool = False) -> np.ndarray:
+        """Embed texts, only running the model on texts missing from the cache."""
+        if self.embedding_cache is None:
+            return self.embedding_model.encode(texts, show_progress_bar=show_progress_bar)
+        
+        cached, missing = self.embedding_cache.get_many(self.embedding_model_name, texts)
+        if not missing:
+            return np.stack([cached[i] for i in range(len(texts))])
+        
+        # A text repeated within the batch is encoded once
+        missing_texts = list(dict.fromkeys(texts[i] for i in missing))
+        new_embeddings = np.asarray(
+            self.embedding_model.encode(missing_texts, show_progress_bar=show_progress_bar),
+            dtype=np.float32
+        )
+        self.embedding_cache.put_many(self.embedding_model_name, missing_texts, new_embeddings)
+        
+        row_of = {text: row for row, text in enumerate(missing_texts)}
+        embeddings = np.empty((len(texts), new_embeddings.shape[1]), dtype=np.float32)
+        for i, vector in cached.items():
+            embeddings[i] = vector
+        embeddings[missing] = new_embeddings[[row_of[texts[i]] for i in missing]]
+        return embeddings
+    
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        """Embed document texts with the free model (cached texts are not re-encoded)."""
+        print(f"🔄 Generating embeddings for {len(texts)} documents...")
+        return self._encode(texts, show_progress_bar=True)
+    
+    def embed_queries(self, queries: List[str]) -> np.ndarray:
+        """Embed a batch of queries in one model call."""
+        return self._encode(queries)
+    
+    def embed_query(self, query: str) -> np.ndarray:
+        """Embedding of a single query (served from the embedding cache after a search)."""
+        return self._encode([query])[0]
+    
+    def update_metadatas(self, ids: List[str], metadatas: List[Dict[str, Any]]) -> None:
+        """Update metadata of existing documents without re-embedding them."""
+        if not ids:
+            return
+        self.collection.update(ids=ids, metadatas=metadatas)
+    
+    def delete_documents(self, ids: List[str]) -> None:
+        """Remove documents by ID."""
+        if not ids:
+            return
+        self.collection.delete(ids=ids)
+        if self.compact_index is not None:
+            self.compact_index.delete(ids)
+        print(f"🗑️ Removed {len(ids)} documents from vector store")
+    
     def similarity_search(self, 
                          query: str, 
                          k: int = 4,
-                         filter_metadata: Optional[Dict] = None) -> List[Dict[str, Any]]:
+                         filter_metadata: Optional[Dict] = None,
+                         query_embedding: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """
         Search for similar documents.
         
@@ -86,40 +218,277 @@ class ChromaVectorStore:
             query: Search query
             k: Number of results to return
             filter_metadata: Optional metadata filter
+            query_embedding: Precomputed embedding of the query (skips encoding)
             
         Returns:
             List of similar documents with metadata
         """
-        # Generate query embedding
-        query_embedding = self.embedding_model.encode([query])
+        query_embeddings = None if query_embedding is None else np.asarray(query_embedding)[None, :]
+        return self.similarity_search_batch(
+            [query], k=k, filter_metadata=filter_metadata, query_embeddings=query_embeddings
+        )[0]
+    
+    def similarity_search_batch(self,
+                                queries: List[str],
+                                k: int = 4,
+                                filter_metadata: Optional[Dict] = None,
+                                query_embeddings: Optional[np.ndarray] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Search for similar documents for many queries at once.
+        
+        All queries are embedded in one model forward pass and sent to ChromaDB
+        as a single multi-embedding query.
+        
+        Args:
+            queries: Search queries
+            k: Number of results to return per query
+            filter_metadata: Optional metadata filter applied to every query
+            query_embeddings: Precomputed (n, dim) query embeddings (skips encoding)
+            
+        Returns:
+            One list of similar documents (same format as similarity_search) per query
+        """
+        if not queries:
+            return []
+        
+        # Generate query embeddings in one batch
+        if query_embeddings is None:
+            query_embeddings = self.embed_queries(queries)
+        
+        if self.compact_index is not None:
+            return [self._compact_search(embedding, k, filter_metadata) for embedding in query_embeddings]
         
         # Search in ChromaDB
         results = self.collection.query(
-            query_embeddings=query_embedding.tolist(),
+            query_embeddings=query_embeddings,
             n_results=k,
             where=filter_metadata
         )
         
         # Format results
-        documents = []
-        for i in range(len(results['documents'][0])):
-            documents.append({
-                'content': results['documents'][0][i],
-                'metadata': results['metadatas'][0][i],
-                'similarity': 1 - results['distances'][0][i],  # Convert distance to similarity
-                'id': results['ids'][0][i]
-            })
+        all_documents = []
+        for q in range(len(queries)):
+            documents = []
+            for i in range(len(results['documents'][q])):
+                documents.append({
+                    'content': results['documents'][q][i],
+                    'metadata': results['metadatas'][q][i],
+                    'similarity': 1 - results['distances'][q][i],  # Convert distance to similarity
+                    'id': results['ids'][q][i]
+                })
+            all_documents.append(documents)
         
+        return all_documents
+    
+    def _compact_search(self,
+                        query_embedding: np.ndarray,
+                        k: int,
+                        filter_metadata: Optional[Dict] = None) -> List[Dict[str, Any]]:
+        """Search the compact index, then fetch documents and metadata from Chroma."""
+        allowed_ids = None
+        if filter_metadata:
+            allowed_ids = set(self.collection.get(where=filter_metadata, include=[])['ids'])
+        
+        hits = self.compact_index.search(query_embedding, k, allowed_ids=allowed_ids)
+        if not hits:
+            return []
+        
+        similarities = dict(hits)
+        documents = self.get_documents(list(similarities))
+        for doc in documents:
+            doc['similarity'] = similarities[doc['id']]
         return documents
     
+    def get_documents(self, ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch documents and metadata by ID, in the order given (missing IDs are skipped)."""
+        if not ids:
+            return []
+        records = self.collection.get(ids=ids, include=['documents', 'metadatas'])
+        by_id = {
+            doc_id: (document, metadata)
+            for doc_id, document, metadata in zip(records['ids'], records['documents'], records['metadatas'])
+        }
+        return [
+            {
+                'content': by_id[doc_id][0],
+                'metadata': by_id[doc_id][1],
+                'id': doc_id
+            }
+            for doc_id in ids if doc_id in by_id
+        ]
+    
+    def iter_documents(self, batch_size: int = 1000) -> Iterator[Tuple[List[str], List[str]]]:
+        """Page through all stored (ids, texts) without loading embeddings."""
+        offset = 0
+        while True:
+            records = self.collection.get(include=['documents'], limit=batch_size, offset=offset)
+            if not records['ids']:
+                return
+            yield records['ids'], records['documents']
+            offset += len(records['ids'])
+    
+    def iter_records(self, batch_size: int = 1000) -> Iterator[Tuple[List[str], List[str], List[Dict[str, Any]]]]:
+        """Page through all stored (ids, texts, metadatas) without loading embeddings."""
+        offset = 0
+        while True:
+            records = self.collection.get(include=['documents', 'metadatas'], limit=batch_size, offset=offset)
+            if not records['ids']:
+                return
+            yield records['ids'], records['documents'], records['metadatas']
+            offset += len(records['ids'])
+    
+    def export_snapshot(self, snapshot_dir: str, batch_size: int = 5000) -> Dict[str, Any]:
+        """
+        Write every document, its metadata and embedding to a portable snapshot.
+        
+        The snapshot directory holds records.parquet (id, document and
+        metadata as JSON, one row group per batch), embeddings.f32 (a raw
+        row-major float32 matrix in the same row order) and snapshot.json.
+        Embeddings never pass through Python lists.
+        
+        Args:
+            snapshot_dir: Directory to write (created if missing)
+            batch_size: Documents read from the collection at a time
+            
+        Returns:
+            Snapshot manifest
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for snapshots. Install with: pip install pyarrow")
+        
+        directory = Path(snapshot_dir)
+        directory.mkdir(parents=True, exist_ok=True)
+        schema = pa.schema([('id', pa.string()), ('document', pa.string()), ('metadata', pa.string())])
+        
+        start_time = time.perf_counter()
+        count, dim = 0, None
+        include = ['documents', 'metadatas'] + ([] if self.compact_index is not None else ['embeddings'])
+        with pq.ParquetWriter(directory / "records.parquet", schema) as writer, \
+                open(directory / "embeddings.f32", 'wb') as vectors_file:
+            while True:
+                records = self.collection.get(include=include, limit=batch_size, offset=count)
+                ids = records['ids']
+                if not ids:
+                    break
+                
+                if self.compact_index is not None:
+                    embeddings = self.compact_index.get_vectors(ids)
+                else:
+                    embeddings = np.asarray(records['embeddings'], dtype=np.float32)
+                dim = embeddings.shape[1]
+                np.ascontiguousarray(embeddings).tofile(vectors_file)
+                
+                writer.write_table(pa.table({
+                    'id': ids,
+                    'document': records['documents'],
+                    'metadata': [json.dumps(metadata) for metadata in records['metadatas']]
+                }, schema=schema))
+                count += len(ids)
+        
+        manifest = {
+            'version': SNAPSHOT_VERSION,
+            'count': count,
+            'dim': dim,
+            'dtype': 'float32',
+            'embedding_model': self.embedding_model_name,
+            'collection_name': self.collection_name,
+            'storage_mode': self.storage_mode,
+            'created_at': time.time()
+        }
+        with open(directory / "snapshot.json", 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2)
+        
+        print(f"✅ Exported {count} documents to {directory} in {time.perf_counter() - start_time:.1f}s")
+        return manifest
+    
+    def load_snapshot(self, snapshot_dir: str, batch_size: int = 5000) -> Dict[str, Any]:
+        """
+        Bulk-load a snapshot written by export_snapshot into this (empty) store.
+        
+        The embedding matrix is memory-mapped and handed to the collection in
+        large slices, so nothing is re-embedded and memory stays bounded by
+        the batch size. The embeddings also seed the embedding cache.
+        
+        The keyword index and ingest manifest live in RAGSystem; use
+        RAGSystem.load_snapshot to rebuild them as well.
+        
+        Args:
+            snapshot_dir: Directory written by export_snapshot
+            batch_size: Documents inserted per call (capped by Chroma's max batch size)
+            
+        Returns:
+            Snapshot manifest plus the load time in seconds
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for snapshots. Install with: pip install pyarrow")
+        
+        directory = Path(snapshot_dir)
+        with open(directory / "snapshot.json", 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest['version'] != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported snapshot version: {manifest['version']}")
+        if manifest['embedding_model'] != self.embedding_model_name:
+            raise ValueError(
+                f"Snapshot embeddings come from {manifest['embedding_model']}, "
+                f"but this store uses {self.embedding_model_name}"
+            )
+        if self.collection.count() > 0:
+            raise ValueError(f"Collection {self.collection_name} is not empty; load snapshots into a fresh one")
+        
+        records = pq.ParquetFile(directory / "records.parquet")
+        count = manifest['count']
+        if records.metadata.num_rows != count:
+            raise ValueError(f"Snapshot records ({records.metadata.num_rows}) do not match its embeddings ({count})")
+        
+        start_time = time.perf_counter()
+        if count:
+            embeddings = np.memmap(directory / "embeddings.f32", dtype=np.float32, mode='r',
+                                   shape=(count, manifest['dim']))
+            batch_size = min(batch_size, self.client.get_max_batch_size())
+            offset = 0
+            for batch in records.iter_batches(batch_size=batch_size):
+                columns = batch.to_pydict()
+                ids = columns['id']
+                batch_embeddings = np.asarray(embeddings[offset:offset + len(ids)])
+                self.add_documents(
+                    columns['document'],
+                    [json.loads(metadata) for metadata in columns['metadata']],
+                    ids,
+                    embeddings=batch_embeddings
+                )
+                if self.embedding_cache is not None:
+                    self.embedding_cache.put_many(self.embedding_model_name, columns['document'], batch_embeddings)
+                offset += len(ids)
+        
+        seconds = time.perf_counter() - start_time
+        print(f"✅ Loaded {count} documents from {directory} in {seconds:.1f}s")
+        return dict(manifest, load_seconds=seconds)
+    
+    @staticmethod
+    def count_documents(persist_directory: str = "./chroma_db",
+                        collection_name: str = "rag_documents") -> int:
+        """Count stored documents without loading the embedding model."""
+        client = chromadb.PersistentClient(path=persist_directory)
+        try:
+            return client.get_collection(name=collection_name).count()
+        except Exception:
+            # Collection doesn't exist yet
+            return 0
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get vector store statistics."""
         count = self.collection.count()
         return {
             'total_documents': count,
             'collection_name': self.collection_name,
-            'embedding_model': self.embedding_model.get_sentence_embedding_dimension(),
-            'persist_directory': self.persist_directory
+            # Embedding dimension; None until the model has been loaded
+            'embedding_model': (self.embedding_model.get_sentence_embedding_dimension()
+                                if self.embedding_model.is_loaded else None),
+            'embedding_model_name': self.embedding_model_name,
+            'persist_directory': self.persist_directory,
+            'embedding_cache': self.embedding_cache.get_stats() if self.embedding_cache else None,
+            'storage_mode': self.storage_mode,
+            'compact_index': self.compact_index.get_stats() if self.compact_index else None
         }
     
     def delete_collection(self):
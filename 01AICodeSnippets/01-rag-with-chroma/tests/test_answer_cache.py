@@ -0,0 +1,100 @@
+"""
+Tests for the semantic answer cache
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from answer_cache import SemanticAnswerCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSemanticAnswerCache(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = SemanticAnswerCache(max_entries=2, ttl=60, similarity_threshold=0.95, clock=self.clock)
+        self.query = np.array([1.0, 0.0, 0.0])
+
+    def test_near_duplicate_with_same_chunks_hits(self):
+        self.cache.put(self.query, ["a", "b"], "answer")
+        self.assertEqual(self.cache.get([0.99, 0.05, 0.0], ["b", "a"]), "answer")
+        self.assertIsNone(self.cache.get([0.5, 0.5, 0.0], ["a", "b"]))
+        self.assertEqual(self.cache.get_stats()["hit_rate"], 0.5)
+
+    def test_different_chunks_miss(self):
+        self.cache.put(self.query, ["a", "b"], "answer")
+        self.assertIsNone(self.cache.get(self.query, ["a", "c"]))
+        self.assertIsNone(self.cache.get(self.query, ["a"]))
+
+    def test_ttl_expiry(self):
+        self.cache.put(self.query, ["a"], "answer")
+        self.clock.now = 61
+        self.assertIsNone(self.cache.get(self.query, ["a"]))
+        self.assertEqual(len(self.cache), 0)
+
+    def test_lru_eviction(self):
+        self.cache.put(self.query, ["a"], "first")
+        self.cache.put(self.query, ["b"], "second")
+        self.cache.get(self.query, ["a"])
+        self.cache.put(self.query, ["c"], "third")
+        self.assertEqual(self.cache.get(self.query, ["a"]), "first")
+        self.assertIsNone(self.cache.get(self.query, ["b"]))
+        self.assertEqual(self.cache.get_stats()["evictions"], 1)
+
+    def test_invalidate_chunks(self):
+        self.cache.put(self.query, ["a", "b"], "first")
+        self.cache.put(self.query, ["c"], "second")
+        self.assertEqual(self.cache.invalidate_chunks(["b", "z"]), 1)
+        self.assertIsNone(self.cache.get(self.query, ["a", "b"]))
+        self.assertEqual(self.cache.get(self.query, ["c"]), "second")
+
+    def test_put_after_invalidation_is_dropped(self):
+        generation = self.cache.begin()
+        self.cache.invalidate_chunks(["b"])
+        self.cache.put(self.query, ["a", "b"], "stale", generation=generation)
+        self.cache.put(self.query, ["c"], "fresh", generation=generation)
+        self.cache.end(generation)
+        self.assertIsNone(self.cache.get(self.query, ["a", "b"]))
+        self.assertEqual(self.cache.get(self.query, ["c"]), "fresh")
+        self.assertEqual(self.cache.get_stats()["stale_puts"], 1)
+
+        generation = self.cache.begin()
+        self.cache.put(self.query, ["a", "b"], "current", generation=generation)
+        self.cache.end(generation)
+        self.assertEqual(self.cache.get(self.query, ["a", "b"]), "current")
+
+    def test_invalidations_are_forgotten_once_no_answer_needs_them(self):
+        held = self.cache.begin()
+        for batch in range(50):
+            self.cache.invalidate_chunks([f"doc{batch}_{i}" for i in range(20)])
+        # An answer in flight since before the ingests still needs all of them
+        self.assertEqual(len(self.cache._invalidated_at), 1000)
+        later = self.cache.begin()
+        self.cache.invalidate_chunks(["late"])
+
+        self.cache.end(held)
+        self.assertEqual(set(self.cache._invalidated_at), {"late"})
+        self.cache.put(self.query, ["late"], "stale", generation=later)
+        self.cache.end(later)
+        self.assertEqual(self.cache._invalidated_at, {})
+        self.assertEqual(self.cache.get_stats()["stale_puts"], 1)
+
+        # A generation read without begin() can no longer be checked, so its answer is dropped
+        self.cache.put(self.query, ["x"], "unchecked", generation=held)
+        self.assertIsNone(self.cache.get(self.query, ["x"]))
+
+if __name__ == "__main__":
+    unittest.main()
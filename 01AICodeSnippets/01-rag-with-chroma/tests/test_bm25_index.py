@@ -0,0 +1,103 @@
+"""
+Tests for the BM25 keyword index
+"""
+
+import math
+import sys
+import tempfile
+import unittest
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from bm25_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+
+def reference_scores(docs, query, k1=1.5, b=0.75):
+    """Straightforward BM25 over a dict of id -> text."""
+    tokenized = {doc_id: Counter(tokenize(text)) for doc_id, text in docs.items()}
+    avg_length = sum(sum(c.values()) for c in tokenized.values()) / len(tokenized)
+    scores = {}
+    for term in set(tokenize(query)):
+        df = sum(1 for c in tokenized.values() if term in c)
+        if not df:
+            continue
+        idf = math.log(1 + (len(docs) - df + 0.5) / (df + 0.5))
+        for doc_id, counts in tokenized.items():
+            tf = counts.get(term, 0)
+            if tf:
+                norm = k1 * (1 - b + b * sum(counts.values()) / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / (tf + norm)
+    return scores
+
+
+class TestBM25Index(unittest.TestCase):
+
+    DOCS = {
+        "a": "The server returned ERR-4021 after the upgrade.",
+        "b": "Upgrade notes: restart the server before migrating.",
+        "c": "Grace Hopper wrote the first compiler.",
+        "d": "Compilers translate source code; the server runs it.",
+    }
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "bm25"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def assertMatchesReference(self, index, docs, query):
+        expected = reference_scores(docs, query)
+        results = dict(index.search(query, k=len(docs)))
+        self.assertEqual(set(results), set(expected))
+        for doc_id, score in expected.items():
+            self.assertAlmostEqual(results[doc_id], score, places=4)
+
+    def test_tokenize_keeps_compound_terms(self):
+        self.assertEqual(tokenize("See ERR-4021 now"), ["see", "err-4021", "err", "4021", "now"])
+
+    def test_exact_term_lookup(self):
+        index = BM25Index(str(self.path))
+        index.add(list(self.DOCS), list(self.DOCS.values()))
+        self.assertEqual(index.search("err-4021", k=2)[0][0], "a")
+        self.assertEqual(index.search("hopper", k=2)[0][0], "c")
+
+    def test_incremental_updates_match_full_rebuild(self):
+        index = BM25Index(str(self.path))
+        for doc_id, text in self.DOCS.items():
+            index.add([doc_id], [text])
+        index.commit()
+        index.add(["b"], ["Rollback notes for ERR-4021 on the server."])
+        index.delete(["c"])
+        index.commit()
+
+        docs = dict(self.DOCS, b="Rollback notes for ERR-4021 on the server.")
+        del docs["c"]
+        for query in ("server err-4021", "compiler hopper", "upgrade notes"):
+            self.assertMatchesReference(index, docs, query)
+
+        # Reopening sees the same state
+        reopened = BM25Index(str(self.path))
+        self.assertEqual(len(reopened), 3)
+        self.assertMatchesReference(reopened, docs, "server err-4021")
+
+    def test_compaction_bounds_segments(self):
+        index = BM25Index(str(self.path))
+        docs = {}
+        for i in range(BM25Index.MAX_SEGMENTS + 3):
+            docs[f"doc{i}"] = f"shared term number{i}"
+            index.add([f"doc{i}"], [docs[f"doc{i}"]])
+            index.commit()
+        self.assertLessEqual(len(index.segments), BM25Index.MAX_SEGMENTS)
+        self.assertMatchesReference(BM25Index(str(self.path)), docs, "shared number3")
+
+    def test_reciprocal_rank_fusion(self):
+        fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "a"]], k=60)
+        self.assertEqual([doc_id for doc_id, _ in fused], ["a", "c", "b"])
+        self.assertAlmostEqual(fused[0][1], 1 / 61 + 1 / 62)
+
+
+if __name__ == "__main__":
+    unittest.main()
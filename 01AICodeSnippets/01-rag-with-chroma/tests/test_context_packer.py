@@ -0,0 +1,104 @@
+"""
+Tests for context packing before generation
+"""
+
+import random
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from context_packer import ContextPacker, TokenCounter
+from document_processor import DocumentProcessor
+
+
+class CharCounter(TokenCounter):
+    """Deterministic counter (~4 characters per token) regardless of tiktoken."""
+
+    def __init__(self):
+        self._encoding = None
+
+
+class MeteredCounter(CharCounter):
+    """Records how many characters were tokenized."""
+
+    def __init__(self):
+        super().__init__()
+        self.characters = 0
+
+    def count(self, text):
+        self.characters += len(text)
+        return super().count(text)
+
+
+def retrieved(chunks, order=None):
+    """Chunks in the shape returned by the vector store."""
+    docs = [{'id': c.chunk_id, 'content': c.content, 'metadata': c.metadata} for c in chunks]
+    return [docs[i] for i in order] if order else docs
+
+
+class TestContextPacker(unittest.TestCase):
+
+    def setUp(self):
+        rng = random.Random(1)
+        words = ["alpha", "beta", "gamma", "delta", "vector", "index", "query", "token"]
+        text = " ".join(
+            " ".join(rng.choice(words) for _ in range(rng.randint(5, 15))) + "."
+            for _ in range(120)
+        )
+        processor = DocumentProcessor(chunk_size=400, chunk_overlap=100)
+        self.text = processor._clean_text(text)
+        self.chunks = processor._create_chunks(text, {'source': 'notes.txt', 'filename': 'notes.txt'})
+        self.packer = ContextPacker(token_budget=None, token_counter=CharCounter())
+
+    def test_adjacent_chunks_are_stitched_without_repeating_overlap(self):
+        packed = self.packer.pack(retrieved(self.chunks[2:5], order=[1, 0, 2]))
+
+        self.assertEqual(len(packed.passages), 1)
+        passage = packed.passages[0]
+        self.assertEqual(passage['chunk_ids'], [c.chunk_id for c in self.chunks[2:5]])
+        self.assertIn(passage['content'], self.text)
+        self.assertGreater(packed.tokens_saved, 0)
+        self.assertEqual(packed.chunks_merged, 2)
+
+    def test_non_overlapping_chunks_stay_separate_in_rank_order(self):
+        packed = self.packer.pack(retrieved([self.chunks[6], self.chunks[1]]))
+        self.assertEqual([p['chunk_ids'] for p in packed.passages],
+                         [[self.chunks[6].chunk_id], [self.chunks[1].chunk_id]])
+        self.assertEqual(packed.tokens_saved, 0)
+
+    def test_near_duplicates_from_other_sources_are_dropped(self):
+        original = retrieved([self.chunks[3]])[0]
+        copy = dict(original, id="copy.txt_chunk_0",
+                    metadata=dict(original['metadata'], source='copy.txt', filename='copy.txt'))
+        packed = self.packer.pack([original, copy])
+        self.assertEqual(len(packed.passages), 1)
+        self.assertEqual(packed.dropped_ids, ["copy.txt_chunk_0"])
+
+    def test_token_budget(self):
+        budget = 170
+        packer = ContextPacker(token_budget=budget, token_counter=CharCounter())
+        docs = retrieved([self.chunks[0], self.chunks[4], self.chunks[8]])
+        packed = packer.pack(docs)
+        self.assertLessEqual(packed.tokens, budget)
+        # First chunk fits, the second is cut to the remaining budget, the third is dropped
+        self.assertTrue(packed.truncated)
+        self.assertEqual(len(packed.passages), 2)
+        self.assertEqual(packed.passages[0]['content'], self.chunks[0].content)
+        self.assertEqual(packed.dropped_ids, [self.chunks[8].chunk_id])
+
+    def test_budget_tokenizes_each_passage_once(self):
+        counter = MeteredCounter()
+        packer = ContextPacker(token_budget=10_000, token_counter=counter)
+        passages = [{'content': chunk.content, 'chunk_ids': [chunk.chunk_id]} for chunk in self.chunks]
+
+        packed, truncated, dropped = packer._fit_budget(passages)
+        self.assertEqual((len(packed), truncated, dropped), (len(passages), False, []))
+        context = "\n\n".join(packer.format_passage(i + 1, p['content']) for i, p in enumerate(packed))
+        self.assertEqual(counter.characters, len(context))
+        self.assertLessEqual(packer._context_tokens([p['content'] for p in packed]), 10_000)
+
+
+if __name__ == "__main__":
+    unittest.main()
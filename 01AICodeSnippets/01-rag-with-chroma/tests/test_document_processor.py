@@ -0,0 +1,113 @@
+"""
+Tests for the document processor's chunking
+"""
+
+import random
+import re
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from document_processor import DocumentProcessor
+
+
+def reference_chunks(text, chunk_size, chunk_overlap, min_chunk_size):
+    """The original whole-string chunker, or None where it would not make progress."""
+    text = re.sub(r'\s+', ' ', text).strip()
+    if len(text) < min_chunk_size:
+        return []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + chunk_size
+        if end >= len(text):
+            chunk_text = text[start:]
+        else:
+            chunk_text = text[start:end]
+            sentence_ends = [m.end() for m in re.finditer(r'[.!?]\s+', chunk_text)]
+            if sentence_ends:
+                chunk_text = text[start:start + sentence_ends[-1]]
+            else:
+                words = chunk_text.split()
+                if len(words) > 1:
+                    chunk_text = ' '.join(words[:-1])
+
+        if len(chunk_text.strip()) >= min_chunk_size:
+            chunks.append((chunk_text.strip(), start, start + len(chunk_text)))
+
+        if len(chunk_text) <= chunk_overlap:
+            return None
+        start = start + len(chunk_text) - chunk_overlap
+        if start + chunk_size >= len(text):
+            break
+    return chunks
+
+
+def random_text(rng):
+    words = ["alpha", "beta", "gamma", "delta", "x", "Dr.", "e.g.", "end!", "why?", "ok."]
+    spaces = [" ", " ", " ", "  ", "\n", "\n\n", "\t", " \n "]
+    parts = []
+    for _ in range(rng.randint(0, 600)):
+        parts.append(rng.choice(words))
+        parts.append(rng.choice(spaces))
+    return rng.choice(["", " ", "\n"]) + "".join(parts)
+
+
+def random_pieces(rng, text):
+    cuts = sorted(rng.sample(range(len(text) + 1), min(len(text) + 1, rng.randint(0, 40))))
+    bounds = [0] + cuts + [len(text)]
+    return [text[a:b] for a, b in zip(bounds, bounds[1:])]
+
+
+class TestChunking(unittest.TestCase):
+    """Streaming and whole-text chunking must match the original boundaries"""
+
+    META = {"filename": "doc.txt", "source": "doc.txt"}
+
+    def test_matches_reference_chunker(self):
+        rng = random.Random(0)
+        checked = 0
+        for _ in range(400):
+            chunk_size = rng.choice([60, 120, 300, 1000])
+            overlap = rng.choice([0, 10, 20, chunk_size // 5])
+            min_size = rng.choice([1, 10, 50])
+            text = random_text(rng)
+            expected = reference_chunks(text, chunk_size, overlap, min_size)
+            if expected is None:
+                continue
+            checked += 1
+            processor = DocumentProcessor(chunk_size, overlap, min_size)
+
+            batch = processor._create_chunks(text, self.META)
+            streamed = list(processor.iter_chunks(random_pieces(rng, text), self.META))
+
+            for chunks in (batch, streamed):
+                got = [(c.content, c.metadata["start_index"], c.metadata["end_index"]) for c in chunks]
+                self.assertEqual(got, expected)
+            self.assertEqual([c.chunk_id for c in batch], [c.chunk_id for c in streamed])
+        self.assertGreater(checked, 200)
+
+    def test_short_chunks_do_not_loop_forever(self):
+        processor = DocumentProcessor(chunk_size=100, chunk_overlap=50, min_chunk_size=1)
+        text = "Hi. " + "x" * 300
+        chunks = processor._create_chunks(text, self.META)
+        self.assertTrue(chunks)
+        self.assertEqual(chunks[0].content, "Hi.")
+
+    def test_stream_file_matches_process_file(self):
+        import tempfile
+        rng = random.Random(1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "doc.txt"
+            path.write_text(" ".join(random_text(rng) for _ in range(20)), encoding="utf-8")
+            processor = DocumentProcessor(chunk_size=200, chunk_overlap=40, min_chunk_size=20)
+            batch = processor.process_file(str(path))
+            streamed = list(processor.stream_file(str(path)))
+            self.assertEqual(batch, streamed)
+
+
+if __name__ == "__main__":
+    unittest.main()
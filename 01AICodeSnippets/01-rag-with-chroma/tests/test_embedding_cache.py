@@ -0,0 +1,109 @@
+"""
+Tests for the on-disk embedding cache
+"""
+
+import itertools
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import embedding_cache
+from embedding_cache import EmbeddingCache
+from embedding_models import register_embedding_model
+from vector_store import ChromaVectorStore
+
+MODEL = "test-cache-model"
+
+
+class CountingModel:
+    """Deterministic 8-dimensional embeddings; records every encoded text."""
+
+    is_loaded = True
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, show_progress_bar=False, **kwargs):
+        self.encoded.extend(texts)
+        return np.stack([np.full(8, sum(map(ord, text)) % 97, dtype=np.float32) for text in texts])
+
+    def get_sentence_embedding_dimension(self):
+        return 8
+
+
+def vectors(*values):
+    return np.array([[value] * 4 for value in values], dtype=np.float32)
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    """Test cases for hits, misses, LRU eviction and model keying"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.db_path = f"{self.tmp}/cache.sqlite"
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_hits_and_misses(self):
+        cache = EmbeddingCache(self.db_path)
+        cache.put_many("m", ["a", "b"], vectors(1, 2))
+        hits, missing = cache.get_many("m", ["b", "c", "a", "b"])
+
+        self.assertEqual(missing, [1])
+        self.assertEqual(sorted(hits), [0, 2, 3])
+        np.testing.assert_array_equal(hits[0], vectors(2)[0])
+        np.testing.assert_array_equal(hits[2], vectors(1)[0])
+        self.assertEqual((cache.hits, cache.misses), (3, 1))
+
+    def test_entries_are_keyed_by_model(self):
+        cache = EmbeddingCache(self.db_path)
+        cache.put_many("model-a", ["text"], vectors(1))
+        self.assertEqual(cache.get_many("model-b", ["text"])[1], [0])
+        self.assertEqual(cache.get_many("model-a", ["text"])[1], [])
+
+    def test_count_is_tracked_without_rescanning(self):
+        cache = EmbeddingCache(self.db_path)
+        cache.put_many("m", ["a", "b", "a"], vectors(1, 2, 3))
+        cache.put_many("m", ["b", "c"], vectors(4, 5))
+        self.assertEqual(cache.get_stats()["entries"], 3)
+        # The last vector written for a text wins
+        np.testing.assert_array_equal(cache.get_many("m", ["b"])[0][0], vectors(4)[0])
+        cache.close()
+        self.assertEqual(EmbeddingCache(self.db_path).get_stats()["entries"], 3)
+
+    def test_least_recently_used_are_evicted(self):
+        clock = itertools.count(1)
+        with patch.object(embedding_cache.time, "time", side_effect=lambda: float(next(clock))):
+            cache = EmbeddingCache(self.db_path, max_entries=10)
+            cache.put_many("m", [f"t{i}" for i in range(10)], vectors(*range(10)))
+            # Touch t0..t4 so t5..t9 are now the least recently used
+            cache.get_many("m", [f"t{i}" for i in range(5)])
+            cache.put_many("m", ["new"], vectors(99))
+
+        self.assertEqual(cache.get_stats()["entries"], 9)
+        _, missing = cache.get_many("m", [f"t{i}" for i in range(10)] + ["new"])
+        self.assertEqual(missing, [5, 6])
+
+    def test_duplicate_misses_are_encoded_once(self):
+        model = CountingModel()
+        register_embedding_model(MODEL, model)
+        store = ChromaVectorStore(persist_directory=f"{self.tmp}/store", embedding_model=MODEL)
+
+        embeddings = store.embed_documents(["alpha", "beta", "alpha"])
+        self.assertEqual(model.encoded, ["alpha", "beta"])
+        np.testing.assert_array_equal(embeddings[0], embeddings[2])
+
+        store.embed_documents(["beta", "alpha"])
+        self.assertEqual(model.encoded, ["alpha", "beta"])
+
+
+if __name__ == "__main__":
+    unittest.main()
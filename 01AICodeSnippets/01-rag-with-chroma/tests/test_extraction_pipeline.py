@@ -0,0 +1,98 @@
+"""
+Tests for the multi-process extraction pipeline
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from document_processor import DocumentProcessor
+from extraction_pipeline import ExtractionPipeline
+
+
+class ScriptedProcessor(DocumentProcessor):
+    """Hangs on files named hang*, kills its worker on files named crash*."""
+
+    def process_file(self, file_path):
+        name = Path(file_path).name
+        if name.startswith("hang"):
+            time.sleep(60)
+        if name.startswith("crash"):
+            os._exit(3)
+        return super().process_file(file_path)
+
+
+class TestExtractionPipeline(unittest.TestCase):
+    """Test cases for ordering, timeouts, worker death and retries"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.processor = ScriptedProcessor(chunk_size=200, chunk_overlap=40, min_chunk_size=20)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _files(self, *names):
+        paths = []
+        for name in names:
+            path = self.tmp / name
+            path.write_text(f"Notes from {name} about embeddings and retrieval. " * 10, encoding="utf-8")
+            paths.append(str(path))
+        return paths
+
+    @staticmethod
+    def _summary(results):
+        return [(Path(path).name, [c.chunk_id for c in chunks], error) for path, chunks, error in results]
+
+    def test_default_runs_one_worker_with_a_timeout(self):
+        pipeline = ExtractionPipeline(DocumentProcessor())
+        self.assertEqual(pipeline.num_workers, 1)
+        self.assertEqual(pipeline.file_timeout, 120.0)
+        self.assertEqual(pipeline.start_method, "spawn")
+
+    def test_results_in_input_order(self):
+        files = self._files(*[f"doc_{i:02d}.txt" for i in range(12)])
+        serial = list(ExtractionPipeline(self.processor, num_workers=1, file_timeout=None).iter_chunks(files))
+        parallel = list(ExtractionPipeline(self.processor, num_workers=3).iter_chunks(files))
+        self.assertEqual(self._summary(parallel), self._summary(serial))
+        self.assertEqual([path for path, _, _ in parallel], files)
+
+    def test_serial_errors_are_per_file(self):
+        files = self._files("a.txt") + [str(self.tmp / "missing.txt")] + self._files("b.txt")
+        results = list(ExtractionPipeline(self.processor, num_workers=1, file_timeout=None).iter_chunks(files))
+        self.assertEqual([error is None for _, _, error in results], [True, False, True])
+
+    def test_single_worker_enforces_the_timeout(self):
+        for files in [self._files("hang.txt", "a.txt"), self._files("hang_alone.txt")]:
+            with self.subTest(files=[Path(f).name for f in files]):
+                results = list(ExtractionPipeline(self.processor, file_timeout=2.0).iter_chunks(files))
+                self.assertIn("timed out", results[0][2])
+                self.assertEqual([error for _, _, error in results[1:]], [None] * (len(files) - 1))
+
+    def test_hung_file_times_out_and_queued_files_are_retried(self):
+        files = self._files("hang.txt", "a.txt", "b.txt", "c.txt")
+        start = time.monotonic()
+        results = list(ExtractionPipeline(self.processor, num_workers=2, file_timeout=2.0).iter_chunks(files))
+
+        self.assertLess(time.monotonic() - start, 30)
+        self.assertIn("timed out", results[0][2])
+        self.assertEqual([error for _, _, error in results[1:]], [None, None, None])
+        self.assertTrue(all(chunks for _, chunks, _ in results[1:]))
+
+    def test_worker_death_is_reported_and_replaced(self):
+        files = self._files("crash.txt", "a.txt", "b.txt", "c.txt", "d.txt")
+        results = list(ExtractionPipeline(self.processor, num_workers=2).iter_chunks(files))
+
+        self.assertEqual([Path(path).name for path, _, _ in results], [Path(f).name for f in files])
+        self.assertEqual(results[0][2], "worker process exited unexpectedly")
+        self.assertEqual([error for _, _, error in results[1:]], [None] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
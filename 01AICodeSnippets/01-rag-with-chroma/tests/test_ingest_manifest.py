@@ -0,0 +1,95 @@
+"""
+Tests for the incremental ingestion manifest
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from document_processor import DocumentProcessor
+from ingest_manifest import IngestManifest, hash_file, hash_text
+
+TEXT = "The quick brown fox jumps over the lazy dog. " * 20
+
+
+class TestIngestManifest(unittest.TestCase):
+    """Test cases for recording, diffing and persisting ingested files"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.processor = DocumentProcessor(chunk_size=200, chunk_overlap=40, min_chunk_size=20)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _write(self, relative: str, text: str = TEXT) -> str:
+        path = self.root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        return str(path)
+
+    def _record(self, manifest: IngestManifest, source: str):
+        chunks = self.processor.process_file(source)
+        manifest.record_file(source, hash_file(Path(source)), {c.chunk_id: hash_text(c.content) for c in chunks})
+
+    def test_same_filename_in_different_directories(self):
+        manifest = IngestManifest(str(self.root / "manifest.json"))
+        first, second = self._write("a/x.txt"), self._write("b/x.txt")
+        self._record(manifest, first)
+        self._record(manifest, second)
+
+        first_ids = set(manifest.chunk_hashes(first))
+        second_ids = set(manifest.chunk_hashes(second))
+        self.assertTrue(first_ids)
+        self.assertFalse(first_ids & second_ids)
+
+        self.assertEqual(set(manifest.remove_file(first)), first_ids)
+        self.assertEqual(set(manifest.chunk_hashes(second)), second_ids)
+
+    def test_chunk_ids_are_stable_across_runs(self):
+        source = self._write("a/x.txt")
+        ids = [c.chunk_id for c in self.processor.process_file(source)]
+        self.assertEqual(ids, [c.chunk_id for c in self.processor.process_file(source)])
+        self.assertTrue(all(chunk_id.startswith("x.txt_") for chunk_id in ids))
+
+    def test_diff_chunks(self):
+        old = {"c0": "h0", "c1": "h1", "c2": "h2"}
+        new = {"c0": "h0", "c1": "changed", "c3": "h3"}
+        diff = IngestManifest.diff_chunks(old, new)
+        self.assertEqual(diff, {"changed": ["c1", "c3"], "unchanged": ["c0"], "removed": ["c2"]})
+
+    def test_save_and_reload(self):
+        path = self.root / "store" / "manifest.json"
+        manifest = IngestManifest(str(path))
+        source = self._write("docs/x.txt")
+        self._record(manifest, source)
+        manifest.save()
+
+        reloaded = IngestManifest(str(path))
+        self.assertTrue(reloaded.is_unchanged(source, hash_file(Path(source))))
+        self.assertEqual(reloaded.chunk_hashes(source), manifest.chunk_hashes(source))
+        self.assertEqual(reloaded.sources_under(str(self.root / "docs")), [source])
+        self.assertEqual(reloaded.sources_under(str(self.root / "other")), [])
+
+    def test_version_one_manifest_is_upgraded(self):
+        path = self.root / "manifest.json"
+        path.write_text(json.dumps({
+            "version": 1,
+            "files": {"a/x.txt": {"file_hash": "f", "chunks": {"x.txt_chunk_0": "h", "x.txt_chunk_1": "h"}}}
+        }))
+        manifest = IngestManifest(str(path))
+        self.assertEqual(manifest.files, {})
+        self.assertEqual(manifest.legacy_chunk_ids, ["x.txt_chunk_0", "x.txt_chunk_1"])
+
+        manifest.save()
+        self.assertEqual(manifest.legacy_chunk_ids, [])
+        self.assertEqual(json.loads(path.read_text())["version"], IngestManifest.VERSION)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""
+Tests for PDF backends and page-parallel extraction
+"""
+
+import shutil
+import sys
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from document_processor import DocumentProcessor
+from extraction_pipeline import ExtractionPipeline
+from pdf_extraction import PDF_BACKENDS, PDFBackend, get_pdf_backend, iter_pdf_pages
+
+
+def write_pdf(path: Path, pages):
+    """Minimal PDF with one Helvetica text line per entry of each page."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        ("<< /Type /Pages /Kids [%s] /Count %d >>"
+         % (" ".join(f"{4 + 2 * i} 0 R" for i in range(len(pages))), len(pages))).encode(),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, lines in enumerate(pages):
+        objects.append((f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                        f"/Resources << /Font << /F1 3 0 R >> >> /Contents {5 + 2 * i} 0 R >>").encode())
+        content = ("BT /F1 11 Tf 14 TL 72 740 Td "
+                   + " ".join(f"({line}) Tj T*" for line in lines) + " ET").encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(content) + content + b"\nendstream")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+def page_lines(page: int):
+    return [f"Page {page} line {line} talks about retrieval and chunking." for line in range(6)]
+
+
+INSTALLED = [name for name, backend in PDF_BACKENDS.items() if backend.available()]
+
+
+class TestPDFBackendInterface(unittest.TestCase):
+
+    def test_backends_must_implement_every_method(self):
+        class PageCountOnly(PDFBackend):
+            def page_count(self, file_path):
+                return 0
+
+        for backend in (PDFBackend, PageCountOnly):
+            with self.subTest(backend=backend.__name__), self.assertRaises(TypeError):
+                backend()
+        for backend in PDF_BACKENDS.values():
+            backend()
+
+
+@unittest.skipIf(not INSTALLED, "no PDF backend is installed")
+class TestPDFExtraction(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.pdf = self.tmp / "manual.pdf"
+        write_pdf(self.pdf, [page_lines(page) for page in range(20)])
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_backends_extract_every_page(self):
+        for name in INSTALLED:
+            with self.subTest(backend=name):
+                backend = get_pdf_backend(name)
+                self.assertEqual(backend.page_count(self.pdf), 20)
+                pages = backend.extract_pages(self.pdf, 5, 7)
+                self.assertEqual(len(pages), 2)
+                self.assertEqual(pages[0].split(), " ".join(page_lines(5)).split())
+                self.assertTrue(pages[1].endswith("\n"))
+
+    def test_auto_selects_first_installed_backend(self):
+        self.assertEqual(get_pdf_backend().name, INSTALLED[0])
+
+    def test_sharded_pages_match_serial(self):
+        backend = get_pdf_backend()
+        serial = list(iter_pdf_pages(self.pdf, backend, workers=1, shard_pages=4))
+        sharded = list(iter_pdf_pages(self.pdf, backend, workers=3, shard_pages=4))
+        self.assertEqual(len(serial), 20)
+        self.assertEqual(sharded, serial)
+
+    def test_pipeline_shards_large_pdf(self):
+        write_pdf(self.tmp / "small.pdf", [page_lines(100)])
+        (self.tmp / "notes.txt").write_text("Plain notes about embeddings. " * 20, encoding="utf-8")
+        files = [self.pdf, self.tmp / "notes.txt", self.tmp / "small.pdf"]
+        processor = DocumentProcessor(chunk_size=300, chunk_overlap=50)
+
+        serial = list(ExtractionPipeline(processor, num_workers=1).iter_chunks(files))
+        sharded = list(ExtractionPipeline(processor, num_workers=3, pdf_shard_pages=3).iter_chunks(files))
+
+        self.assertEqual([error for _, _, error in sharded], [None, None, None])
+        self.assertEqual(
+            [[(c.chunk_id, c.content, c.metadata) for c in chunks] for _, chunks, _ in sharded],
+            [[(c.chunk_id, c.content, c.metadata) for c in chunks] for _, chunks, _ in serial]
+        )
+
+    def test_warning_filters_are_left_alone(self):
+        before = list(warnings.filters)
+        DocumentProcessor(pdf_backend=INSTALLED[-1]).process_file(str(self.pdf))
+        self.assertEqual(warnings.filters, before)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,219 @@
+"""
+Tests for the compact (int8 / float16) vector index
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from embedding_models import register_embedding_model
+from quantized_index import QuantizedVectorIndex
+from vector_store import ChromaVectorStore
+
+MODEL = "test-compact-model"
+DIM = 16
+
+
+def normalized(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+class HashModel:
+    """Deterministic DIM-dimensional embeddings."""
+
+    is_loaded = True
+
+    def encode(self, texts, show_progress_bar=False, **kwargs):
+        return np.stack([
+            np.random.default_rng(sum(map(ord, text))).normal(size=DIM).astype(np.float32) for text in texts
+        ])
+
+    def get_sentence_embedding_dimension(self):
+        return DIM
+
+
+class TestQuantizedVectorIndex(unittest.TestCase):
+    """Test cases for writes, tombstones, reloads and exact re-ranking"""
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        rng = np.random.default_rng(0)
+        self.vectors = rng.normal(size=(200, DIM)).astype(np.float32)
+        self.ids = [f"chunk_{i}" for i in range(200)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def index(self, dtype):
+        return QuantizedVectorIndex(f"{self.tmp}/{dtype}", dtype=dtype, rerank_factor=4)
+
+    def exact_top(self, query, k, vectors=None, ids=None):
+        vectors = self.vectors if vectors is None else vectors
+        ids = self.ids if ids is None else ids
+        scores = normalized(vectors) @ (query / np.linalg.norm(query))
+        return [(ids[i], float(scores[i])) for i in np.argsort(-scores)[:k]]
+
+    def assertHitsClose(self, hits, expected):
+        # Same ranking as float32; scores carry float16 error only (int8 candidates are re-scored)
+        self.assertEqual([i for i, _ in hits], [i for i, _ in expected])
+        np.testing.assert_allclose([s for _, s in hits], [s for _, s in expected], atol=2e-3)
+
+    def test_search_matches_float32_ranking(self):
+        for dtype in QuantizedVectorIndex.DTYPES:
+            with self.subTest(dtype=dtype):
+                index = self.index(dtype)
+                index.add(self.ids, self.vectors)
+                for query in self.vectors[:20]:
+                    self.assertHitsClose(index.search(query, 5), self.exact_top(query, 5))
+
+    def test_no_float32_copy_on_disk(self):
+        for dtype, files, row_bytes in [("int8", {"vectors.int8", "scales.float32", "vectors.float16"}, 3 * DIM + 4),
+                                        ("float16", {"vectors.float16"}, 2 * DIM)]:
+            with self.subTest(dtype=dtype):
+                index = self.index(dtype)
+                index.add(self.ids, self.vectors)
+                directory = Path(self.tmp) / dtype
+                self.assertEqual({p.name for p in directory.iterdir()} - {"meta.json", "ids.txt"}, files)
+                # 3/4 (int8, at 384 dimensions) or 1/2 (float16) of 4 * DIM float32 bytes per row
+                self.assertEqual(sum((directory / name).stat().st_size for name in files), row_bytes * index.capacity)
+
+    def test_overwrite_and_delete_tombstone_rows(self):
+        index = self.index("int8")
+        index.add(self.ids[:10], self.vectors[:10])
+        index.add(["chunk_3"], -self.vectors[3:4])
+        index.delete(["chunk_5", "missing"])
+
+        self.assertEqual(len(index), 9)
+        self.assertEqual(index.size, 11)
+        self.assertEqual(index.deleted, {3, 5})
+        hits = dict(index.search(self.vectors[3], 10))
+        self.assertNotIn("chunk_5", hits)
+        self.assertAlmostEqual(hits["chunk_3"], -1.0, places=3)
+        np.testing.assert_allclose(index.get_vectors(["chunk_3"])[0], -normalized(self.vectors[3:4])[0], atol=1e-3)
+
+    def test_duplicate_ids_in_one_batch_keep_the_last(self):
+        index = self.index("float16")
+        index.add(["a", "b", "a"], self.vectors[:3])
+        self.assertEqual(index.size, 2)
+        self.assertEqual(index.row_ids, ["b", "a"])
+        np.testing.assert_allclose(index.get_vectors(["a"])[0], normalized(self.vectors[2:3])[0], atol=1e-3)
+        self.assertEqual(len(index.search(self.vectors[0], 10)), 2)
+
+    def test_reload_keeps_vectors_and_tombstones(self):
+        index = self.index("int8")
+        index.add(self.ids, self.vectors)
+        index.delete(self.ids[:50])
+        query = self.vectors[60]
+        before = index.search(query, 8)
+
+        reloaded = self.index("int8")
+        self.assertEqual(len(reloaded), 150)
+        self.assertEqual(reloaded.search(query, 8), before)
+        self.assertHitsClose(before, self.exact_top(query, 8, self.vectors[50:], self.ids[50:]))
+        with self.assertRaises(ValueError):
+            QuantizedVectorIndex(f"{self.tmp}/int8", dtype="float16")
+
+    def test_allowed_ids_filter(self):
+        index = self.index("int8")
+        index.add(self.ids, self.vectors)
+        allowed = set(self.ids[100:110])
+        hits = index.search(self.vectors[0], 3, allowed_ids=allowed)
+        self.assertHitsClose(hits, self.exact_top(self.vectors[0], 3, self.vectors[100:110], self.ids[100:110]))
+        self.assertEqual(index.search(self.vectors[0], 3, allowed_ids={"missing"}), [])
+
+    def test_version_two_index_is_upgraded(self):
+        for dtype in QuantizedVectorIndex.DTYPES:
+            with self.subTest(dtype=dtype):
+                index = self.index(dtype)
+                index.add(self.ids, self.vectors)
+                # Rewrite it in the version 2 layout: a float32 copy instead of the float16 one
+                directory = Path(self.tmp) / dtype
+                exact = np.zeros((index.capacity, DIM), dtype=np.float32)
+                exact[:index.size] = normalized(self.vectors)
+                exact.tofile(directory / "vectors.float32")
+                if dtype == "int8":
+                    (directory / "vectors.float16").unlink()
+                meta = json.loads((directory / "meta.json").read_text())
+                meta["version"] = 2
+                (directory / "meta.json").write_text(json.dumps(meta))
+
+                upgraded = self.index(dtype)
+                self.assertFalse((directory / "vectors.float32").exists())
+                self.assertEqual(json.loads((directory / "meta.json").read_text())["version"],
+                                 QuantizedVectorIndex.VERSION)
+                self.assertEqual([i for i, _ in upgraded.search(self.vectors[7], 1)], ["chunk_7"])
+
+    def test_tombstoned_rows_are_compacted(self):
+        index = self.index("int8")
+        index.COMPACT_MIN_ROWS = 10
+        index.add(self.ids, self.vectors)
+        for _ in range(3):
+            index.add(self.ids[:40], self.vectors[:40])  # Overwrites
+        index.delete(self.ids[40:50])
+
+        # The second overwrite pass crossed 25% dead rows and compacted; 50 have died since
+        self.assertEqual(len(index), 190)
+        self.assertLessEqual(index.get_stats()["tombstoned_rows"], 0.25 * index.size)
+        self.assertEqual(index.size, 240)
+        self.assertEqual(sorted(index.id_to_row), sorted(self.ids[:40] + self.ids[50:]))
+        self.assertEqual(index.search(self.vectors[60], 5), self.index("int8").search(self.vectors[60], 5))
+        self.assertEqual([i for i, _ in index.search(self.vectors[3], 1)], ["chunk_3"])
+        self.assertFalse(list(Path(self.tmp, "int8").glob("*.compact")))
+
+    def test_interrupted_compaction_is_finished_on_open(self):
+        index = self.index("float16")
+        index.add(self.ids, self.vectors)
+        index.delete(self.ids[:100])
+        # Crash right after the commit point, before the files are swapped
+        with patch("quantized_index.QuantizedVectorIndex._replace_with_compacted", side_effect=OSError):
+            with self.assertRaises(OSError):
+                index.compact()
+
+        reopened = self.index("float16")
+        self.assertEqual(reopened.size, 100)
+        self.assertEqual(reopened.deleted, set())
+        self.assertFalse(json.loads(Path(self.tmp, "float16", "meta.json").read_text()).get("compacting"))
+        expected = self.exact_top(self.vectors[150], 3, self.vectors[100:], self.ids[100:])
+        self.assertEqual([i for i, _ in reopened.search(self.vectors[150], 3)], [i for i, _ in expected])
+
+
+class TestCompactStorageMode(unittest.TestCase):
+    """Test cases for reopening a store in a different storage mode"""
+
+    def setUp(self):
+        register_embedding_model(MODEL, HashModel())
+        self.tmp = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def store(self, storage_mode, name="store"):
+        return ChromaVectorStore(persist_directory=f"{self.tmp}/{name}", embedding_model=MODEL,
+                                 embedding_cache_size=0, storage_mode=storage_mode)
+
+    def test_mode_switch_is_rejected(self):
+        for built, reopened in [("float32", "int8"), ("int8", "float32"), ("int8", "float16")]:
+            with self.subTest(built=built, reopened=reopened):
+                name = f"{built}_{reopened}"
+                self.store(built, name).add_documents(["alpha", "beta"], [{"n": 1}, {"n": 2}], ["a", "b"])
+                with self.assertRaises(ValueError):
+                    self.store(reopened, name)
+                self.assertEqual(len(self.store(built, name).similarity_search("alpha", k=2)), 2)
+
+    def test_empty_store_can_pick_any_mode(self):
+        self.store("float32")
+        self.store("int8").add_documents(["alpha"], [{"n": 1}], ["a"])
+        self.assertEqual(self.store("int8").similarity_search("alpha", k=1)[0]["id"], "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,139 @@
+"""
+Tests for the asyncio RAG service layer
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from rag_service import RAGService
+from rag_system import RAGResponse
+
+
+class FakeVectorStore:
+    def __init__(self):
+        self.batch_sizes = []
+
+    def embed_queries(self, queries):
+        self.batch_sizes.append(len(queries))
+        time.sleep(0.02)  # Model forward pass
+        return np.array([[float(len(q)), 1.0] for q in queries], dtype=np.float32)
+
+
+class FakeRAGSystem:
+    """Ingestion blocks until released so queries can run during it."""
+
+    def __init__(self):
+        self.vector_store = FakeVectorStore()
+        self.release_ingest = threading.Event()
+        self.ingest_started = threading.Event()
+
+    def ingest_documents(self, documents_path, remove_missing=True, progress_callback=None):
+        self.ingest_started.set()
+        progress_callback(1, 4)
+        if not self.release_ingest.wait(5):
+            raise TimeoutError("ingest was never released")
+        if documents_path == "broken":
+            raise RuntimeError("disk on fire")
+        progress_callback(4, 4)
+        return {"status": "success", "chunks_created": 8}
+
+    def query(self, question, k=4, include_sources=True, query_embedding=None):
+        return RAGResponse(f"answer to {question}", [], question, "fake", 0.0, 0.0)
+
+    def query_stream(self, question, k=4, include_sources=True, query_embedding=None):
+        yield "streamed"
+        yield self.query(question, k, include_sources, query_embedding)
+
+
+class TestRAGService(unittest.TestCase):
+
+    def setUp(self):
+        self.rag = FakeRAGSystem()
+        self.service = RAGService(self.rag, max_batch_size=16, batch_wait=0.05)
+
+    def tearDown(self):
+        self.rag.release_ingest.set()
+        self.service.close()
+
+    def test_ingest_job_reports_progress(self):
+        job = self.service.submit_ingest("docs")
+        self.assertTrue(self.rag.ingest_started.wait(2))
+        time.sleep(0.05)
+        self.assertEqual(job.status, "running")
+        self.assertEqual(job.progress, 0.25)
+
+        self.rag.release_ingest.set()
+        self.service.wait_for_job(job.job_id, timeout=2)
+        self.assertEqual(job.status, "done")
+        self.assertEqual(job.stats["chunks_created"], 8)
+        self.assertEqual(job.progress, 1.0)
+
+    def test_failed_job_records_error(self):
+        self.rag.release_ingest.set()
+        job = self.service.submit_ingest("broken")
+        self.service.wait_for_job(job.job_id, timeout=2)
+        self.assertEqual(job.status, "failed")
+        self.assertIn("disk on fire", job.error)
+
+    def test_finished_jobs_are_evicted(self):
+        self.rag.release_ingest.set()
+        self.service.max_finished_jobs = 2
+        jobs = [self.service.submit_ingest("docs") for _ in range(4)]
+        for job in jobs:
+            self.service.wait_for_job(job.job_id, timeout=2)
+        self.assertEqual(sorted(self.service.jobs), ["job-3", "job-4"])
+        self.assertIsNone(self.service.get_job("job-1"))
+
+        # Past the TTL even the newest finished job goes, but a running one stays
+        self.rag.release_ingest.clear()
+        running = self.service.submit_ingest("docs")
+        self.assertTrue(self.rag.ingest_started.wait(2))
+        self.service.finished_job_ttl = 0.0
+        time.sleep(0.01)
+        self.assertIsNone(self.service.get_job("job-4"))
+        self.assertIs(self.service.get_job(running.job_id), running)
+        self.assertEqual(self.service.get_stats()["jobs"]["running"], 1)
+        self.rag.release_ingest.set()
+        self.service.wait_for_job(running.job_id, timeout=2)
+        self.assertEqual(self.service.jobs, {})
+
+    def test_queries_served_while_ingesting(self):
+        job = self.service.submit_ingest("docs")
+        self.assertTrue(self.rag.ingest_started.wait(2))
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(self.service.query, [f"question {i}" for i in range(8)]))
+
+        self.assertEqual(job.status, "running")
+        self.assertEqual([r.answer for r in responses], [f"answer to question {i}" for i in range(8)])
+
+    def test_concurrent_queries_share_embedding_batches(self):
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            list(pool.map(self.service.embed_query, [f"q{i}" for i in range(16)]))
+        self.assertEqual(sum(self.rag.vector_store.batch_sizes), 16)
+        self.assertLess(len(self.rag.vector_store.batch_sizes), 16)
+
+    def test_async_api_from_another_loop(self):
+        async def ask():
+            return await asyncio.gather(*(self.service.aquery(f"q{i}") for i in range(4)))
+
+        responses = asyncio.run(ask())
+        self.assertEqual(len(responses), 4)
+
+    def test_query_stream(self):
+        items = list(self.service.query_stream("hello"))
+        self.assertEqual(items[0], "streamed")
+        self.assertIsInstance(items[-1], RAGResponse)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+"""
+Tests for the cross-encoder re-ranking stage
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from reranker import CrossEncoderReranker
+
+
+class OverlapModel:
+    """Scores a pair by the number of question words in the passage."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.calls = []
+
+    def predict(self, pairs, batch_size=32):
+        self.calls.append(len(pairs))
+        time.sleep(self.delay)
+        return [len(set(q.lower().split()) & set(p.lower().split())) for q, p in pairs]
+
+
+def docs(*contents):
+    return [{'id': f"chunk_{i}", 'content': text, 'metadata': {}, 'similarity': 0.5}
+            for i, text in enumerate(contents)]
+
+
+class TestCrossEncoderReranker(unittest.TestCase):
+
+    def setUp(self):
+        self.model = OverlapModel()
+        self.reranker = CrossEncoderReranker(model=self.model, batch_size=2, latency_budget=None)
+        self.candidates = docs(
+            "cats sleep a lot",
+            "the capital of france is paris",
+            "paris is in france",
+            "bread recipes"
+        )
+
+    def test_keeps_best_k_by_score(self):
+        result = self.reranker.rerank("capital of france", self.candidates, k=2)
+        self.assertEqual([d['id'] for d in result.docs], ["chunk_1", "chunk_2"])
+        self.assertEqual(result.docs[0]['rerank_score'], 3.0)
+        self.assertEqual(result.scored, 4)
+        self.assertEqual(self.model.calls, [2, 2])
+
+    def test_scores_are_cached_per_question_and_chunk(self):
+        self.reranker.rerank("capital of france", self.candidates, k=2)
+        result = self.reranker.rerank("capital of france", self.candidates, k=2)
+        self.assertEqual(result.scored, 0)
+        self.assertEqual(result.cached, 4)
+        self.assertEqual(self.reranker.get_stats()['hits'], 4)
+
+        # A different question is scored afresh
+        result = self.reranker.rerank("bread", self.candidates, k=1)
+        self.assertEqual(result.scored, 4)
+        self.assertEqual(result.docs[0]['id'], "chunk_3")
+
+    def test_changed_chunk_is_rescored(self):
+        self.reranker.rerank("capital of france", self.candidates, k=2)
+        changed = docs("the capital of france and its capital city", *[d['content'] for d in self.candidates[1:]])
+        result = self.reranker.rerank("capital of france", changed, k=1)
+        self.assertEqual(result.scored, 1)
+        self.assertEqual(result.docs[0]['id'], "chunk_0")
+
+    def test_latency_budget_stops_new_batches(self):
+        reranker = CrossEncoderReranker(model=OverlapModel(delay=0.05), batch_size=2, latency_budget=0.01)
+        result = reranker.rerank("capital of france", self.candidates, k=4)
+        self.assertTrue(result.budget_exceeded)
+        self.assertEqual(result.scored, 2)
+        # Unscored candidates follow the scored ones in retrieval order
+        self.assertEqual([d['id'] for d in result.docs], ["chunk_1", "chunk_0", "chunk_2", "chunk_3"])
+        self.assertIsNone(result.docs[2]['rerank_score'])
+
+    def test_cache_is_bounded(self):
+        reranker = CrossEncoderReranker(model=self.model, cache_size=3, latency_budget=None)
+        reranker.rerank("capital of france", self.candidates, k=2)
+        self.assertEqual(reranker.get_stats()['entries'], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
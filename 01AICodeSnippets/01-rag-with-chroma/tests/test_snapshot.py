@@ -0,0 +1,148 @@
+"""
+Tests for vector store snapshot export and import
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from embedding_models import register_embedding_model
+from rag_system import RAGSystem
+from vector_store import ChromaVectorStore, pa
+
+MODEL = "test-snapshot-model"
+
+
+class CountingModel:
+    """Deterministic 8-dimensional embeddings; counts encoded texts."""
+
+    is_loaded = True
+
+    def __init__(self):
+        self.encoded = 0
+
+    def encode(self, texts, show_progress_bar=False, **kwargs):
+        self.encoded += len(texts)
+        rng = np.random.default_rng([sum(map(ord, text)) for text in texts])
+        return rng.normal(size=(len(texts), 8)).astype(np.float32)
+
+    def get_sentence_embedding_dimension(self):
+        return 8
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.model = CountingModel()
+        register_embedding_model(MODEL, self.model)
+        self.tmp = tempfile.mkdtemp()
+        self.texts = [f"document number {i}" for i in range(23)]
+        self.metadatas = [{'filename': f"f{i % 3}.txt", 'chunk_id': i, 'score': i / 2} for i in range(23)]
+        self.ids = [f"chunk_{i}" for i in range(23)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def store(self, name, storage_mode="float32"):
+        return ChromaVectorStore(persist_directory=f"{self.tmp}/{name}", embedding_model=MODEL,
+                                 embedding_cache_size=0, storage_mode=storage_mode)
+
+    def roundtrip(self, storage_mode):
+        source = self.store("source", storage_mode)
+        source.add_documents(self.texts, self.metadatas, self.ids)
+        manifest = source.export_snapshot(f"{self.tmp}/snap", batch_size=10)
+        self.assertEqual(manifest['count'], 23)
+        self.assertEqual(manifest['dim'], 8)
+
+        encoded = self.model.encoded
+        target = self.store("target", storage_mode)
+        target.load_snapshot(f"{self.tmp}/snap", batch_size=7)
+        self.assertEqual(self.model.encoded, encoded, "loading must not re-embed")
+        self.assertEqual(target.collection.count(), 23)
+
+        loaded = target.get_documents(self.ids)
+        self.assertEqual([d['content'] for d in loaded], self.texts)
+        self.assertEqual([d['metadata'] for d in loaded], self.metadatas)
+
+        query = source.embed_query("document number 5")
+        expected = [d['id'] for d in source.similarity_search("", k=5, query_embedding=query)]
+        actual = [d['id'] for d in target.similarity_search("", k=5, query_embedding=query)]
+        self.assertEqual(actual, expected)
+
+    def test_roundtrip_float32(self):
+        self.roundtrip("float32")
+
+    def test_roundtrip_compact(self):
+        self.roundtrip("int8")
+
+    def test_embeddings_file_is_raw_float32(self):
+        source = self.store("source")
+        source.add_documents(self.texts, self.metadatas, self.ids)
+        source.export_snapshot(f"{self.tmp}/snap")
+        vectors = np.fromfile(f"{self.tmp}/snap/embeddings.f32", dtype=np.float32).reshape(23, 8)
+        np.testing.assert_allclose(vectors, self.model.encode(self.texts), rtol=1e-6)
+
+    def test_rejects_other_model(self):
+        source = self.store("source")
+        source.add_documents(self.texts, self.metadatas, self.ids)
+        source.export_snapshot(f"{self.tmp}/snap")
+        manifest_path = Path(self.tmp) / "snap" / "snapshot.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest['embedding_model'] = "some-other-model"
+        manifest_path.write_text(json.dumps(manifest))
+        with self.assertRaises(ValueError):
+            self.store("target").load_snapshot(f"{self.tmp}/snap")
+
+    def test_rejects_non_empty_collection(self):
+        source = self.store("source")
+        source.add_documents(self.texts, self.metadatas, self.ids)
+        source.export_snapshot(f"{self.tmp}/snap")
+        with self.assertRaises(ValueError):
+            source.load_snapshot(f"{self.tmp}/snap")
+
+    def test_rag_system_rebuilds_keyword_index_and_manifest(self):
+        docs = Path(self.tmp) / "docs"
+        for name, topic in [("a/notes.txt", "zeppelins"), ("b/notes.txt", "hovercraft")]:
+            (docs / name).parent.mkdir(parents=True, exist_ok=True)
+            (docs / name).write_text(f"A long note about {topic} and how they travel. " * 8, encoding="utf-8")
+
+        def rag(name):
+            # The LLM is never called; a key is only needed to construct the system
+            with patch.dict(os.environ, {"GROQ_API_KEY": "test-key"}):
+                return RAGSystem(vector_store_path=f"{self.tmp}/{name}", embedding_model=MODEL,
+                                 chunk_size=200, chunk_overlap=40)
+
+        source = rag("source")
+        source.ingest_documents(str(docs))
+        source.vector_store.export_snapshot(f"{self.tmp}/snap")
+
+        target = rag("target")
+        target.load_snapshot(f"{self.tmp}/snap")
+        self.assertEqual(len(target.keyword_index), len(source.keyword_index))
+        self.assertEqual([i for i, _ in target.keyword_index.search("zeppelins", k=3)],
+                         [i for i, _ in source.keyword_index.search("zeppelins", k=3)])
+        self.assertEqual({s: target.manifest.chunk_hashes(s) for s in target.manifest.files},
+                         {s: source.manifest.chunk_hashes(s) for s in source.manifest.files})
+        texts = [text for _, batch in target.vector_store.iter_documents() for text in batch]
+        self.assertEqual(target.vector_store.embedding_cache.get_many(MODEL, texts)[1], [])
+
+        # Files are re-extracted once, but nothing is re-embedded or duplicated
+        encoded = self.model.encoded
+        stats = target.ingest_documents(str(docs))
+        self.assertEqual(stats['chunks_embedded'], 0)
+        self.assertEqual(self.model.encoded, encoded)
+        self.assertEqual(target.vector_store.collection.count(), source.vector_store.collection.count())
+
+
+if __name__ == "__main__":
+    unittest.main()
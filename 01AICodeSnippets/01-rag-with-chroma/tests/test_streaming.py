@@ -0,0 +1,177 @@
+"""
+Tests for streaming answers against a local fake OpenAI-compatible server
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+try:
+    from groq import Groq
+except ImportError:
+    Groq = None
+
+from document_processor import DocumentProcessor
+from embedding_models import register_embedding_model
+from rag_system import RAGSystem, RAGResponse
+
+TOKENS = ["Paris", " is", " the", " capital", "."]
+TOKEN_DELAY = 0.05
+MODEL = "test-streaming-model"
+
+
+class FakeStreamingHandler(BaseHTTPRequestHandler):
+    """Serves chat completions as server-sent events, one token at a time."""
+
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.requests.append((self.path, body))
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for token in TOKENS:
+            chunk = {
+                "id": "chatcmpl-test",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{"index": 0, "delta": {"content": token}, "finish_reason": None}]
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(TOKEN_DELAY)
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class HashModel:
+    """Deterministic 8-dimensional bag-of-words embeddings."""
+
+    is_loaded = True
+
+    def encode(self, texts, show_progress_bar=False, **kwargs):
+        vectors = np.zeros((len(texts), 8), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, sum(map(ord, word)) % 8] += 1.0
+        return vectors
+
+    def get_sentence_embedding_dimension(self):
+        return 8
+
+
+@unittest.skipIf(Groq is None, "groq is not installed")
+class TestStreamingAnswers(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeStreamingHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakeStreamingHandler.requests.clear()
+        self.tmp = Path(tempfile.mkdtemp())
+        docs = self.tmp / "docs"
+        docs.mkdir()
+        self.document = docs / "geography.txt"
+        self.document.write_text(
+            "Paris is the capital of France. It sits on the Seine, is the country's largest city "
+            "and has been its seat of government for most of the last thousand years.",
+            encoding="utf-8"
+        )
+
+        # Offline embedding model, and a Groq client pointed at the fake server
+        register_embedding_model(MODEL, HashModel())
+        env = {"GROQ_API_KEY": "test-key", "GROQ_BASE_URL": f"http://127.0.0.1:{self.server.server_port}"}
+        with patch.dict(os.environ, env):
+            self.rag = RAGSystem(vector_store_path=str(self.tmp / "db"), embedding_model=MODEL,
+                                 chunk_size=500, chunk_overlap=50)
+        self.rag.ingest_documents(str(docs))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_query_stream_yields_tokens_then_response(self):
+        items = list(self.rag.query_stream("What is the capital of France?"))
+
+        self.assertEqual(items[:-1], TOKENS)
+        response = items[-1]
+        self.assertIsInstance(response, RAGResponse)
+        self.assertEqual(response.answer, "".join(TOKENS))
+        prefix = DocumentProcessor.chunk_id_prefix(str(self.document), "geography.txt")
+        self.assertEqual(response.sources[0]['chunk_id'], f"{prefix}_chunk_0")
+
+        # First token arrives well before the stream finishes
+        self.assertLess(response.time_to_first_token, response.generation_time)
+        self.assertGreaterEqual(response.generation_time, TOKEN_DELAY * (len(TOKENS) - 1))
+
+        path, body = FakeStreamingHandler.requests[0]
+        self.assertEqual(path, "/openai/v1/chat/completions")
+        self.assertTrue(body["stream"])
+        self.assertEqual(body["model"], self.rag.llm_model)
+
+    def test_query_collects_stream(self):
+        response = self.rag.query("What is the capital of France?")
+        self.assertEqual(response.answer, "".join(TOKENS))
+        self.assertIsNotNone(response.time_to_first_token)
+        self.assertFalse(response.cache_hit)
+        self.assertTrue(self.rag.query("What is the capital of France?").cache_hit)
+        self.assertEqual(len(FakeStreamingHandler.requests), 1)
+
+    def test_answer_is_not_cached_when_an_ingest_lands_mid_stream(self):
+        question = "What is the capital of France?"
+        stream = self.rag.query_stream(question)
+        self.assertEqual(next(stream), TOKENS[0])
+
+        # Re-ingest the chunk while the answer is still streaming
+        self.document.write_text(self.document.read_text(encoding="utf-8").replace("thousand", "hundred"),
+                                 encoding="utf-8")
+        self.assertEqual(self.rag.ingest_documents(str(self.document.parent))["chunks_embedded"], 1)
+        self.assertEqual(list(stream)[-1].answer, "".join(TOKENS))
+
+        self.assertFalse(self.rag.query(question).cache_hit)
+        self.assertEqual(len(FakeStreamingHandler.requests), 2)
+        self.assertEqual(self.rag.answer_cache.get_stats()["stale_puts"], 1)
+        # Both answers released their generation, so the re-ingest's invalidations are gone
+        self.assertEqual(self.rag.answer_cache._in_flight, {})
+        self.assertEqual(self.rag.answer_cache._invalidated_at, {})
+
+    def test_abandoned_stream_releases_its_generation(self):
+        stream = self.rag.query_stream("What is the capital of France?")
+        next(stream)
+        self.assertEqual(sum(self.rag.answer_cache._in_flight.values()), 1)
+        stream.close()
+        self.assertEqual(self.rag.answer_cache._in_flight, {})
+
+    def test_generation_error_is_reported(self):
+        self.rag.llm_client = Groq(api_key="test-key", base_url="http://127.0.0.1:9", max_retries=0)
+        response = self.rag.query("What is the capital of France?")
+        self.assertTrue(response.answer.startswith("Error generating response with Groq"))
+        self.assertIsNone(response.time_to_first_token)
+
+
+if __name__ == "__main__":
+    unittest.main()
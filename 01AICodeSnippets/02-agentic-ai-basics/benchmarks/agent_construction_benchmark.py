@@ -0,0 +1,69 @@
+"""
+Agent Construction Benchmark
+Time to construct LangChain agents with the shared factory cache cleared
+before every agent (the previous, build-everything-per-agent behaviour)
+and with it warm, plus the cost of reusing one agent with fresh memory.
+
+No requests are sent; a placeholder GROQ_API_KEY is used when none is set.
+
+Usage (from the project root):
+    python benchmarks/agent_construction_benchmark.py --agents 50
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+warnings.simplefilter("ignore")
+
+from src.langchain_agents import CalculatorLangChainAgent, ToolsLangChainAgent
+from src.langchain_agents.factory import cache_stats, clear_cache
+
+
+def construct(agent_class, count: int, cold: bool) -> float:
+    total = 0.0
+    for _ in range(count):
+        if cold:
+            clear_cache()
+        start = time.perf_counter()
+        # Silence the per-agent "initialized" banner
+        with contextlib.redirect_stdout(io.StringIO()):
+            agent_class(verbose=False)
+        total += time.perf_counter() - start
+    return total / count * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LangChain agent construction time, cold vs cached")
+    parser.add_argument("--agents", type=int, default=50)
+    args = parser.parse_args()
+
+    # Import-time and first-use costs are paid once, outside the measurements
+    with contextlib.redirect_stdout(io.StringIO()):
+        CalculatorLangChainAgent(verbose=False)
+
+    print(f"{'agent':<28}{'cold ms':>10}{'cached ms':>11}{'speedup':>9}")
+    for agent_class in (CalculatorLangChainAgent, ToolsLangChainAgent):
+        cold = construct(agent_class, args.agents, cold=True)
+        warm = construct(agent_class, args.agents, cold=False)
+        print(f"{agent_class.__name__:<28}{cold:>10.2f}{warm:>11.2f}{cold / warm:>8.1f}x")
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        agent = CalculatorLangChainAgent(verbose=False)
+        start = time.perf_counter()
+        for _ in range(args.agents):
+            agent.reset_memory()
+    reset = (time.perf_counter() - start) / args.agents * 1000
+    print(f"{'reuse + reset_memory()':<28}{'':>10}{reset:>11.3f}")
+    print(f"\ncache: {cache_stats()}")
+
+
+if __name__ == "__main__":
+    main()
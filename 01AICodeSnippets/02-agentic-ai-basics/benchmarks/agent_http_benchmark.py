@@ -0,0 +1,121 @@
+"""
+Agent HTTP Benchmark
+Requests/sec of BaseAgent against a local mock chat-completions server:
+a new httpx.Client per call (the old behaviour), the pooled sync run()
+from a thread pool, and the pooled async arun() on one event loop.
+
+Usage (from the project root):
+    python benchmarks/agent_http_benchmark.py --requests 500 --concurrency 1 16 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+from src.agents.base_agent import BaseAgent
+from src.utils.http_client import close_client, pooled_client
+
+REPLY = json.dumps({"choices": [{"message": {"role": "assistant", "content": "ok"}}]}).encode()
+
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body go out as separate writes
+    latency = 0.0
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(REPLY)))
+        self.end_headers()
+        self.wfile.write(REPLY)
+
+    def log_message(self, *args):
+        pass
+
+
+class MockServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+def start_server(latency: float) -> MockServer:
+    handler = type("Handler", (MockChatHandler,), {"latency": latency})
+    server = MockServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_fresh_client(agent: BaseAgent, task: str):
+    url, headers, data = agent._build_request([{"role": "user", "content": agent._create_prompt(task)}])
+    with httpx.Client() as client:
+        return agent._parse_response(client.post(url, headers=headers, json=data, timeout=30.0))
+
+
+def bench_threads(func, agent: BaseAgent, requests: int, concurrency: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(lambda i: func(agent, f"task {i}"), range(requests)))
+    return time.perf_counter() - start
+
+
+def bench_async(agent: BaseAgent, requests: int, concurrency: int) -> float:
+    async def main():
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def one(i):
+            async with semaphore:
+                return await agent.arun(f"task {i}")
+
+        async with pooled_client():
+            start = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(requests)))
+            return time.perf_counter() - start
+
+    return asyncio.run(main())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="BaseAgent requests/sec: fresh client vs pooled sync vs async")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16])
+    parser.add_argument("--latency", type=float, default=0.02, help="Simulated model latency (seconds)")
+    args = parser.parse_args()
+
+    server = start_server(args.latency)
+    agent = BaseAgent()
+    agent.base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    print(f"Mock server at {agent.base_url} ({args.latency * 1000:.0f} ms latency), "
+          f"{args.requests} requests per run\n")
+
+    print(f"{'path':<14}{'concurrency':>12}{'seconds':>10}{'req/s':>10}")
+    for concurrency in args.concurrency:
+        results = [
+            ("fresh client", bench_threads(run_fresh_client, agent, args.requests, concurrency)),
+            ("pooled sync", bench_threads(BaseAgent.run, agent, args.requests, concurrency)),
+            ("async", bench_async(agent, args.requests, concurrency)),
+        ]
+        for name, elapsed in results:
+            print(f"{name:<14}{concurrency:>12}{elapsed:>10.2f}{args.requests / elapsed:>10.0f}")
+
+    close_client()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
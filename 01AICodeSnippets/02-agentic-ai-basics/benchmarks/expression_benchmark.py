@@ -0,0 +1,125 @@
+"""
+Expression Engine Benchmark
+Evals/sec of the shared compiled expression engine against the previous
+CalculatorAgent (string replaces + eval) and CalculatorLangChainAgent
+(AST walk on every call) paths, plus NumPy-vectorized evaluation.
+
+Usage (from the project root):
+    python benchmarks/expression_benchmark.py --evals 20000 --points 100000
+"""
+
+import argparse
+import ast
+import math
+import operator
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.tools.expression import compile_expression, evaluate, np
+
+EXPRESSIONS = ["2 + 2 * 3", "sqrt(16) + 3 ** 2", "sin(pi / 4) * cos(pi / 4)", "log(1000, 10) + abs(-7.5)"]
+
+
+def legacy_calculate(expression: str):
+    """CalculatorAgent._calculate before the shared engine, compounding replaces included."""
+    expression = expression.strip()
+    expression = expression.replace('^', '**')
+    expression = expression.replace('π', 'math.pi')
+    expression = expression.replace('pi', 'math.pi')
+    expression = expression.replace('e', 'math.e')
+    safe_dict = {
+        "abs": abs, "round": round, "min": min, "max": max, "pow": pow, "math": math, "sqrt": math.sqrt,
+        "sin": math.sin, "cos": math.cos, "tan": math.tan, "log": math.log, "log10": math.log10,
+        "exp": math.exp, "pi": math.pi, "e": math.e
+    }
+    if any(dangerous in expression.lower() for dangerous in ['import', 'exec', 'eval', '__']):
+        raise ValueError("Unsafe expression detected")
+    return eval(expression, {"__builtins__": {}}, safe_dict)
+
+
+def legacy_eval_node(node):
+    """CalculatorLangChainAgent._eval_node before the shared engine."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.UnaryOp):
+        operand = legacy_eval_node(node.operand)
+        return -operand if isinstance(node.op, ast.USub) else +operand
+    if isinstance(node, ast.BinOp):
+        operators = {ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+                     ast.Div: operator.truediv, ast.Pow: operator.pow}
+        return operators[type(node.op)](legacy_eval_node(node.left), legacy_eval_node(node.right))
+    if isinstance(node, ast.Call):
+        func_name = node.func.attr if isinstance(node.func, ast.Attribute) else node.func.id
+        args = [legacy_eval_node(arg) for arg in node.args]
+        return getattr(math, func_name)(*args) if hasattr(math, func_name) else eval(func_name)(*args)
+    if isinstance(node, ast.Attribute):
+        return {"pi": math.pi, "e": math.e}[node.attr]
+    raise ValueError(f"Unsupported operation: {type(node)}")
+
+
+LEGACY_REPLACEMENTS = {
+    'pi': 'math.pi', 'e': 'math.e', 'sqrt': 'math.sqrt', 'sin': 'math.sin', 'cos': 'math.cos',
+    'tan': 'math.tan', 'log': 'math.log', 'log10': 'math.log10', 'exp': 'math.exp',
+    'abs': 'abs', 'pow': 'pow', 'round': 'round'
+}
+
+
+def legacy_safe_eval(expression: str):
+    """CalculatorLangChainAgent._safe_eval before the shared engine."""
+    expression = expression.strip()
+    for old, new in LEGACY_REPLACEMENTS.items():
+        expression = expression.replace(old, new)
+    return legacy_eval_node(ast.parse(expression, mode='eval').body)
+
+
+def rate(func, evals: int) -> float:
+    start = time.perf_counter()
+    for i in range(evals):
+        func(EXPRESSIONS[i % len(EXPRESSIONS)])
+    return evals / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evals/sec: compiled engine vs previous calculator paths")
+    parser.add_argument("--evals", type=int, default=20000)
+    parser.add_argument("--points", type=int, default=100000, help="Array length for the vectorized run")
+    args = parser.parse_args()
+
+    for expression in EXPRESSIONS:
+        assert math.isclose(evaluate(expression), legacy_calculate(expression)), expression
+        assert math.isclose(evaluate(expression), legacy_safe_eval(expression)), expression
+
+    print(f"{'path':<36}{'evals/s':>12}")
+    print(f"{'eval + string replaces (old agent)':<36}{rate(legacy_calculate, args.evals):>12,.0f}")
+    print(f"{'AST walk per call (old langchain)':<36}{rate(legacy_safe_eval, args.evals):>12,.0f}")
+    compile_expression.cache_clear()
+    print(f"{'compiled + LRU cache':<36}{rate(evaluate, args.evals):>12,.0f}")
+    print(f"  cache: {compile_expression.cache_info()}")
+
+    expression = "sqrt(x ** 2 + y ** 2) * sin(x / 3) + log(y + 1)"
+    xs = [i / 100 for i in range(args.points)]
+    ys = [i / 50 for i in range(args.points)]
+    compiled = compile_expression(expression)
+
+    start = time.perf_counter()
+    loop = [compiled(x=x, y=y) for x, y in zip(xs, ys)]
+    loop_rate = args.points / (time.perf_counter() - start)
+    print(f"\n{expression} over {args.points:,} points")
+    print(f"{'compiled, Python loop':<36}{loop_rate:>12,.0f}")
+
+    if np is None:
+        print("NumPy not installed: vectorized evaluation skipped")
+        return
+    x, y = np.array(xs), np.array(ys)
+    start = time.perf_counter()
+    vector = compiled(x=x, y=y)
+    vector_rate = args.points / (time.perf_counter() - start)
+    assert np.allclose(vector, loop)
+    print(f"{'compiled, NumPy vectorized':<36}{vector_rate:>12,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Memory Recall Benchmark
+Fill the long-term store with N synthetic facts, then time top-k recall
+(p50/p95, query embedding included), exact-key lookups and, for sizes up
+to --sqlite-limit, SQLite persistence and reload.
+
+Usage (from the project root):
+    python benchmarks/memory_benchmark.py --sizes 10000 1000000 --queries 200
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.memory.long_term import LongTermMemory
+
+TOPICS = ["quantum computing", "vector databases", "climate models", "protein folding", "rust compilers",
+          "solar panels", "jazz history", "coffee roasting", "marathon training", "chess openings"]
+
+
+def facts(count: int, seed: int = 0):
+    rng = random.Random(seed)
+    for i in range(count):
+        topic = rng.choice(TOPICS)
+        yield f"fact-{i}", f"User {rng.randrange(1000)} asked about {topic} in session {rng.randrange(10_000)}"
+
+
+def fill(memory: LongTermMemory, count: int, batch: int = 10_000) -> float:
+    start = time.perf_counter()
+    items = []
+    for item in facts(count):
+        items.append(item)
+        if len(items) == batch:
+            memory.put_many(items)
+            items = []
+    memory.put_many(items)
+    return time.perf_counter() - start
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return statistics.median(samples) * 1000, samples[int(len(samples) * 0.95) - 1] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Long-term memory recall latency at 10k and 1M entries")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--sqlite-limit", type=int, default=100_000, help="Largest size to persist to SQLite")
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    queries = [f"what did users ask about {rng.choice(TOPICS)}" for _ in range(args.queries)]
+
+    print(f"{'entries':>10}{'fill s':>9}{'recall p50 ms':>15}{'recall p95 ms':>15}{'get µs':>9}"
+          f"{'sqlite fill s':>15}{'reload s':>10}")
+    for size in args.sizes:
+        memory = LongTermMemory(max_entries=size)
+        fill_seconds = fill(memory, size)
+
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            results = memory.recall(query, k=args.k)
+            timings.append(time.perf_counter() - start)
+        assert len(results) == args.k and results[0]["score"] > 0
+        p50, p95 = percentiles(timings)
+
+        keys = [f"fact-{rng.randrange(size)}" for _ in range(10_000)]
+        start = time.perf_counter()
+        for key in keys:
+            memory.get(key)
+        get_us = (time.perf_counter() - start) / len(keys) * 1e6
+
+        sqlite_fill = reload = "-"
+        if size <= args.sqlite_limit:
+            with tempfile.TemporaryDirectory() as tmp:
+                db_path = str(Path(tmp) / "memory.db")
+                persisted = LongTermMemory(max_entries=size, db_path=db_path)
+                sqlite_fill = f"{fill(persisted, size):.2f}"
+                persisted.close()
+                start = time.perf_counter()
+                reloaded = LongTermMemory(max_entries=size, db_path=db_path)
+                reload = f"{time.perf_counter() - start:.2f}"
+                assert len(reloaded) == size
+                reloaded.close()
+
+        print(f"{size:>10,}{fill_seconds:>9.1f}{p50:>15.2f}{p95:>15.2f}{get_us:>9.1f}{sqlite_fill:>15}{reload:>10}")
+        del memory
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Research Fan-out Benchmark
+Wall time of ResearchLangChainAgent.research_topic in the ReAct mode (the
+agent calls web search and Wikipedia one after another, one LLM round trip
+per step) and in the fan-out mode (both sources at once, one synthesis
+call).
+
+Sources and the LLM are mocked with fixed latencies, so no requests are
+sent; a placeholder GROQ_API_KEY is used when none is set.
+
+Usage (from the project root):
+    python benchmarks/research_fanout_benchmark.py --web 0.8 --wiki 0.5 --llm 0.4 --runs 3
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+warnings.simplefilter("ignore")
+
+from langchain.tools import Tool
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from src.langchain_agents import ResearchLangChainAgent
+
+TOPIC = "Quantum computing"
+REACT_STEPS = [
+    f"Thought: find recent news\nAction: web_search\nAction Input: {TOPIC}",
+    f"Thought: get background\nAction: wikipedia\nAction Input: {TOPIC}",
+    "Final Answer: Quantum computing report."
+]
+
+
+class MockChatModel(FakeListChatModel):
+    """Scripted chat model with a fixed round-trip time."""
+
+    delay: float = 0.0
+
+    def _call(self, *args, **kwargs):
+        time.sleep(self.delay)
+        return super()._call(*args, **kwargs)
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+
+def mock_source(name: str, delay: float) -> Tool:
+    def search(query):
+        time.sleep(delay)
+        return f"{name} results for {query}. " * 20
+    return Tool(name=name, description=f"Mocked {name}.", func=search)
+
+
+def time_research(args, mode: str) -> float:
+    tools = [mock_source("web_search", args.web), mock_source("wikipedia", args.wiki)]
+    responses = REACT_STEPS if mode == "react" else ["Quantum computing report."]
+    samples = []
+    for _ in range(args.runs):
+        llm = MockChatModel(responses=responses, delay=args.llm)
+        with contextlib.redirect_stdout(io.StringIO()), \
+                patch.object(ResearchLangChainAgent, "_initialize_llm", return_value=llm), \
+                patch.object(ResearchLangChainAgent, "_get_tools", return_value=tools):
+            agent = ResearchLangChainAgent(agent_type="zero-shot", verbose=False)
+            start = time.perf_counter()
+            agent.research_topic(TOPIC, mode=mode)
+            samples.append(time.perf_counter() - start)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="research_topic latency, ReAct vs fan-out, with mocked sources")
+    parser.add_argument("--web", type=float, default=0.8, help="web search latency (s)")
+    parser.add_argument("--wiki", type=float, default=0.5, help="Wikipedia latency (s)")
+    parser.add_argument("--llm", type=float, default=0.4, help="LLM round trip (s)")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    react = time_research(args, "react")
+    fanout = time_research(args, "fanout")
+    print(f"sources: web {args.web}s, wikipedia {args.wiki}s; LLM round trip {args.llm}s")
+    print(f"{'mode':<10}{'median s':>10}{'expected s':>12}")
+    print(f"{'react':<10}{react:>10.2f}{args.web + args.wiki + 3 * args.llm:>12.2f}")
+    print(f"{'fanout':<10}{fanout:>10.2f}{max(args.web, args.wiki) + args.llm:>12.2f}")
+    print(f"\nspeedup: {react / fanout:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Sequence Engine Benchmark
+Time for prime and Fibonacci requests of growing size: the segmented sieve
+and fast doubling against the previous trial-division / list-building code
+(the old paths are only timed while they stay under --legacy-limit).
+
+Usage (from the project root):
+    python benchmarks/sequence_benchmark.py --max-exponent 8
+"""
+
+import argparse
+import math
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.tools.sequences import describe_sequence, prime_summary
+
+
+def legacy_prime_sequence(start: int, end: int):
+    """CalculatorLangChainAgent._prime_sequence before the sequence engine."""
+    primes = []
+    for num in range(max(2, start), end + 1):
+        if all(num % i != 0 for i in range(2, int(math.sqrt(num)) + 1)):
+            primes.append(num)
+    return primes
+
+
+def legacy_fibonacci_sequence(start: int, count: int):
+    """CalculatorLangChainAgent._fibonacci_sequence before the sequence engine."""
+    if count <= 0:
+        return []
+    if count == 1:
+        return [start]
+    sequence = [start, start + 1]
+    for _ in range(count - 2):
+        sequence.append(sequence[-1] + sequence[-2])
+    return sequence[:count]
+
+
+def measure(func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak / 2 ** 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sequence engine time and peak memory vs the old code")
+    parser.add_argument("--max-exponent", type=int, default=8, help="Largest prime range is 10**N")
+    parser.add_argument("--legacy-limit", type=int, default=10 ** 5, help="Skip old code above this size")
+    args = parser.parse_args()
+
+    print(f"{'request':<24}{'engine s':>10}{'peak MiB':>10}{'old s':>10}{'old MiB':>10}  result")
+    for exponent in range(4, args.max_exponent + 1):
+        n = 10 ** exponent
+        count, last = prime_summary(1, n)
+        # describe_sequence is what the tool returns: first 100 terms + count + last
+        _, tool_seconds, tool_peak = measure(describe_sequence, "prime", 1, n)
+        old = "-"
+        old_peak = "-"
+        if n <= args.legacy_limit:
+            _, old_seconds, old_mem = measure(legacy_prime_sequence, 1, n)
+            old, old_peak = f"{old_seconds:.3f}", f"{old_mem:.1f}"
+        print(f"{f'prime:1:{n:.0e}':<24}{tool_seconds:>10.3f}{tool_peak:>10.1f}{old:>10}{old_peak:>10}"
+              f"  {count:,} primes, last {last}")
+
+    for exponent in range(3, 7):
+        n = 10 ** exponent
+        _, seconds, peak = measure(describe_sequence, "fibonacci", 0, n)
+        old = "-"
+        old_peak = "-"
+        if n <= args.legacy_limit:
+            _, old_seconds, old_mem = measure(legacy_fibonacci_sequence, 0, n)
+            old, old_peak = f"{old_seconds:.3f}", f"{old_mem:.1f}"
+        print(f"{f'fibonacci:0:{n:.0e}':<24}{seconds:>10.3f}{peak:>10.1f}{old:>10}{old_peak:>10}")
+
+
+if __name__ == "__main__":
+    main()
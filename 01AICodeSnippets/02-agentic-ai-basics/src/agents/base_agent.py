@@ -1,7 +1,10 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 import httpx
 import os
+import time
 from dotenv import load_dotenv
+from ..tools.executor import arun_tool_calls, format_tool_results, parse_tool_calls, run_tool_calls
+from ..utils.http_client import get_client, get_async_client, pooled_client
 
 load_dotenv()
 
@@ -12,7 +15,7 @@ class BaseAgent:
             raise ValueError("GROQ_API_KEY environment variable is not set")
             
         self.api_key = api_key
-        self.base_url = "https://api.groq.com/openai/v1"
+        self.base_url = os.getenv("GROQ_BASE_URL", "https://api.groq.com/openai/v1")
         self.tools = self._get_default_tools()
 
     def _get_default_tools(self) -> List[Dict]:
@@ -36,48 +39,129 @@ class BaseAgent:
         1) What needs to be done
         2) What tools would help
         3) Execute the plan
+        
+        To use tools, reply with only one line per call, in this exact form:
+        TOOL: <tool name>: <input>
+        Calls you list together run in parallel and their results come back
+        in the next message. If no tool is needed, answer directly.
         """
 
-    def run(self, task: str) -> Dict[str, Any]:
-        prompt = self._create_prompt(task)
-        
+    def _build_request(self, messages: List[Dict[str, str]]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
         headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         
         data = {
-            "messages": [{
-                "role": "user",
-                "content": prompt
-            }],
+            "messages": messages,
             "model": "llama3-8b-8192",
             "temperature": 0.7
         }
         
-        chat_completions_url = f"{self.base_url}/chat/completions"
+        return f"{self.base_url}/chat/completions", headers, data
+
+    @staticmethod
+    def _parse_response(response: httpx.Response) -> str:
+        # Debug: Print response details if there's an error
+        if response.status_code != 200:
+            print(f"Status Code: {response.status_code}")
+            print(f"Response Text: {response.text}")
+        
+        response.raise_for_status()
+        result = response.json()
+        
+        return result["choices"][0]["message"]["content"]
+
+    def _chat(self, messages: List[Dict[str, str]]) -> str:
+        chat_completions_url, headers, data = self._build_request(messages)
 
         try:
-            with httpx.Client() as client:
-                response = client.post(
-                    chat_completions_url,
-                    headers=headers,
-                    json=data,
-                    timeout=30.0
-                )
-                
-                # Debug: Print response details if there's an error
-                if response.status_code != 200:
-                    print(f"Status Code: {response.status_code}")
-                    print(f"Response Text: {response.text}")
-                
-                response.raise_for_status()
-                result = response.json()
-                
-            return {
-                "output": result["choices"][0]["message"]["content"]
-            }
+            # Shared keep-alive pool: no TCP/TLS handshake per agent step
+            response = get_client().post(chat_completions_url, headers=headers, json=data)
+            return self._parse_response(response)
         except Exception as e:
             print(f"Error occurred: {e}")
             print(f"URL used: {chat_completions_url}")
-            raise 
\ No newline at end of file
+            raise
+
+    async def _achat(self, messages: List[Dict[str, str]]) -> str:
+        chat_completions_url, headers, data = self._build_request(messages)
+
+        try:
+            response = await get_async_client().post(chat_completions_url, headers=headers, json=data)
+            return self._parse_response(response)
+        except Exception as e:
+            print(f"Error occurred: {e}")
+            print(f"URL used: {chat_completions_url}")
+            raise
+
+    def run(self, task: str) -> Dict[str, Any]:
+        """Plan with the model, run the requested tools in parallel, then answer.
+
+        Returns the final output, every tool call's result and per-step
+        timings in seconds (plan, tools, answer, total).
+        """
+        start = time.perf_counter()
+        messages = [{"role": "user", "content": self._create_prompt(task)}]
+        reply = self._chat(messages)
+        timings = {"plan": time.perf_counter() - start}
+
+        tool_calls = []
+        calls = parse_tool_calls(reply, self.tools)
+        if calls:
+            step = time.perf_counter()
+            tool_calls = run_tool_calls(calls, self.tools)
+            timings["tools"] = time.perf_counter() - step
+
+            step = time.perf_counter()
+            messages += [
+                {"role": "assistant", "content": reply},
+                {"role": "user", "content": format_tool_results(tool_calls)},
+            ]
+            reply = self._chat(messages)
+            timings["answer"] = time.perf_counter() - step
+
+        timings["total"] = time.perf_counter() - start
+        return {
+            "output": reply,
+            "tool_calls": tool_calls,
+            "timings": {name: round(seconds, 4) for name, seconds in timings.items()}
+        }
+
+    async def arun(self, task: str) -> Dict[str, Any]:
+        """Async variant of run(); many tasks can share one event loop.
+
+        Model calls go through the loop's pooled AsyncClient. Concurrent
+        aruns share it; wrap sequential ones in `async with pooled_client():`
+        to share it across them too.
+        """
+        async with pooled_client():
+            return await self._arun(task)
+
+    async def _arun(self, task: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        messages = [{"role": "user", "content": self._create_prompt(task)}]
+        reply = await self._achat(messages)
+        timings = {"plan": time.perf_counter() - start}
+
+        tool_calls = []
+        calls = parse_tool_calls(reply, self.tools)
+        if calls:
+            step = time.perf_counter()
+            tool_calls = await arun_tool_calls(calls, self.tools)
+            timings["tools"] = time.perf_counter() - step
+
+            step = time.perf_counter()
+            messages += [
+                {"role": "assistant", "content": reply},
+                {"role": "user", "content": format_tool_results(tool_calls)},
+            ]
+            reply = await self._achat(messages)
+            timings["answer"] = time.perf_counter() - step
+
+        timings["total"] = time.perf_counter() - start
+        return {
+            "output": reply,
+            "tool_calls": tool_calls,
+            "timings": {name: round(seconds, 4) for name, seconds in timings.items()}
+        }
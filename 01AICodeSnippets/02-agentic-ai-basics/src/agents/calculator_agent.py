@@ -1,7 +1,6 @@
 from typing import List, Dict
 from .base_agent import BaseAgent
-import math
-import re
+from ..tools.expression import evaluate
 
 class CalculatorAgent(BaseAgent):
     def _get_default_tools(self) -> List[Dict]:
@@ -9,42 +8,22 @@ class CalculatorAgent(BaseAgent):
             {
                 "name": "calculator",
                 "description": "Useful for performing mathematical calculations. Supports basic arithmetic, trigonometry, logarithms, and more.",
-                "func": self._calculate
+                "func": self._calculate,
+                "timeout": 2.0
             },
             {
                 "name": "math_help",
                 "description": "Get help with mathematical concepts and formulas",
-                "func": self._math_help
+                "func": self._math_help,
+                "timeout": 1.0
             }
         ]
     
     def _calculate(self, expression: str) -> str:
         """Safely evaluate mathematical expressions"""
         try:
-            # Remove any non-mathematical characters for safety
-            expression = expression.strip()
-            
-            # Replace common math terms with Python equivalents
-            expression = expression.replace('^', '**')  # Power operator
-            expression = expression.replace('π', 'math.pi')
-            expression = expression.replace('pi', 'math.pi')
-            expression = expression.replace('e', 'math.e')
-            
-            # Define safe functions and constants
-            safe_dict = {
-                "abs": abs, "round": round, "min": min, "max": max,
-                "pow": pow, "math": math, "sqrt": math.sqrt,
-                "sin": math.sin, "cos": math.cos, "tan": math.tan,
-                "log": math.log, "log10": math.log10, "exp": math.exp,
-                "pi": math.pi, "e": math.e
-            }
-            
-            # Check for dangerous operations
-            if any(dangerous in expression.lower() for dangerous in ['import', 'exec', 'eval', '__']):
-                return "Error: Unsafe expression detected"
-            
-            # Evaluate the expression
-            result = eval(expression, {"__builtins__": {}}, safe_dict)
+            # Parsed once into a cached closure tree; no eval, no string rewriting
+            result = evaluate(expression)
             return f"Result: {result}"
             
         except Exception as e:
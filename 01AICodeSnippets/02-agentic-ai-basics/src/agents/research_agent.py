@@ -1,26 +1,37 @@
+import threading
 from typing import List, Dict
 from duckduckgo_search import DDGS
 import wikipedia
 from .base_agent import BaseAgent
 
 class ResearchAgent(BaseAgent):
+    def __init__(self):
+        super().__init__()
+        # One DDGS session (and its connection pool) for every search
+        self._ddgs = None
+        self._ddgs_lock = threading.Lock()
+
     def _get_default_tools(self) -> List[Dict]:
         return [
             {
                 "name": "web_search",
                 "description": "Useful for searching the internet for current information",
-                "func": self._web_search
+                "func": self._web_search,
+                "timeout": 10.0
             },
             {
                 "name": "wikipedia",
                 "description": "Useful for getting detailed information from Wikipedia",
-                "func": self._wikipedia_search
+                "func": self._wikipedia_search,
+                "timeout": 10.0
             }
         ]
     
     def _web_search(self, query: str) -> str:
-        with DDGS() as ddgs:
-            results = list(ddgs.text(query, max_results=3))
+        with self._ddgs_lock:
+            if self._ddgs is None:
+                self._ddgs = DDGS()
+            results = list(self._ddgs.text(query, max_results=3))
         return "\n".join([f"- {result['title']}: {result['body']}" for result in results])
     
     def _wikipedia_search(self, query: str) -> str:
@@ -29,4 +40,9 @@ class ResearchAgent(BaseAgent):
         except wikipedia.exceptions.DisambiguationError as e:
             return wikipedia.summary(e.options[0], sentences=3)
         except wikipedia.exceptions.PageError:
-            return f"No Wikipedia page found for '{query}'" 
\ No newline at end of file
+            return f"No Wikipedia page found for '{query}'"
+
+    def close(self):
+        if self._ddgs is not None:
+            self._ddgs.__exit__(None, None, None)
+            self._ddgs = None
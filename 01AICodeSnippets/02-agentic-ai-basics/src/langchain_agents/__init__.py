@@ -7,10 +7,12 @@ from .base_langchain_agent import BaseLangChainAgent
 from .research_langchain_agent import ResearchLangChainAgent
 from .calculator_langchain_agent import CalculatorLangChainAgent
 from .tools_langchain_agent import ToolsLangChainAgent
+from .summary_memory import SummaryBufferMemory
 
 __all__ = [
     "BaseLangChainAgent",
     "ResearchLangChainAgent", 
     "CalculatorLangChainAgent",
-    "ToolsLangChainAgent"
+    "ToolsLangChainAgent",
+    "SummaryBufferMemory"
 ] 
\ No newline at end of file
@@ -12,12 +12,13 @@ from typing import List, Dict, Any, Optional
 from dotenv import load_dotenv
 
 # LangChain imports
-from langchain.agents import AgentType, initialize_agent, create_tool_calling_agent
 from langchain.agents.agent import AgentExecutor
 from langchain.memory import ConversationBufferMemory
 from langchain.tools import Tool
 from langchain.schema import BaseMessage
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+from .factory import get_llm, get_react_agent, get_tool_calling_agent, llm_cache_key
+from .summary_memory import PromptTokenCounter, SummaryBufferMemory
 
 # LLM imports
 try:
@@ -50,22 +51,27 @@ class BaseLangChainAgent:
             agent_type: Type of agent ("tool-calling" or "zero-shot")
             max_tokens: Maximum tokens for response
             verbose: Whether to show agent reasoning
+            memory_mode: "buffer" (full history) or "summary" (last turns
+                verbatim + background summary, token-bounded)
+            memory_turns: Turns kept verbatim in summary mode
+            memory_token_limit: Token budget for chat_history in summary mode
         """
         self.model_name = model_name
         self.temperature = temperature
         self.agent_type = agent_type
         self.max_tokens = kwargs.get('max_tokens', 16000)
         self.verbose = kwargs.get('verbose', True)
+        self.memory_mode = kwargs.get('memory_mode', 'buffer')
+        self.memory_turns = kwargs.get('memory_turns', 4)
+        self.memory_token_limit = kwargs.get('memory_token_limit', 2000)
+        self.token_log: List[Dict[str, int]] = []
         
         # Initialize LLM
         self.llm = self._initialize_llm()
         self.llm_provider = self._get_provider_name()
         
         # Initialize memory
-        self.memory = ConversationBufferMemory(
-            memory_key="chat_history",
-            return_messages=True
-        )
+        self.memory = self._create_memory()
         
         # Tools will be set by subclasses
         self.tools = self._get_tools()
@@ -76,42 +82,48 @@ class BaseLangChainAgent:
         print(f"🤖 LangChain Agent initialized with {self.llm_provider}")
     
     def _initialize_llm(self):
-        """Initialize LLM with available free APIs."""
+        """Initialize LLM with available free APIs (clients are shared via the factory cache)."""
         # Try Google AI Studio first with the basic model
         if os.getenv("GOOGLE_AI_API_KEY") and ChatGoogleGenerativeAI:
             try:
-                return ChatGoogleGenerativeAI(
+                key = llm_cache_key("google", "gemini-2.0-flash", self.temperature, self.max_tokens,
+                                    os.getenv("GOOGLE_AI_API_KEY"))
+                return get_llm(key, lambda: ChatGoogleGenerativeAI(
                     google_api_key=os.getenv("GOOGLE_AI_API_KEY"),
                     model="gemini-2.0-flash",  # Using the standard model instead of 1.5-pro
                     temperature=self.temperature,
                     max_output_tokens=self.max_tokens,
                     request_timeout=30,
                     retry_max_attempts=2
-                )
+                ))
             except Exception as e:
                 print(f"⚠️ Google AI initialization failed: {e}, trying next provider...")
         
         # Try Anthropic as fallback
         if os.getenv("ANTHROPIC_API_KEY") and ChatAnthropic:
             try:
-                return ChatAnthropic(
+                key = llm_cache_key("anthropic", "claude-3-haiku-20240307", self.temperature, self.max_tokens,
+                                    os.getenv("ANTHROPIC_API_KEY"))
+                return get_llm(key, lambda: ChatAnthropic(
                     anthropic_api_key=os.getenv("ANTHROPIC_API_KEY"),
                     model="claude-3-haiku-20240307",
                     temperature=self.temperature,
                     max_tokens=self.max_tokens
-                )
+                ))
             except Exception as e:
                 print(f"⚠️ Anthropic initialization failed: {e}, trying next provider...")
         
         # Try Groq as last resort
         if os.getenv("GROQ_API_KEY") and ChatGroq:
             try:
-                return ChatGroq(
+                key = llm_cache_key("groq", "llama-3.1-8b-instant", self.temperature, self.max_tokens,
+                                    os.getenv("GROQ_API_KEY"))
+                return get_llm(key, lambda: ChatGroq(
                     groq_api_key=os.getenv("GROQ_API_KEY"),
                     model_name="llama-3.1-8b-instant",
                     temperature=self.temperature,
                     max_tokens=self.max_tokens
-                )
+                ))
             except Exception as e:
                 print(f"⚠️ Groq initialization failed: {e}")
         
@@ -127,6 +139,23 @@ class BaseLangChainAgent:
             "- Anthropic: https://console.anthropic.com/"
         )
     
+    def _create_memory(self):
+        """Create conversation memory for the configured memory mode."""
+        if self.memory_mode == "summary":
+            return SummaryBufferMemory(
+                llm=self.llm,
+                memory_key="chat_history",
+                return_messages=True,
+                keep_turns=self.memory_turns,
+                max_token_limit=self.memory_token_limit
+            )
+        if self.memory_mode != "buffer":
+            raise ValueError(f"Unknown memory_mode: {self.memory_mode}. Use 'buffer' or 'summary'")
+        return ConversationBufferMemory(
+            memory_key="chat_history",
+            return_messages=True
+        )
+    
     def _get_provider_name(self) -> str:
         """Get the provider name for display."""
         class_name = self.llm.__class__.__name__
@@ -144,21 +173,10 @@ class BaseLangChainAgent:
         return []
     
     def _create_agent(self) -> AgentExecutor:
-        """Create the agent executor."""
+        """Create the agent executor around a shared, pre-built agent."""
         if self.agent_type == "tool-calling" and self.tools:
-            prompt = ChatPromptTemplate.from_messages([
-                ("system", self._get_system_prompt()),
-                ("human", "{input}"),
-                MessagesPlaceholder(variable_name="agent_scratchpad"),
-                MessagesPlaceholder(variable_name="chat_history", optional=True)
-            ])
-            
             return AgentExecutor(
-                agent=create_tool_calling_agent(
-                    llm=self.llm,
-                    tools=self.tools,
-                    prompt=prompt
-                ),
+                agent=get_tool_calling_agent(self.llm, self.tools, self._get_system_prompt()),
                 tools=self.tools,
                 memory=self.memory,
                 verbose=self.verbose,
@@ -168,10 +186,9 @@ class BaseLangChainAgent:
             )
         else:
             # Fallback to zero-shot react agent
-            return initialize_agent(
+            return AgentExecutor.from_agent_and_tools(
+                agent=get_react_agent(self.llm, self.tools),
                 tools=self.tools,
-                llm=self.llm,
-                agent=AgentType.ZERO_SHOT_REACT_DESCRIPTION,
                 memory=self.memory,
                 verbose=self.verbose,
                 max_iterations=5,
@@ -208,26 +225,34 @@ class BaseLangChainAgent:
 
         Always format tool calls exactly as shown in the example."""
     
-    def run(self, input_text: str) -> Dict[str, Any]:
+    def run(self, input_text: str, fresh_memory: bool = False) -> Dict[str, Any]:
         """
         Run the agent with the given input.
         
         Args:
             input_text: User input/question
+            fresh_memory: Clear the conversation first (one agent reused
+                across independent requests; the executor is kept)
             
         Returns:
             Dictionary with response and metadata
         """
+        if fresh_memory:
+            self.memory.clear()
+        token_counter = PromptTokenCounter()
         try:
             # Execute the agent
-            result = self.agent_executor.invoke({"input": input_text})
+            result = self.agent_executor.invoke({"input": input_text}, config={"callbacks": [token_counter]})
+            self._log_prompt_tokens(token_counter)
             
             return {
                 "output": result["output"],
                 "input": input_text,
                 "provider": self.llm_provider,
                 "agent_type": self.agent_type,
-                "tools_used": [tool.name for tool in self.tools] if self.tools else []
+                "tools_used": [tool.name for tool in self.tools] if self.tools else [],
+                "prompt_tokens": token_counter.prompt_tokens,
+                "llm_calls": len(token_counter.calls)
             }
             
         except Exception as e:
@@ -239,9 +264,22 @@ class BaseLangChainAgent:
                 "error": True
             }
     
+    def _log_prompt_tokens(self, token_counter: PromptTokenCounter):
+        """Record the prompt tokens this turn sent to the LLM (printed when verbose)."""
+        entry = {
+            "turn": len(self.token_log) + 1,
+            "prompt_tokens": token_counter.prompt_tokens,
+            "llm_calls": len(token_counter.calls)
+        }
+        self.token_log.append(entry)
+        if self.verbose:
+            print(f"📏 Turn {entry['turn']}: {entry['prompt_tokens']:,} prompt tokens "
+                  f"over {entry['llm_calls']} LLM call(s) [{self.memory_mode} memory]")
+    
     def reset_memory(self):
-        """Reset the agent's conversation memory."""
+        """Reset the agent's conversation memory (the executor is reused as is)."""
         self.memory.clear()
+        self.token_log.clear()
         print("🧠 Agent memory cleared")
 
     # def _get_weather(self, location: str) -> str:
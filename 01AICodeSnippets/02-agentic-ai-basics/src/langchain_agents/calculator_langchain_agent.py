@@ -4,12 +4,12 @@ Includes mathematical computation tools and safe evaluation.
 """
 
 import math
-import ast
-import operator
 from typing import List, Dict, Any, Union
 from langchain.tools import Tool
 
 from .base_langchain_agent import BaseLangChainAgent
+from ..tools.expression import evaluate
+from ..tools.sequences import describe_sequence
 
 class CalculatorLangChainAgent(BaseLangChainAgent):
     """LangChain-powered calculator agent with mathematical tools."""
@@ -52,80 +52,14 @@ class CalculatorLangChainAgent(BaseLangChainAgent):
     def _safe_eval(self, expression: str) -> str:
         """Safely evaluate mathematical expressions."""
         try:
-            # Clean the expression
-            expression = expression.strip()
-            
-            # Replace common mathematical functions and constants
-            replacements = {
-                'pi': 'math.pi',
-                'e': 'math.e',
-                'sqrt': 'math.sqrt',
-                'sin': 'math.sin',
-                'cos': 'math.cos',
-                'tan': 'math.tan',
-                'log': 'math.log',
-                'log10': 'math.log10',
-                'exp': 'math.exp',
-                'abs': 'abs',
-                'pow': 'pow',
-                'round': 'round'
-            }
-            
-            for old, new in replacements.items():
-                expression = expression.replace(old, new)
-            
-            # Safe evaluation using ast
-            node = ast.parse(expression, mode='eval')
-            result = self._eval_node(node.body)
+            # Shared engine: parsed once, cached, evaluated without eval()
+            result = evaluate(expression)
             
             return f"Result: {result}"
             
         except Exception as e:
             return f"Error: Unable to evaluate '{expression}'. {str(e)}"
     
-    def _eval_node(self, node):
-        """Safely evaluate an AST node."""
-        if isinstance(node, ast.Constant):
-            return node.value
-        elif isinstance(node, ast.UnaryOp):
-            operand = self._eval_node(node.operand)
-            if isinstance(node.op, ast.UAdd):
-                return +operand
-            elif isinstance(node.op, ast.USub):
-                return -operand
-        elif isinstance(node, ast.BinOp):
-            left = self._eval_node(node.left)
-            right = self._eval_node(node.right)
-            
-            operators = {
-                ast.Add: operator.add,
-                ast.Sub: operator.sub,
-                ast.Mult: operator.mul,
-                ast.Div: operator.truediv,
-                ast.Pow: operator.pow,
-                ast.Mod: operator.mod,
-                ast.FloorDiv: operator.floordiv
-            }
-            
-            if type(node.op) in operators:
-                return operators[type(node.op)](left, right)
-        elif isinstance(node, ast.Call):
-            func_name = node.func.attr if isinstance(node.func, ast.Attribute) else node.func.id
-            args = [self._eval_node(arg) for arg in node.args]
-            
-            # Handle math module functions
-            if hasattr(math, func_name):
-                return getattr(math, func_name)(*args)
-            elif func_name in ['abs', 'pow', 'round']:
-                return eval(func_name)(*args)
-        elif isinstance(node, ast.Attribute):
-            if node.attr == 'pi':
-                return math.pi
-            elif node.attr == 'e':
-                return math.e
-        
-        raise ValueError(f"Unsupported operation: {type(node)}")
-    
     def _convert_units(self, conversion: str) -> str:
         """Convert between units."""
         try:
@@ -226,43 +160,12 @@ class CalculatorLangChainAgent(BaseLangChainAgent):
             start = int(start_str)
             end_or_count = int(end_str)
             
-            if seq_type.lower() == 'fibonacci':
-                sequence = self._fibonacci_sequence(start, end_or_count)
-            elif seq_type.lower() == 'prime':
-                sequence = self._prime_sequence(start, end_or_count)
-            elif seq_type.lower() == 'square':
-                sequence = [i**2 for i in range(start, end_or_count + 1)]
-            elif seq_type.lower() == 'cube':
-                sequence = [i**3 for i in range(start, end_or_count + 1)]
-            else:
-                return f"Unknown sequence type: {seq_type}. Available: fibonacci, prime, square, cube"
-            
-            return f"{seq_type.title()} sequence: {sequence}"
+            # Lazy generators + segmented sieve; long output is truncated
+            return describe_sequence(seq_type.strip(), start, end_or_count)
             
         except Exception as e:
             return f"Error generating sequence: {str(e)}"
     
-    def _fibonacci_sequence(self, start: int, count: int) -> List[int]:
-        """Generate Fibonacci sequence."""
-        if count <= 0:
-            return []
-        if count == 1:
-            return [start]
-        
-        sequence = [start, start + 1]
-        for _ in range(count - 2):
-            sequence.append(sequence[-1] + sequence[-2])
-        
-        return sequence[:count]
-    
-    def _prime_sequence(self, start: int, end: int) -> List[int]:
-        """Generate prime numbers in range."""
-        primes = []
-        for num in range(max(2, start), end + 1):
-            if all(num % i != 0 for i in range(2, int(math.sqrt(num)) + 1)):
-                primes.append(num)
-        return primes
-    
     def _get_system_prompt(self) -> str:
         """Get system prompt for calculator agent."""
         return """You are a professional mathematics assistant specializing in calculations, conversions, and mathematical analysis.
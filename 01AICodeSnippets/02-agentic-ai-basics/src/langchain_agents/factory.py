@@ -0,0 +1,90 @@
+"""
+Shared, process-wide caches for LangChain agent construction.
+
+Building a provider client (HTTP clients, SSL context, validation) and
+binding tool schemas to it dominate BaseLangChainAgent construction. Both
+are immutable once built, so they are cached here and shared by every
+agent with the same configuration; each agent still gets its own memory
+and a lightweight AgentExecutor.
+"""
+
+import hashlib
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+from langchain.agents import ZeroShotAgent, create_tool_calling_agent
+from langchain.tools import Tool
+from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+
+_lock = threading.RLock()
+_llms: Dict[Tuple, Any] = {}
+_prompts: Dict[str, ChatPromptTemplate] = {}
+_agents: Dict[Tuple, Any] = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def _cached(cache: Dict, key, build: Callable[[], Any]):
+    with _lock:
+        if key in cache:
+            _stats["hits"] += 1
+            return cache[key]
+        _stats["misses"] += 1
+        value = cache[key] = build()
+        return value
+
+
+def llm_cache_key(provider: str, model: str, temperature: float, max_tokens: int, api_key: str) -> Tuple:
+    # The key is hashed so the cache never holds a second copy of it
+    return (provider, model, temperature, max_tokens, hashlib.sha256(api_key.encode()).hexdigest()[:16])
+
+
+def get_llm(key: Tuple, build: Callable[[], Any]):
+    """Return the client cached under key, building it on first use."""
+    return _cached(_llms, key, build)
+
+
+def get_prompt(system_prompt: str) -> ChatPromptTemplate:
+    """Tool-calling prompt template for a system prompt."""
+    return _cached(_prompts, system_prompt, lambda: ChatPromptTemplate.from_messages([
+        ("system", system_prompt),
+        ("human", "{input}"),
+        MessagesPlaceholder(variable_name="agent_scratchpad"),
+        MessagesPlaceholder(variable_name="chat_history", optional=True)
+    ]))
+
+
+def _tools_key(tools: List[Tool]) -> Tuple:
+    return tuple((tool.name, tool.description) for tool in tools)
+
+
+def get_tool_calling_agent(llm, tools: List[Tool], system_prompt: str):
+    """Prompt | LLM-with-bound-tool-schemas runnable, shared across agents.
+
+    Only tool names and descriptions are bound into it; the functions
+    themselves are passed per agent to its AgentExecutor.
+    """
+    # Cached LLMs live as long as the process, so their id() is a stable key
+    key = ("tool-calling", id(llm), system_prompt, _tools_key(tools))
+    return _cached(_agents, key, lambda: create_tool_calling_agent(
+        llm=llm, tools=tools, prompt=get_prompt(system_prompt)
+    ))
+
+
+def get_react_agent(llm, tools: List[Tool]) -> ZeroShotAgent:
+    """Zero-shot ReAct agent (prompt + LLM chain), shared across agents."""
+    key = ("zero-shot", id(llm), _tools_key(tools))
+    return _cached(_agents, key, lambda: ZeroShotAgent.from_llm_and_tools(llm=llm, tools=tools))
+
+
+def cache_stats() -> Dict[str, int]:
+    with _lock:
+        return {"llms": len(_llms), "prompts": len(_prompts), "agents": len(_agents), **_stats}
+
+
+def clear_cache():
+    """Drop every cached client, prompt and agent (e.g. after rotating API keys)."""
+    with _lock:
+        _llms.clear()
+        _prompts.clear()
+        _agents.clear()
+        _stats.update(hits=0, misses=0)
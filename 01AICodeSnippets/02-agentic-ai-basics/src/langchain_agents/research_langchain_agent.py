@@ -3,18 +3,32 @@ Research Agent Implementation using LangChain
 Includes web search and Wikipedia tools for comprehensive research.
 """
 
+import re
+import time
 from typing import List, Dict, Any
 from langchain.tools import Tool
 from langchain_community.tools import DuckDuckGoSearchRun, WikipediaQueryRun
 from langchain_community.utilities import WikipediaAPIWrapper
+from langchain_core.messages import HumanMessage, SystemMessage
 import requests
 import json
 from datetime import datetime
 
 from .base_langchain_agent import BaseLangChainAgent
+from .summary_memory import PromptTokenCounter
+from ..tools.executor import run_tool_calls
+
+SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+|\n+")
 
 class ResearchLangChainAgent(BaseLangChainAgent):
     """LangChain-powered research agent with web search and Wikipedia tools."""
+
+    # Fan-out mode: deadline (seconds) per source and size of the gathered context
+    SOURCE_TIMEOUTS = {
+        "web_search": 8.0,
+        "wikipedia": 6.0
+    }
+    MAX_CONTEXT_CHARS = 6000
     
     def __init__(self, **kwargs):
         """Initialize research agent with search tools."""
@@ -103,19 +117,35 @@ Always:
 
 Be thorough but concise. Focus on providing accurate, well-researched information."""
 
-    def research_topic(self, topic: str, include_background: bool = True) -> Dict[str, Any]:
+    def research_topic(self, topic: str, include_background: bool = True, mode: str = "react") -> Dict[str, Any]:
         """
         Conduct comprehensive research on a topic.
         
         Args:
             topic: Research topic or question
             include_background: Whether to include Wikipedia background research
+            mode: "react" lets the agent pick tools step by step; "fanout"
+                queries every source at once and synthesizes with one LLM call
             
         Returns:
             Research results with sources and analysis
         """
+        if mode == "fanout":
+            result = self._fanout_research(topic, include_background)
+        elif mode == "react":
+            result = self.run(self._research_query(topic, include_background))
+        else:
+            raise ValueError(f"Unknown research mode '{mode}'. Use 'react' or 'fanout'")
+
+        result["research_type"] = "comprehensive" if include_background else "current"
+        result["research_mode"] = mode
+        result["topic"] = topic
+        
+        return result
+
+    def _research_query(self, topic: str, include_background: bool) -> str:
         if include_background:
-            research_query = f"""
+            return f"""
 Please conduct comprehensive research on: {topic}
 
 Process:
@@ -125,15 +155,89 @@ Process:
 
 Focus on accuracy and include multiple perspectives where relevant.
             """.strip()
-        else:
-            research_query = f"""
+        return f"""
 Please research current information about: {topic}
 
 Focus on recent developments and current status. Use web search for the most up-to-date information.
             """.strip()
-        
-        result = self.run(research_query)
-        result["research_type"] = "comprehensive" if include_background else "current"
-        result["topic"] = topic
-        
-        return result 
\ No newline at end of file
+
+    def _fanout_research(self, topic: str, include_background: bool) -> Dict[str, Any]:
+        """Query all sources concurrently, then make a single synthesis call."""
+        start = time.perf_counter()
+        sources = [
+            {"name": tool.name, "func": tool.func, "timeout": self.SOURCE_TIMEOUTS[tool.name]}
+            for tool in self.tools
+            if tool.name in self.SOURCE_TIMEOUTS and (include_background or tool.name != "wikipedia")
+        ]
+        # Each source only costs up to its own deadline; failures are reported, not raised
+        results = run_tool_calls([(source["name"], topic) for source in sources], sources)
+        gathered = time.perf_counter()
+
+        context = self._merge_sources(results)
+        token_counter = PromptTokenCounter()
+        try:
+            response = self.llm.invoke([
+                SystemMessage(content=self._get_system_prompt()),
+                HumanMessage(content=(
+                    f"{self._research_query(topic, include_background)}\n\n"
+                    f"Sources have already been gathered; do not ask for more.\n\n"
+                    f"{context or 'No source returned any information.'}"
+                ))
+            ], config={"callbacks": [token_counter]})
+        except Exception as e:
+            return {
+                "output": f"Error: {str(e)}",
+                "input": topic,
+                "provider": self.llm_provider,
+                "agent_type": self.agent_type,
+                "sources": results,
+                "error": True
+            }
+        output = str(getattr(response, "content", response))
+        self.memory.save_context({"input": topic}, {"output": output})
+        self._log_prompt_tokens(token_counter)
+        end = time.perf_counter()
+
+        return {
+            "output": output,
+            "input": topic,
+            "provider": self.llm_provider,
+            "agent_type": self.agent_type,
+            "tools_used": [result["tool"] for result in results if result["error"] is None],
+            "sources": results,
+            "prompt_tokens": token_counter.prompt_tokens,
+            "llm_calls": len(token_counter.calls),
+            "timings": {
+                "sources": round(gathered - start, 4),
+                "synthesis": round(end - gathered, 4),
+                "total": round(end - start, 4)
+            }
+        }
+
+    def _merge_sources(self, results: List[Dict[str, Any]]) -> str:
+        """Sentences from every source, duplicates dropped, sharing MAX_CONTEXT_CHARS."""
+        answered = [result for result in results if result["error"] is None and result["output"]]
+        if not answered:
+            return ""
+        # Headers and the blank lines between sections count against the limit too
+        share = (self.MAX_CONTEXT_CHARS - 2 * (len(answered) - 1)) // len(answered)
+        seen = set()
+        sections = []
+        for result in answered:
+            header = f"[{result['tool']}]\n"
+            budget = share - len(header)
+            kept, size = [], 0
+            for sentence in SENTENCE_SPLIT.split(result["output"]):
+                sentence = " ".join(sentence.split())
+                key = re.sub(r"[^a-z0-9]+", " ", sentence.lower()).strip()
+                if not key or key in seen:
+                    continue
+                # Skip an oversized sentence but keep looking for shorter ones after it
+                if size + len(sentence) > budget:
+                    continue
+                seen.add(key)
+                kept.append(sentence)
+                size += len(sentence) + 1
+            if kept:
+                sections.append(header + " ".join(kept))
+        return "\n\n".join(sections)
@@ -0,0 +1,197 @@
+"""
+Token-bounded conversation memory for LangChain agents.
+
+The last N turns are kept verbatim; older turns are folded into a running
+summary by a background thread after the turn has been answered, so the
+user never waits on summarization. The history handed to the prompt is
+capped at a token budget: the last turn is always kept, the summary is
+trimmed to what is left, then earlier turns fill the rest. Also provides a
+callback that counts prompt tokens per turn.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage, SystemMessage, get_buffer_string
+from pydantic import PrivateAttr
+
+SUMMARY_PROMPT = """Progressively summarize the conversation, adding to the previous summary and returning a new summary.
+Keep names, numbers, decisions and open questions; drop pleasantries.
+
+Current summary:
+{summary}
+
+New lines of conversation:
+{new_lines}
+
+New summary:"""
+
+SUMMARY_HEADER = "Summary of the earlier conversation:\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap provider-independent estimate (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+def count_message_tokens(messages: List[BaseMessage], token_counter: Callable[[str], int] = estimate_tokens) -> int:
+    # ~4 tokens of per-message overhead (role, separators)
+    return sum(token_counter(str(message.content)) + 4 for message in messages)
+
+
+class SummaryBufferMemory(BaseChatMemory):
+    """Last `keep_turns` turns verbatim plus an asynchronously updated summary."""
+
+    llm: Any
+    memory_key: str = "chat_history"
+    return_messages: bool = True
+    keep_turns: int = 4
+    max_token_limit: int = 2000
+    token_counter: Callable[[str], int] = estimate_tokens
+    summary: str = ""
+
+    _lock: Any = PrivateAttr(default_factory=threading.RLock)
+    _executor: Any = PrivateAttr(default=None)
+    _pending: Optional[Future] = PrivateAttr(default=None)
+    _generation: int = PrivateAttr(default=0)
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        """Last turn + summary + earlier messages, within max_token_limit where possible."""
+        with self._lock:
+            messages = list(self.chat_memory.messages)
+            summary = self.summary
+
+        # The last turn is kept even if it alone exceeds the limit
+        last_turn, earlier = messages[-2:], messages[:-2]
+        budget = self.max_token_limit - count_message_tokens(last_turn, self.token_counter)
+
+        prefix = []
+        if summary:
+            header_cost = count_message_tokens([SystemMessage(content=SUMMARY_HEADER)], self.token_counter)
+            summary = self._trim(summary, budget - header_cost)
+            if summary:
+                prefix = [SystemMessage(content=SUMMARY_HEADER + summary)]
+                budget -= count_message_tokens(prefix, self.token_counter)
+
+        # Newest first until the budget runs out; turns still waiting to be
+        # summarized are shown verbatim while they fit
+        kept = []
+        for message in reversed(earlier):
+            cost = count_message_tokens([message], self.token_counter)
+            if cost > budget:
+                break
+            kept.append(message)
+            budget -= cost
+        history = prefix + kept[::-1] + last_turn
+
+        if self.return_messages:
+            return {self.memory_key: history}
+        return {self.memory_key: get_buffer_string(history)}
+
+    def _trim(self, text: str, max_tokens: int) -> str:
+        """Cut text (marked with "...") so it counts at most max_tokens; "" if nothing fits."""
+        if self.token_counter(text) <= max_tokens:
+            return text
+        max_tokens -= self.token_counter(" ...")
+        if max_tokens <= 0:
+            return ""
+        while text and self.token_counter(text) > max_tokens:
+            # Shrink in proportion to the overshoot, always by at least one character
+            text = text[:min(len(text) - 1, len(text) * max_tokens // self.token_counter(text))]
+        return text.rstrip() + " ..." if text else ""
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, str]) -> None:
+        """Store the turn, then fold older turns into the summary in the background."""
+        with self._lock:
+            super().save_context(inputs, outputs)
+            overflow = len(self.chat_memory.messages) - 2 * self.keep_turns
+            if overflow > 0 and self._pending is None:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="memory-summary")
+                self._pending = self._executor.submit(self._summarize, self._generation)
+
+    def _summarize(self, generation: int):
+        try:
+            while True:
+                with self._lock:
+                    messages = self.chat_memory.messages
+                    count = len(messages) - 2 * self.keep_turns
+                    if count <= 0 or generation != self._generation:
+                        self._pending = None
+                        return
+                    folded = list(messages[:count])
+                    summary = self.summary
+
+                prompt = SUMMARY_PROMPT.format(summary=summary or "(none)", new_lines=get_buffer_string(folded))
+                response = self.llm.invoke(prompt)
+                new_summary = getattr(response, "content", response)
+
+                with self._lock:
+                    # A clear() while the LLM was working makes this result stale
+                    if generation != self._generation:
+                        self._pending = None
+                        return
+                    self.summary = str(new_summary).strip()
+                    remaining = self.chat_memory.messages[count:]
+                    self.chat_memory.clear()
+                    self.chat_memory.add_messages(remaining)
+        except Exception as e:
+            print(f"⚠️ Memory summarization failed: {e}")
+            with self._lock:
+                self._pending = None
+
+    def wait_for_summary(self, timeout: Optional[float] = None):
+        """Block until background summarization is idle (tests, shutdown)."""
+        pending = self._pending
+        if pending is not None:
+            pending.result(timeout=timeout)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._pending = None
+            super().clear()
+            self.summary = ""
+
+
+class PromptTokenCounter(BaseCallbackHandler):
+    """Counts prompt tokens of every LLM call in one agent turn.
+
+    Uses the provider-reported prompt tokens when the response carries
+    them, otherwise an estimate of the messages sent.
+    """
+
+    def __init__(self, token_counter: Callable[[str], int] = estimate_tokens):
+        self.token_counter = token_counter
+        self.calls: List[Dict[str, Optional[int]]] = []
+
+    def on_chat_model_start(self, serialized, messages: List[List[BaseMessage]], **kwargs):
+        for batch in messages:
+            self.calls.append({"estimated": count_message_tokens(batch, self.token_counter), "reported": None})
+
+    def on_llm_start(self, serialized, prompts: List[str], **kwargs):
+        for prompt in prompts:
+            self.calls.append({"estimated": self.token_counter(prompt), "reported": None})
+
+    def on_llm_end(self, response, **kwargs):
+        usage = (response.llm_output or {}).get("token_usage") or {}
+        reported = usage.get("prompt_tokens")
+        if reported is None:
+            for generations in response.generations:
+                for generation in generations:
+                    metadata = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                    if metadata:
+                        reported = metadata.get("input_tokens")
+        if reported is not None and self.calls:
+            self.calls[-1]["reported"] = reported
+
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(call["reported"] if call["reported"] is not None else call["estimated"] for call in self.calls)
@@ -5,18 +5,34 @@ Demonstrates how to use custom tools with LangChain agents.
 
 from typing import List, Dict, Any, Callable
 from langchain.tools import Tool
-import requests
 import json
 from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 
 from .base_langchain_agent import BaseLangChainAgent
+from ..tools.cache import FOREVER, ToolResultCache, casefold_input, strip_input
+from ..utils.http_client import get_session
 
 load_dotenv()
 
+# Seconds each network tool's results stay valid; shared by every agent
+TOOL_TTLS = {
+    "weather": 600,
+    "url_shortener": FOREVER
+}
+# City names are case-insensitive; URL paths and queries are not
+TOOL_NORMALIZERS = {
+    "weather": casefold_input,
+    "url_shortener": strip_input
+}
+TOOL_CACHE = ToolResultCache(ttls=TOOL_TTLS, normalizers=TOOL_NORMALIZERS)
+
 class ToolsLangChainAgent(BaseLangChainAgent):
     """LangChain-powered agent with custom tools."""
+
+    WEATHER_URL = "http://api.openweathermap.org/data/2.5/weather"
+    SHORTENER_URL = "http://tinyurl.com/api-create.php"
     
     def __init__(self, **kwargs):
         """Initialize tools agent with custom tools."""
@@ -31,7 +47,7 @@ class ToolsLangChainAgent(BaseLangChainAgent):
             tools.append(Tool(
                 name="weather",
                 description="Get current weather for a location. Format: 'city,country_code'. Example: 'London,UK', 'New York,US'",
-                func=self._get_weather
+                func=TOOL_CACHE.wrap("weather", self._get_weather)
             ))
         
         # Time tool
@@ -52,7 +68,7 @@ class ToolsLangChainAgent(BaseLangChainAgent):
         tools.append(Tool(
             name="url_shortener",
             description="Shorten a URL. Format: 'url'. Example: 'https://example.com'",
-            func=self._shorten_url
+            func=TOOL_CACHE.wrap("url_shortener", self._shorten_url)
         ))
         
         # Text analyzer tool
@@ -76,11 +92,12 @@ class ToolsLangChainAgent(BaseLangChainAgent):
             city = parts[0].strip()
             country = parts[1].strip() if len(parts) > 1 else ""
             
-            # Build URL
-            url = f"http://api.openweathermap.org/data/2.5/weather?q={city},{country}&appid={api_key}&units=metric"
-            
-            # Make request
-            response = requests.get(url)
+            # Make request over the shared keep-alive session
+            response = get_session().get(self.WEATHER_URL, params={
+                "q": f"{city},{country}",
+                "appid": api_key,
+                "units": "metric"
+            })
             data = response.json()
             
             if response.status_code != 200:
@@ -145,7 +162,7 @@ class ToolsLangChainAgent(BaseLangChainAgent):
         """Shorten a URL using a free URL shortener service."""
         try:
             # Use TinyURL API
-            response = requests.get(f"http://tinyurl.com/api-create.php?url={url}")
+            response = get_session().get(self.SHORTENER_URL, params={"url": url.strip()})
             
             if response.status_code == 200:
                 return f"Shortened URL: {response.text}"
@@ -175,6 +192,12 @@ class ToolsLangChainAgent(BaseLangChainAgent):
         except Exception as e:
             return f"Error analyzing text: {str(e)}"
     
+    def run(self, input_text: str, fresh_memory: bool = False) -> Dict[str, Any]:
+        """Run the agent; adds tool-result cache hit rates under "tool_cache"."""
+        result = super().run(input_text, fresh_memory=fresh_memory)
+        result["tool_cache"] = TOOL_CACHE.stats()
+        return result
+
     def _get_system_prompt(self) -> str:
         """Get system prompt for tools agent."""
         return """You are a helpful assistant with access to various tools and utilities.
@@ -0,0 +1,275 @@
+"""
+Bounded long-term memory with semantic recall.
+
+Entries live in write order (an OrderedDict), so size and TTL eviction
+always pop the oldest entry in O(1). Each entry's embedding sits in a row
+of one preallocated NumPy matrix; recall is a single matrix-vector product
+plus a partial sort for the top k. An optional SQLite file keeps entries
+across restarts.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+class HashingEmbedder:
+    """Dependency-free text embedder: hashed unigrams and bigrams, L2-normalized.
+
+    Good enough for keyword-level recall; pass any callable mapping a list
+    of texts to an (n, dim) array (e.g. a sentence-transformers model's
+    encode) to LongTermMemory for real semantic similarity.
+    """
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def __call__(self, texts: List[str]):
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            tokens = TOKEN_PATTERN.findall(text.lower())
+            for feature in tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]:
+                digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dim
+                vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class LongTermMemory:
+    """Key/value memory with size + TTL eviction, top-k recall and optional SQLite."""
+
+    def __init__(self,
+                 max_entries: int = 10_000,
+                 ttl: Optional[float] = None,
+                 embedder: Optional[Callable[[List[str]], Any]] = None,
+                 db_path: Optional[str] = None):
+        """
+        Args:
+            max_entries: Oldest entries are evicted beyond this many
+            ttl: Seconds an entry lives after its last write (None = forever)
+            embedder: Callable mapping texts to an (n, dim) array; a
+                HashingEmbedder by default (recall needs numpy)
+            db_path: SQLite file to persist entries in (None = memory only)
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.embedder = embedder if embedder is not None else (HashingEmbedder() if np is not None else None)
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+        # Embedding index: one row per entry, rows of evicted entries are reused
+        self._matrix = None
+        self._row_keys: List[Optional[str]] = []
+        self._free_rows: List[int] = []
+
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS memory "
+                "(key TEXT PRIMARY KEY, content TEXT, created REAL, embedding BLOB)"
+            )
+            self._load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def put(self, key: str, value: Any):
+        """Store (or overwrite) a value; evicts expired and excess entries."""
+        self.put_many([(key, value)])
+
+    def put_many(self, items: List[Tuple[str, Any]]):
+        """Store several (key, value) pairs with one embedder call and one commit."""
+        # A key written twice keeps its last value; only the newest max_entries writes can survive
+        batch: Dict[str, Any] = {}
+        for key, value in items:
+            batch.pop(key, None)
+            batch[key] = value
+        items = list(batch.items())[-self.max_entries:] if self.max_entries > 0 else []
+        batch = dict(items)
+
+        vectors = [None] * len(items)
+        if self.embedder is not None and items:
+            vectors = np.asarray(self.embedder([f"{key}\n{value}" for key, value in items]), dtype=np.float32)
+        created = time.time()
+        with self._lock:
+            # Evict first so new entries reuse freed rows instead of growing the matrix
+            excess = len(self._entries) + sum(key not in self._entries for key in batch) - self.max_entries
+            if excess > 0:
+                for key in [key for key in self._entries if key not in batch][:excess]:
+                    self._remove(key)
+            for (key, value), vector in zip(items, vectors):
+                self._store(key, value, created, vector)
+            self._evict()
+            if self._db is not None:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO memory VALUES (?, ?, ?, ?)",
+                    [(key, json.dumps(value, default=str), created,
+                      vector.tobytes() if vector is not None else None)
+                     for (key, value), vector in zip(items, vectors)
+                     if key in self._entries]
+                )
+            self._commit()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return {"key", "content", "timestamp"} for a live key, else None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._expired(entry):
+                self._remove(key)
+                self._commit()
+                return None
+            return self._public(key, entry)
+
+    def recall(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
+        """Return up to k live entries most similar to the query, best first (with "score")."""
+        if self.embedder is None:
+            raise ImportError("Semantic recall needs numpy. Install with: pip install numpy")
+        vector = self._embed(query)
+        with self._lock:
+            self._evict()
+            self._commit()
+            if self._matrix is None or not self._entries:
+                return []
+            # Free rows are zeroed, so they never outrank a real match
+            scores = self._matrix[:len(self._row_keys)] @ vector
+            fetch = min(len(scores), k)
+            top = np.argpartition(-scores, fetch - 1)[:fetch]
+            return [
+                {**self._public(self._row_keys[row], self._entries[self._row_keys[row]]), "score": float(scores[row])}
+                for row in top[np.argsort(-scores[top])]
+                if self._row_keys[row] is not None and scores[row] > 0
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._matrix = None
+            self._row_keys = []
+            self._free_rows = []
+            if self._db is not None:
+                self._db.execute("DELETE FROM memory")
+            self._commit()
+
+    def close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _commit(self):
+        if self._db is not None:
+            self._db.commit()
+
+    def _embed(self, text: str):
+        if self.embedder is None:
+            return None
+        return np.asarray(self.embedder([text]), dtype=np.float32)[0]
+
+    def _expired(self, entry: Dict[str, Any], now: Optional[float] = None) -> bool:
+        return self.ttl is not None and (now or time.time()) - entry["created"] > self.ttl
+
+    @staticmethod
+    def _public(key: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "key": key,
+            "content": entry["content"],
+            "timestamp": datetime.fromtimestamp(entry["created"]).isoformat()
+        }
+
+    def _store(self, key: str, value: Any, created: float, vector):
+        entry = self._entries.pop(key, None)
+        row = entry["row"] if entry is not None else None
+        if vector is not None:
+            if row is None:
+                row = self._allocate_row(len(vector))
+            self._matrix[row] = vector
+            self._row_keys[row] = key
+        self._entries[key] = {"content": value, "created": created, "row": row}
+
+    def _allocate_row(self, dim: int) -> int:
+        if self._free_rows:
+            return self._free_rows.pop()
+        row = len(self._row_keys)
+        if self._matrix is None or row == len(self._matrix):
+            capacity = min(max(1024, 2 * row), max(self.max_entries + 1, row + 1))
+            grown = np.zeros((capacity, dim), dtype=np.float32)
+            if self._matrix is not None:
+                grown[:row] = self._matrix[:row]
+            self._matrix = grown
+        self._row_keys.append(None)
+        return row
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        if entry["row"] is not None:
+            self._matrix[entry["row"]] = 0.0
+            self._row_keys[entry["row"]] = None
+            self._free_rows.append(entry["row"])
+        if self._db is not None:
+            self._db.execute("DELETE FROM memory WHERE key = ?", (key,))
+
+    def _evict(self):
+        # Oldest writes sit at the front, so both checks stop at the first survivor
+        now = time.time()
+        while self._entries:
+            key, entry = next(iter(self._entries.items()))
+            if len(self._entries) > self.max_entries or self._expired(entry, now):
+                self._remove(key)
+            else:
+                break
+
+    def _load(self):
+        cutoff = time.time() - self.ttl if self.ttl is not None else float("-inf")
+        rows = self._db.execute(
+            "SELECT key, content, created, embedding FROM memory WHERE created >= ? "
+            "ORDER BY created DESC LIMIT ?", (cutoff, self.max_entries)
+        ).fetchall()
+        entries = [(key, json.loads(content), created, blob) for key, content, created, blob in reversed(rows)]
+        vectors = [None] * len(entries)
+        if self.embedder is not None and entries:
+            # Vectors stored by an embedder of another dimension (or none) are recomputed in one batch
+            dim = len(self._embed("dimension probe"))
+            stale = []
+            for i, (_, _, _, blob) in enumerate(entries):
+                vector = np.frombuffer(blob, dtype=np.float32) if blob is not None else None
+                if vector is None or len(vector) != dim:
+                    stale.append(i)
+                else:
+                    vectors[i] = vector
+            if stale:
+                fresh = np.asarray(self.embedder([f"{entries[i][0]}\n{entries[i][1]}" for i in stale]),
+                                   dtype=np.float32)
+                for i, vector in zip(stale, fresh):
+                    vectors[i] = vector
+                self._db.executemany(
+                    "UPDATE memory SET embedding = ? WHERE key = ?",
+                    [(vector.tobytes(), entries[i][0]) for i, vector in zip(stale, fresh)]
+                )
+        for (key, value, created, _), vector in zip(entries, vectors):
+            self._store(key, value, created, vector)
+        self._db.execute("DELETE FROM memory WHERE created < ?", (cutoff,))
+        self._db.execute(
+            "DELETE FROM memory WHERE key NOT IN (SELECT key FROM memory ORDER BY created DESC LIMIT ?)",
+            (self.max_entries,)
+        )
+        self._commit()
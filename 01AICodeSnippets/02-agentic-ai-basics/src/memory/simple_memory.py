@@ -1,28 +1,38 @@
-from typing import List, Dict, Any
+from collections import deque
+from typing import List, Dict, Any, Callable, Optional
 from datetime import datetime
+from .long_term import LongTermMemory
 
 class SimpleMemory:
-    def __init__(self):
-        self.short_term = []
-        self.long_term = {}
-        
+    def __init__(self,
+                 short_term_size: int = 10,
+                 long_term_size: int = 10_000,
+                 ttl: Optional[float] = None,
+                 embedder: Optional[Callable] = None,
+                 db_path: Optional[str] = None):
+        # Ring buffer: the oldest item drops off in O(1)
+        self.short_term = deque(maxlen=short_term_size)
+        self.long_term = LongTermMemory(
+            max_entries=long_term_size,
+            ttl=ttl,
+            embedder=embedder,
+            db_path=db_path
+        )
+
     def add_to_short_term(self, item: Any):
         timestamp = datetime.now().isoformat()
         self.short_term.append({"timestamp": timestamp, "content": item})
-        
-        # Keep only last 10 items
-        if len(self.short_term) > 10:
-            self.short_term.pop(0)
-    
+
     def add_to_long_term(self, key: str, value: Any):
-        timestamp = datetime.now().isoformat()
-        self.long_term[key] = {
-            "timestamp": timestamp,
-            "content": value
-        }
-    
+        self.long_term.put(key, value)
+
     def get_short_term_memory(self) -> List[Dict]:
-        return self.short_term
-    
+        return list(self.short_term)
+
     def get_long_term_memory(self, key: str) -> Any:
-        return self.long_term.get(key, {}).get("content") 
\ No newline at end of file
+        entry = self.long_term.get(key)
+        return entry["content"] if entry else None
+
+    def recall(self, query: str, k: int = 3) -> List[Dict]:
+        """Top-k long-term entries most similar to the query (key, content, timestamp, score)."""
+        return self.long_term.recall(query, k)
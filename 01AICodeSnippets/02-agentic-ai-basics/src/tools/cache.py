@@ -0,0 +1,139 @@
+"""
+Tool-result cache with per-tool TTLs and request coalescing.
+
+Results are keyed by (tool, normalized input), with normalization chosen
+per tool: case-insensitive inputs such as city names can be casefolded,
+while URLs and the like are only stripped. Concurrent calls with the
+same key share one in-flight call instead of each hitting the network;
+failed calls (exceptions or results rejected by `cacheable`) are never
+stored. Hit/miss counts are kept per tool for reporting.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, Tuple
+
+FOREVER = None
+
+
+def strip_input(tool_input: Any) -> str:
+    """Exact match apart from surrounding whitespace (URLs, IDs, anything case-sensitive)."""
+    return str(tool_input).strip()
+
+
+def casefold_input(tool_input: Any) -> str:
+    """Case- and spacing-insensitive match ("  london,UK " == "London,UK")."""
+    return " ".join(str(tool_input).split()).casefold()
+
+
+def _default_cacheable(result: Any) -> bool:
+    # Tools report failures as "Error ..." strings rather than raising
+    return not (isinstance(result, str) and result.lstrip().lower().startswith("error"))
+
+
+class ToolResultCache:
+    """Thread-safe LRU of tool results with a TTL per tool."""
+
+    def __init__(self,
+                 ttls: Optional[Dict[str, Optional[float]]] = None,
+                 default_ttl: Optional[float] = 0,
+                 normalizers: Optional[Dict[str, Callable[[Any], str]]] = None,
+                 max_entries: int = 1024,
+                 cacheable: Callable[[Any], bool] = _default_cacheable,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            ttls: Seconds to keep each tool's results (FOREVER = no expiry)
+            default_ttl: TTL for tools not in ttls (0 = not cached, only coalesced)
+            normalizers: Maps each tool's input to its cache key (default: strip_input)
+            max_entries: Least recently used results are dropped beyond this
+            cacheable: Decides whether a result may be stored
+            clock: Time source (monotonic seconds)
+        """
+        self.ttls = dict(ttls or {})
+        self.default_ttl = default_ttl
+        self.normalizers = dict(normalizers or {})
+        self.max_entries = max_entries
+        self.cacheable = cacheable
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[Any, Optional[float]]]" = OrderedDict()
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def normalize(self, tool: str, tool_input: Any) -> str:
+        return self.normalizers.get(tool, strip_input)(tool_input)
+
+    def call(self, tool: str, tool_input: str, func: Callable[[str], Any]) -> Any:
+        """Return a cached result, join an identical in-flight call, or run func."""
+        key = (tool, self.normalize(tool, tool_input))
+        owner = False
+        with self._lock:
+            stats = self._stats.setdefault(tool, {"hits": 0, "misses": 0, "coalesced": 0})
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires = entry
+                if expires is None or expires > self.clock():
+                    self._entries.move_to_end(key)
+                    stats["hits"] += 1
+                    return value
+                del self._entries[key]
+
+            future = self._in_flight.get(key)
+            if future is not None:
+                stats["coalesced"] += 1
+            else:
+                stats["misses"] += 1
+                future = self._in_flight[key] = Future()
+                owner = True
+        if not owner:
+            return future.result()
+
+        try:
+            value = func(tool_input)
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            del self._in_flight[key]
+            ttl = self.ttls.get(tool, self.default_ttl)
+            if ttl != 0 and self.cacheable(value):
+                self._entries[key] = (value, None if ttl is FOREVER else self.clock() + ttl)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def wrap(self, tool: str, func: Callable[[str], Any]) -> Callable[[str], Any]:
+        """func with its results cached under the tool's TTL."""
+        return lambda tool_input: self.call(tool, tool_input, func)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tool and total hits, misses, coalesced calls and hit rate."""
+        with self._lock:
+            per_tool = {tool: dict(counts) for tool, counts in self._stats.items()}
+            entries = len(self._entries)
+        totals = {"hits": 0, "misses": 0, "coalesced": 0}
+        for counts in per_tool.values():
+            for name in totals:
+                totals[name] += counts[name]
+            counts["hit_rate"] = _hit_rate(counts)
+        return {**totals, "hit_rate": _hit_rate(totals), "entries": entries, "tools": per_tool}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._stats.clear()
+
+
+def _hit_rate(counts: Dict[str, int]) -> float:
+    # Coalesced calls were served without their own request, like hits
+    served = counts["hits"] + counts["coalesced"]
+    total = served + counts["misses"]
+    return round(served / total, 4) if total else 0.0
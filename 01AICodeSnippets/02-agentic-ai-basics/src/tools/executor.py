@@ -0,0 +1,132 @@
+"""
+Tool-call parsing and concurrent execution for BaseAgent.
+
+The model requests tools with one line per call:
+
+    TOOL: web_search: latest quantum computing news
+    TOOL: wikipedia: Quantum computing
+
+All calls from one reply are independent, so they run in parallel, each
+with its own timeout; a slow or failing tool only costs its own result.
+"""
+
+import asyncio
+import re
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional, Tuple
+
+DEFAULT_TOOL_TIMEOUT = 10.0
+MAX_TOOL_CALLS = 5
+TOOL_WORKERS = 8
+
+TOOL_CALL_PATTERN = re.compile(r"^[\s>*`-]*TOOL:\s*([\w-]+)\s*:\s*(.+?)[\s`]*$", re.IGNORECASE | re.MULTILINE)
+
+
+_pool_lock = threading.Lock()
+_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_tool_pool() -> ThreadPoolExecutor:
+    """Shared worker threads for tool calls.
+
+    A timed-out call keeps its thread until it returns, so the pool is
+    long-lived instead of being shut down (and waited on) per agent step.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=TOOL_WORKERS, thread_name_prefix="agent-tool")
+        return _pool
+
+
+def parse_tool_calls(text: str, tools: List[Dict]) -> List[Tuple[str, str]]:
+    """Return the (tool name, input) pairs requested in a model reply.
+
+    Unknown tool names are kept so the model is told they do not exist;
+    repeated calls are dropped and at most MAX_TOOL_CALLS are returned.
+    """
+    names = {tool["name"].lower(): tool["name"] for tool in tools}
+    calls = []
+    for name, tool_input in TOOL_CALL_PATTERN.findall(text or ""):
+        call = (names.get(name.lower(), name), tool_input.strip().strip("\"'"))
+        if call not in calls:
+            calls.append(call)
+    return calls[:MAX_TOOL_CALLS]
+
+
+def _result(name: str, tool_input: str, output: str = None, error: str = None, seconds: float = 0.0) -> Dict[str, Any]:
+    return {"tool": name, "input": tool_input, "output": output, "error": error, "seconds": round(seconds, 4)}
+
+
+def _timed_call(func, tool_input: str) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    output = func(tool_input)
+    return output, time.perf_counter() - start
+
+
+def run_tool_calls(calls: List[Tuple[str, str]],
+                   tools: List[Dict],
+                   pool: Optional[Executor] = None) -> List[Dict[str, Any]]:
+    """Run tool calls concurrently on a thread pool, each with its own timeout."""
+    pool = pool or get_tool_pool()
+    by_name = {tool["name"]: tool for tool in tools}
+    start = time.perf_counter()
+    pending = []
+    results = []
+    for name, tool_input in calls:
+        tool = by_name.get(name)
+        if tool is None:
+            results.append(_result(name, tool_input, error=f"Unknown tool '{name}'"))
+            continue
+        future = pool.submit(_timed_call, tool["func"], tool_input)
+        pending.append((len(results), tool.get("timeout", DEFAULT_TOOL_TIMEOUT), future))
+        results.append(None)
+
+    for index, timeout, future in pending:
+        name, tool_input = calls[index]
+        remaining = max(0.0, start + timeout - time.perf_counter())
+        try:
+            output, seconds = future.result(timeout=remaining)
+            results[index] = _result(name, tool_input, output=str(output), seconds=seconds)
+        except FutureTimeout:
+            future.cancel()
+            results[index] = _result(name, tool_input, error=f"Timed out after {timeout:g}s", seconds=timeout)
+        except Exception as e:
+            results[index] = _result(name, tool_input, error=str(e), seconds=time.perf_counter() - start)
+    return results
+
+
+async def arun_tool_calls(calls: List[Tuple[str, str]], tools: List[Dict]) -> List[Dict[str, Any]]:
+    """Async run_tool_calls(): tools run on the shared pool, awaited together."""
+    loop = asyncio.get_running_loop()
+    by_name = {tool["name"]: tool for tool in tools}
+
+    async def run_one(name: str, tool_input: str) -> Dict[str, Any]:
+        tool = by_name.get(name)
+        if tool is None:
+            return _result(name, tool_input, error=f"Unknown tool '{name}'")
+        timeout = tool.get("timeout", DEFAULT_TOOL_TIMEOUT)
+        start = time.perf_counter()
+        try:
+            output, seconds = await asyncio.wait_for(
+                loop.run_in_executor(get_tool_pool(), _timed_call, tool["func"], tool_input), timeout
+            )
+            return _result(name, tool_input, output=str(output), seconds=seconds)
+        except asyncio.TimeoutError:
+            return _result(name, tool_input, error=f"Timed out after {timeout:g}s", seconds=timeout)
+        except Exception as e:
+            return _result(name, tool_input, error=str(e), seconds=time.perf_counter() - start)
+
+    return list(await asyncio.gather(*(run_one(name, tool_input) for name, tool_input in calls)))
+
+
+def format_tool_results(results: List[Dict[str, Any]]) -> str:
+    """Render tool results as the follow-up user turn."""
+    lines = ["Tool results:"]
+    for result in results:
+        body = result["output"] if result["error"] is None else f"ERROR: {result['error']}"
+        lines.append(f"[{result['tool']}: {result['input']}]\n{body}")
+    lines.append("Using these results, give the final answer to the task. Do not request more tools.")
+    return "\n\n".join(lines)
@@ -0,0 +1,217 @@
+"""
+Safe math expression engine shared by CalculatorAgent and
+CalculatorLangChainAgent.
+
+An expression is parsed once into a tree of closures (no eval) and kept in
+an LRU cache, so repeating an expression costs one dict lookup plus the
+arithmetic. Names that are not constants are variables; when a variable is
+a list or NumPy array the same compiled expression is evaluated
+element-wise with NumPy functions.
+"""
+
+import ast
+import math
+import operator
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+CACHE_SIZE = 1024
+MAX_INT_BITS = 100_000  # About 30,000 decimal digits; 10**10000 is about 33,000 bits
+MAX_FACTORIAL = 1_000
+
+# Unicode and caret spellings mapped to Python syntax before parsing. √ becomes
+# the otherwise unused unary ~, compiled as sqrt, so √4 and √(x + 1) both parse
+# and √ binds like unary minus (√4^2 is √(4^2), 2√… needs an explicit *)
+SYMBOLS = {"^": "**", "π": "pi", "×": "*", "÷": "/", "−": "-", "√": "~"}
+
+CONSTANTS = {"pi": math.pi, "e": math.e, "tau": math.tau, "inf": math.inf}
+
+
+def _check_int_size(bits: float):
+    # 9**9**9 or (10**10000)**10000 would hang the process building a huge int
+    if bits > MAX_INT_BITS:
+        raise ValueError(f"Result too large (limit {MAX_INT_BITS} bits)")
+
+
+def _power(base, exponent):
+    # Negative exponents give a float, which under- or overflows quickly on its own
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and abs(base) > 1:
+        _check_int_size(exponent * math.log2(abs(base)))
+    return base ** exponent
+
+
+def _multiply(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        _check_int_size(left.bit_length() + right.bit_length())
+    return left * right
+
+
+BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _multiply,
+    ast.Div: operator.truediv,
+    ast.Mod: operator.mod,
+    ast.FloorDiv: operator.floordiv,
+}
+
+UNARY_OPERATORS = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+
+
+def _factorial(n):
+    if n > MAX_FACTORIAL:
+        raise ValueError(f"factorial argument too large (limit {MAX_FACTORIAL})")
+    return math.factorial(int(n)) if float(n).is_integer() else math.gamma(n + 1)
+
+
+SCALAR_FUNCTIONS: Dict[str, Callable] = {
+    "abs": abs, "round": round, "min": min, "max": max, "pow": _power,
+    "sqrt": math.sqrt, "exp": math.exp, "log": math.log, "log10": math.log10, "log2": math.log2,
+    "sin": math.sin, "cos": math.cos, "tan": math.tan,
+    "asin": math.asin, "acos": math.acos, "atan": math.atan, "atan2": math.atan2,
+    "sinh": math.sinh, "cosh": math.cosh, "tanh": math.tanh,
+    "floor": math.floor, "ceil": math.ceil, "factorial": _factorial,
+    "degrees": math.degrees, "radians": math.radians, "hypot": math.hypot,
+}
+
+if np is not None:
+    def _np_log(x, base=None):
+        return np.log(x) if base is None else np.log(x) / np.log(base)
+
+    VECTOR_FUNCTIONS: Dict[str, Callable] = {
+        "abs": np.abs, "round": np.round, "min": np.minimum, "max": np.maximum, "pow": np.power,
+        "sqrt": np.sqrt, "exp": np.exp, "log": _np_log, "log10": np.log10, "log2": np.log2,
+        "sin": np.sin, "cos": np.cos, "tan": np.tan,
+        "asin": np.arcsin, "acos": np.arccos, "atan": np.arctan, "atan2": np.arctan2,
+        "sinh": np.sinh, "cosh": np.cosh, "tanh": np.tanh,
+        "floor": np.floor, "ceil": np.ceil, "factorial": np.vectorize(_factorial, otypes=[float]),
+        "degrees": np.degrees, "radians": np.radians, "hypot": np.hypot,
+    }
+else:
+    VECTOR_FUNCTIONS = {}
+
+# A compiled node takes (functions, variables) and returns a value
+Node = Callable[[Dict[str, Callable], Dict[str, Any]], Any]
+
+
+def _function_name(node: ast.expr) -> str:
+    # sqrt(x) and math.sqrt(x) are the same call
+    if isinstance(node, ast.Name):
+        name = node.id
+    elif isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "math":
+        name = node.attr
+    else:
+        raise ValueError("Only calls to math functions are allowed")
+    if name not in SCALAR_FUNCTIONS:
+        raise ValueError(f"Unknown function '{name}'")
+    return name
+
+
+def _compile_node(node: ast.expr, variables: set) -> Node:
+    if isinstance(node, ast.Constant):
+        value = node.value
+        if isinstance(value, bool) or not isinstance(value, (int, float, complex)):
+            raise ValueError(f"Unsupported constant: {value!r}")
+        return lambda functions, env: value
+
+    if isinstance(node, ast.Name) or (
+        isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id == "math"
+    ):
+        name = node.id if isinstance(node, ast.Name) else node.attr
+        if name in CONSTANTS:
+            value = CONSTANTS[name]
+            return lambda functions, env: value
+        if isinstance(node, ast.Attribute):
+            raise ValueError(f"Unknown constant 'math.{name}'")
+        variables.add(name)
+        return lambda functions, env: env[name]
+
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Invert):
+        operand = _compile_node(node.operand, variables)
+        return lambda functions, env: functions["sqrt"](operand(functions, env))
+
+    if isinstance(node, ast.UnaryOp) and type(node.op) in UNARY_OPERATORS:
+        op = UNARY_OPERATORS[type(node.op)]
+        operand = _compile_node(node.operand, variables)
+        return lambda functions, env: op(operand(functions, env))
+
+    if isinstance(node, ast.BinOp):
+        left = _compile_node(node.left, variables)
+        right = _compile_node(node.right, variables)
+        if isinstance(node.op, ast.Pow):
+            return lambda functions, env: functions["pow"](left(functions, env), right(functions, env))
+        if type(node.op) in BINARY_OPERATORS:
+            op = BINARY_OPERATORS[type(node.op)]
+            return lambda functions, env: op(left(functions, env), right(functions, env))
+
+    if isinstance(node, ast.Call):
+        if node.keywords:
+            raise ValueError("Keyword arguments are not supported")
+        name = _function_name(node.func)
+        args = [_compile_node(arg, variables) for arg in node.args]
+        if len(args) == 1:
+            (arg,) = args
+            return lambda functions, env: functions[name](arg(functions, env))
+        return lambda functions, env: functions[name](*[arg(functions, env) for arg in args])
+
+    raise ValueError(f"Unsupported operation: {type(node).__name__}")
+
+
+def normalize_expression(expression: str) -> str:
+    """Map ^, π, × etc. to Python syntax (symbol by symbol, never re-matching output)."""
+    if "~" in expression:
+        raise ValueError("Unsupported operator '~'")
+    return "".join(SYMBOLS.get(char, char) for char in expression.strip())
+
+
+class CompiledExpression:
+    """A parsed expression; call it with variable values to evaluate."""
+
+    __slots__ = ("source", "variables", "_root")
+
+    def __init__(self, source: str, root: Node, variables: FrozenSet[str]):
+        self.source = source
+        self.variables = variables
+        self._root = root
+
+    def __call__(self, **variables) -> Any:
+        missing = self.variables - variables.keys()
+        if missing:
+            raise ValueError(f"Unknown name(s): {', '.join(sorted(missing))}")
+
+        functions = SCALAR_FUNCTIONS
+        if any(not isinstance(value, (int, float, complex)) for value in variables.values()):
+            if np is None:
+                raise ImportError("Vectorized evaluation needs numpy. Install with: pip install numpy")
+            functions = VECTOR_FUNCTIONS
+            variables = {name: np.asarray(value, dtype=float) for name, value in variables.items()}
+        return self._root(functions, variables)
+
+    def __repr__(self) -> str:
+        return f"CompiledExpression({self.source!r})"
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(expression: str) -> CompiledExpression:
+    """
+    Parse an expression into a cached, reusable closure tree.
+
+    Raises:
+        ValueError: If the expression uses anything but numbers, math
+            constants/functions, variables and arithmetic
+        SyntaxError: If the expression does not parse
+    """
+    source = normalize_expression(expression)
+    variables = set()
+    root = _compile_node(ast.parse(source, mode="eval").body, variables)
+    return CompiledExpression(source, root, frozenset(variables))
+
+
+def evaluate(expression: str, **variables) -> Any:
+    """Compile (or fetch from the cache) and evaluate an expression."""
+    return compile_expression(expression)(**variables)
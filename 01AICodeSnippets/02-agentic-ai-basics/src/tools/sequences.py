@@ -0,0 +1,171 @@
+"""
+Sequence engine behind the calculator's sequence_generator tool.
+
+Every sequence is a lazy generator, so callers can stream terms without
+materializing a list. Primes come from a segmented sieve (memory bounded
+by the segment size); Fibonacci-style terms are generated iteratively,
+and any single term is reachable with fast doubling in O(log n) steps.
+Summaries show the first terms, then the count and last term, which are
+computed without walking the whole sequence where the math allows.
+"""
+
+import math
+from itertools import compress, islice
+from typing import Callable, Dict, Iterator, Tuple
+
+SEGMENT_SIZE = 1 << 20
+MAX_DISPLAY_TERMS = 100
+MAX_PRIME_RANGE = 10 ** 8        # primes are sieved (and counted) across the whole range
+MAX_SEQUENCE_TERMS = 10 ** 8     # square/cube terms
+MAX_FIBONACCI_TERMS = 10 ** 6    # F(10**6) already has ~209k digits
+MAX_START = 10 ** 12
+MAX_DIGITS_SHOWN = 60
+
+
+def _base_primes(limit: int) -> list:
+    """Primes <= limit with a simple sieve (limit is at most sqrt of the range end)."""
+    if limit < 2:
+        return []
+    sieve = bytearray([1]) * (limit + 1)
+    sieve[0:2] = b"\x00\x00"
+    for p in range(2, math.isqrt(limit) + 1):
+        if sieve[p]:
+            sieve[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+    return list(compress(range(limit + 1), sieve))
+
+
+def _segments(start: int, end: int) -> Iterator[Tuple[int, bytearray]]:
+    """Yield (low, flags) for consecutive windows of [start, end]; flags[i] marks low + i prime."""
+    if end < 2:
+        return
+    low = max(2, start)
+    base = _base_primes(math.isqrt(end))
+    while low <= end:
+        high = min(low + SEGMENT_SIZE, end + 1)
+        flags = bytearray([1]) * (high - low)
+        for p in base:
+            if p * p >= high:
+                break
+            first = max(p * p, -(-low // p) * p)
+            if first < high:
+                flags[first - low::p] = bytes(len(range(first, high, p)))
+        yield low, flags
+        low = high
+
+
+def primes(start: int, end: int) -> Iterator[int]:
+    """Lazily yield the primes in [start, end] using a segmented sieve."""
+    for low, flags in _segments(start, end):
+        yield from compress(range(low, low + len(flags)), flags)
+
+
+def prime_summary(start: int, end: int) -> Tuple[int, int]:
+    """Return (count, last prime) for [start, end] without building a list."""
+    count, last = 0, None
+    for low, flags in _segments(start, end):
+        found = flags.count(1)
+        if found:
+            count += found
+            last = low + flags.rfind(1)
+    return count, last
+
+
+def fibonacci(n: int) -> Tuple[int, int]:
+    """Return (F(n), F(n+1)) by fast doubling."""
+    a, b = 0, 1
+    for bit in bin(n)[2:]:
+        c = a * (2 * b - a)
+        d = a * a + b * b
+        a, b = (d, c + d) if bit == "1" else (c, d)
+    return a, b
+
+
+def fibonacci_like(first: int, second: int) -> Iterator[int]:
+    """Yield first, second, first + second, ... indefinitely."""
+    a, b = first, second
+    while True:
+        yield a
+        a, b = b, a + b
+
+
+def nth_fibonacci_like(first: int, second: int, n: int) -> int:
+    """Term n (0-based) of fibonacci_like(first, second): first*F(n-1) + second*F(n)."""
+    if n == 0:
+        return first
+    f_n, f_next = fibonacci(n)
+    return first * (f_next - f_n) + second * f_n
+
+
+def _powers(exponent: int) -> Callable[[int, int], Iterator[int]]:
+    return lambda start, end: (i ** exponent for i in range(start, end + 1))
+
+
+# Range sequences: type -> generator over [start, end]
+RANGE_SEQUENCES: Dict[str, Callable[[int, int], Iterator[int]]] = {
+    "prime": primes,
+    "square": _powers(2),
+    "cube": _powers(3),
+}
+
+SEQUENCE_TYPES = ["fibonacci", *RANGE_SEQUENCES]
+
+
+def iter_sequence(seq_type: str, start: int, end_or_count: int) -> Iterator[int]:
+    """
+    Stream a sequence lazily.
+
+    Args:
+        seq_type: fibonacci (start, count) or prime/square/cube (start, end inclusive)
+        start: First term (fibonacci) or start of the range
+        end_or_count: Number of terms (fibonacci) or end of the range
+
+    Raises:
+        ValueError: For unknown types or arguments beyond the hard limits
+    """
+    seq_type = seq_type.lower()
+    _check_limits(seq_type, start, end_or_count)
+    if seq_type == "fibonacci":
+        if end_or_count <= 0:
+            return iter(())
+        return islice(fibonacci_like(start, start + 1), end_or_count)
+    return RANGE_SEQUENCES[seq_type](start, end_or_count)
+
+
+def _check_limits(seq_type: str, start: int, end_or_count: int):
+    if seq_type not in SEQUENCE_TYPES:
+        raise ValueError(f"Unknown sequence type: {seq_type}. Available: {', '.join(SEQUENCE_TYPES)}")
+    if abs(start) > MAX_START:
+        raise ValueError(f"Start must be within ±{MAX_START:,}")
+    if seq_type == "fibonacci":
+        span, limit = end_or_count, MAX_FIBONACCI_TERMS
+    else:
+        span, limit = end_or_count - start + 1, MAX_PRIME_RANGE if seq_type == "prime" else MAX_SEQUENCE_TERMS
+    if span > limit:
+        raise ValueError(f"{seq_type} supports at most {limit:,} {'terms' if seq_type == 'fibonacci' else 'numbers'} per request")
+
+
+def _format_term(value: int) -> str:
+    digits = len(str(abs(value))) if value.bit_length() < 13_000 else int(value.bit_length() * math.log10(2)) + 1
+    if digits <= MAX_DIGITS_SHOWN:
+        return str(value)
+    return f"<{digits:,}-digit number>"
+
+
+def describe_sequence(seq_type: str, start: int, end_or_count: int, max_terms: int = MAX_DISPLAY_TERMS) -> str:
+    """Render a sequence for the agent, truncating long output to max_terms terms."""
+    seq_type = seq_type.lower()
+    shown = list(islice(iter_sequence(seq_type, start, end_or_count), max_terms + 1))
+    title = f"{seq_type.title()} sequence"
+    if len(shown) <= max_terms:
+        return f"{title}: [{', '.join(_format_term(term) for term in shown)}]"
+
+    shown = shown[:max_terms]
+    if seq_type == "fibonacci":
+        total, last = end_or_count, nth_fibonacci_like(start, start + 1, end_or_count - 1)
+    elif seq_type == "prime":
+        total, last = prime_summary(start, end_or_count)
+    else:
+        total = end_or_count - start + 1
+        last = end_or_count ** (2 if seq_type == "square" else 3)
+    return (f"{title} (first {max_terms} of {total:,} terms): "
+            f"[{', '.join(_format_term(term) for term in shown)}, ...] last term: {_format_term(last)}")
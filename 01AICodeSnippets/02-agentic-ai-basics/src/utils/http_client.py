@@ -0,0 +1,117 @@
+"""
+Shared HTTP connection pools for the agents.
+
+One keep-alive (HTTP/2 when `h2` is installed) client per process for sync
+calls and one AsyncClient per event loop for async calls, so agent steps
+reuse TCP/TLS connections instead of opening a new one per request. The
+AsyncClient lives for an `async with pooled_client():` block and is closed
+when the last such block on its loop exits. Tools built on `requests`
+share one Session with default timeouts.
+"""
+
+import asyncio
+import atexit
+import threading
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, List, Optional
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import h2
+except ImportError:
+    h2 = None
+
+HTTP2 = h2 is not None
+LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+REQUESTS_TIMEOUT = (5.0, 15.0)  # (connect, read) seconds
+
+_lock = threading.Lock()
+_client: Optional[httpx.Client] = None
+# loop -> [client, pooled_client() blocks open on that loop]
+_async_clients: Dict[asyncio.AbstractEventLoop, List] = {}
+_session: Optional[requests.Session] = None
+
+
+class TimeoutSession(requests.Session):
+    """requests.Session that applies REQUESTS_TIMEOUT unless a call passes its own."""
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", REQUESTS_TIMEOUT)
+        return super().request(method, url, **kwargs)
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide pooled client, creating it on first use."""
+    global _client
+    with _lock:
+        if _client is None or _client.is_closed:
+            _client = httpx.Client(http2=HTTP2, limits=LIMITS, timeout=TIMEOUT)
+        return _client
+
+
+@asynccontextmanager
+async def pooled_client() -> AsyncIterator[httpx.AsyncClient]:
+    """Share one AsyncClient on the running loop for the duration of the block.
+
+    Async connections belong to the loop that opened them. Blocks that
+    overlap on one loop (nested, or concurrent tasks such as arun() calls
+    under asyncio.gather) share a client, which is closed when the last of
+    them exits. Wrap a batch of arun() calls in one block to keep their
+    connections alive between calls.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        entry = _async_clients.get(loop)
+        if entry is None:
+            entry = _async_clients[loop] = [httpx.AsyncClient(http2=HTTP2, limits=LIMITS, timeout=TIMEOUT), 0]
+        entry[1] += 1
+    try:
+        yield entry[0]
+    finally:
+        with _lock:
+            entry[1] -= 1
+            last = entry[1] == 0
+            if last:
+                del _async_clients[loop]
+        if last:
+            await entry[0].aclose()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the client of the pooled_client() block open on the running loop."""
+    with _lock:
+        entry = _async_clients.get(asyncio.get_running_loop())
+    if entry is None:
+        raise RuntimeError("No pooled AsyncClient on this event loop; use it inside `async with pooled_client():`")
+    return entry[0]
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide keep-alive requests session used by tools."""
+    global _session
+    with _lock:
+        if _session is None:
+            _session = TimeoutSession()
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+            _session.mount("http://", adapter)
+            _session.mount("https://", adapter)
+        return _session
+
+
+def close_client():
+    """Close the sync clients; the next get_client()/get_session() opens a fresh pool."""
+    global _client, _session
+    with _lock:
+        client, _client = _client, None
+        session, _session = _session, None
+    if client is not None:
+        client.close()
+    if session is not None:
+        session.close()
+
+
+atexit.register(close_client)
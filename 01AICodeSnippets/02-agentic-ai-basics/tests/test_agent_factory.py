@@ -0,0 +1,59 @@
+"""
+Tests for shared LLM clients and pre-built agents across LangChain agents
+"""
+
+import os
+import unittest
+from unittest.mock import patch
+
+try:
+    from langchain_groq import ChatGroq
+    from src.langchain_agents.calculator_langchain_agent import CalculatorLangChainAgent
+    from src.langchain_agents.factory import cache_stats, clear_cache
+except ImportError:
+    ChatGroq = None
+
+
+@unittest.skipIf(ChatGroq is None, "langchain / langchain-groq is not installed")
+class TestAgentFactory(unittest.TestCase):
+    """Test cases for client pooling and executor reuse"""
+
+    def setUp(self):
+        clear_cache()
+        # Only Groq configured, so every agent resolves to the same provider
+        self.env = patch.dict(os.environ, {"GROQ_API_KEY": "test_key", "GOOGLE_AI_API_KEY": "", "ANTHROPIC_API_KEY": ""})
+        self.env.start()
+
+    def tearDown(self):
+        self.env.stop()
+        clear_cache()
+
+    def test_same_config_shares_client_and_agent(self):
+        first = CalculatorLangChainAgent(verbose=False)
+        second = CalculatorLangChainAgent(verbose=False)
+        self.assertIs(first.llm, second.llm)
+        self.assertIs(first.agent_executor.agent.runnable, second.agent_executor.agent.runnable)
+        # Per-agent state stays separate
+        self.assertIsNot(first.memory, second.memory)
+        self.assertIsNot(first.agent_executor, second.agent_executor)
+        self.assertEqual(cache_stats()["llms"], 1)
+
+    def test_different_temperature_gets_its_own_client(self):
+        warm = CalculatorLangChainAgent(verbose=False, temperature=0.7)
+        cold = CalculatorLangChainAgent(verbose=False, temperature=0.0)
+        self.assertIsNot(warm.llm, cold.llm)
+        self.assertEqual(cache_stats()["llms"], 2)
+
+    def test_fresh_memory_keeps_executor(self):
+        agent = CalculatorLangChainAgent(verbose=False)
+        executor = agent.agent_executor
+        agent.memory.save_context({"input": "earlier question"}, {"output": "earlier answer"})
+        with patch.object(type(executor), "invoke", return_value={"output": "ok"}):
+            result = agent.run("new request", fresh_memory=True)
+        self.assertEqual(result["output"], "ok")
+        self.assertEqual(agent.memory.chat_memory.messages, [])
+        self.assertIs(agent.agent_executor, executor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Tests for the shared safe expression engine
+"""
+
+import math
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from src.agents.calculator_agent import CalculatorAgent
+from src.tools.expression import MAX_INT_BITS, compile_expression, evaluate, np
+
+
+class TestExpressionEngine(unittest.TestCase):
+    """Test cases for compilation, caching and evaluation"""
+
+    def test_constants_are_not_rewritten_twice(self):
+        self.assertAlmostEqual(evaluate("π / 2"), math.pi / 2)
+        self.assertAlmostEqual(evaluate("math.pi + e"), math.pi + math.e)
+        self.assertAlmostEqual(evaluate("exp(1) + sqrt(16)"), math.e + 4)
+        self.assertEqual(evaluate("1e3 + 2^3"), 1008.0)
+
+    def test_square_root_symbol(self):
+        self.assertEqual(evaluate("√4"), 2.0)
+        self.assertEqual(evaluate("√(9) + 1"), 4.0)
+        self.assertEqual(evaluate("√x * 2", x=16), 8.0)
+        self.assertEqual(evaluate("√4^2"), 4.0)
+        self.assertAlmostEqual(evaluate("1 / √2"), 1 / math.sqrt(2))
+        with self.assertRaises(ValueError):
+            evaluate("~4")
+
+    def test_rejects_unsafe_expressions(self):
+        for expression in ["__import__('os')", "().__class__", "open('x')", "[1, 2]", "9 ** 9 ** 9"]:
+            with self.subTest(expression=expression):
+                with self.assertRaises((ValueError, SyntaxError)):
+                    evaluate(expression)
+
+    def test_huge_integer_results_are_rejected_before_they_are_built(self):
+        for expression in ["(10**10000)**10000", "pow(10**1000, 1000)", "(-3)**100000",
+                           "10**20000 * 10**20000 * 10**20000"]:
+            with self.subTest(expression=expression):
+                start = time.perf_counter()
+                with self.assertRaisesRegex(ValueError, "too large"):
+                    evaluate(expression)
+                self.assertLess(time.perf_counter() - start, 1.0)
+
+    def test_large_but_bounded_results_still_work(self):
+        self.assertEqual(evaluate("10**10000"), 10 ** 10000)
+        self.assertEqual(evaluate("10**-20000"), 0.0)
+        self.assertEqual(evaluate("2**10000 * 2**10000"), 2 ** 20000)
+        self.assertEqual(evaluate("1**(10**50)"), 1)
+        self.assertLessEqual((evaluate("factorial(1000) * factorial(1000)")).bit_length(), MAX_INT_BITS)
+
+    def test_compiled_expressions_are_cached(self):
+        compile_expression.cache_clear()
+        first = compile_expression("sin(x) + 1")
+        self.assertIs(compile_expression("sin(x) + 1"), first)
+        self.assertEqual(compile_expression.cache_info().hits, 1)
+        self.assertEqual(first.variables, frozenset({"x"}))
+        self.assertAlmostEqual(first(x=math.pi / 2), 2.0)
+        with self.assertRaises(ValueError):
+            first()
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_vectorized_evaluation_matches_scalar(self):
+        compiled = compile_expression("sqrt(x ** 2 + y ** 2) + log(x, 2) - max(x, y)")
+        xs, ys = [1.0, 2.0, 8.0], [3.0, 1.0, 0.5]
+        vector = compiled(x=np.array(xs), y=ys)
+        self.assertTrue(np.allclose(vector, [compiled(x=x, y=y) for x, y in zip(xs, ys)]))
+        self.assertTrue(np.allclose(evaluate("√x", x=[4.0, 9.0]), [2.0, 3.0]))
+
+    def test_calculator_agent_uses_engine(self):
+        with patch.dict(os.environ, {"GROQ_API_KEY": "test_key"}):
+            agent = CalculatorAgent()
+        self.assertEqual(agent._calculate("2^10"), "Result: 1024")
+        self.assertEqual(agent._calculate("sin(π/2)"), "Result: 1.0")
+        self.assertTrue(agent._calculate("x + 1").startswith("Calculation error"))
+
+
+if __name__ == "__main__":
+    unittest.main()
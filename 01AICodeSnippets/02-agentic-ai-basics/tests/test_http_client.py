@@ -0,0 +1,135 @@
+"""
+Tests for the shared HTTP clients and BaseAgent.arun over a real connection
+"""
+
+import asyncio
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from src.agents.base_agent import BaseAgent
+from src.utils import http_client
+
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+    """Keep-alive chat completions endpoint answering from a script of replies."""
+
+    protocol_version = "HTTP/1.1"
+    replies = []
+    peers = []
+
+    def do_POST(self):
+        json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.peers.append(self.client_address)
+        body = json.dumps({"choices": [{"message": {"content": self.replies.pop(0)}}]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class EchoAgent(BaseAgent):
+    def _get_default_tools(self):
+        return [{"name": "echo", "description": "repeats its input", "func": lambda text: f"echo: {text}"}]
+
+
+class TestAsyncClient(unittest.TestCase):
+    """Test cases for the pooled_client() lifecycle"""
+
+    def test_overlapping_blocks_share_a_client_closed_by_the_last(self):
+        async def blocks():
+            async with http_client.pooled_client() as outer:
+                async with http_client.pooled_client() as inner:
+                    self.assertIs(inner, outer)
+                    self.assertIs(http_client.get_async_client(), outer)
+                self.assertFalse(outer.is_closed)
+            return outer
+
+        client = asyncio.run(blocks())
+        self.assertTrue(client.is_closed)
+        self.assertNotIn(client, [entry[0] for entry in http_client._async_clients.values()])
+
+        # A new block (or another loop) gets a fresh client
+        self.assertIsNot(asyncio.run(blocks()), client)
+        self.assertEqual(len(http_client._async_clients), 0)
+
+    def test_client_is_closed_when_the_block_raises(self):
+        async def failing():
+            async with http_client.pooled_client() as client:
+                raise ValueError(client)
+
+        with self.assertRaises(ValueError) as raised:
+            asyncio.run(failing())
+        self.assertTrue(raised.exception.args[0].is_closed)
+
+    def test_no_client_outside_a_block(self):
+        async def outside():
+            return http_client.get_async_client()
+
+        with self.assertRaises(RuntimeError):
+            asyncio.run(outside())
+
+    def test_sync_client_is_shared(self):
+        self.assertIs(http_client.get_client(), http_client.get_client())
+
+
+class TestAsyncRun(unittest.TestCase):
+    """Test cases for BaseAgent.arun against a local fake Groq server"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FakeGroqHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        FakeGroqHandler.peers.clear()
+        env = {"GROQ_API_KEY": "test_key", "GROQ_BASE_URL": f"http://127.0.0.1:{self.server.server_port}"}
+        with patch.dict(os.environ, env):
+            self.agent = EchoAgent()
+
+    def test_arun_plans_calls_tools_and_answers_over_one_connection(self):
+        FakeGroqHandler.replies[:] = ["TOOL: echo: hello", "The echo said hello."]
+        result = asyncio.run(self.agent.arun("Say hello"))
+
+        self.assertEqual(result["output"], "The echo said hello.")
+        self.assertEqual(result["tool_calls"][0]["output"], "echo: hello")
+        self.assertEqual(set(result["timings"]), {"plan", "tools", "answer", "total"})
+        # Both model calls went over the loop's pooled keep-alive connection
+        self.assertEqual(len(FakeGroqHandler.peers), 2)
+        self.assertEqual(FakeGroqHandler.peers[0], FakeGroqHandler.peers[1])
+
+    def test_concurrent_aruns_share_a_loop(self):
+        FakeGroqHandler.replies[:] = ["first", "second", "third"]
+
+        async def run_all():
+            return await asyncio.gather(*(self.agent.arun(f"task {i}") for i in range(3)))
+
+        results = asyncio.run(run_all())
+        self.assertEqual(sorted(result["output"] for result in results), ["first", "second", "third"])
+        self.assertEqual(len(http_client._async_clients), 0)
+
+    def test_sequential_aruns_in_one_block_reuse_the_connection(self):
+        FakeGroqHandler.replies[:] = ["one", "two"]
+
+        async def run_both():
+            async with http_client.pooled_client():
+                return [await self.agent.arun("first"), await self.agent.arun("second")]
+
+        self.assertEqual([result["output"] for result in asyncio.run(run_both())], ["one", "two"])
+        self.assertEqual(FakeGroqHandler.peers[0], FakeGroqHandler.peers[1])
+
+
+if __name__ == "__main__":
+    unittest.main()
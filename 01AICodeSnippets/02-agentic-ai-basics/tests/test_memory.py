@@ -0,0 +1,107 @@
+"""
+Tests for SimpleMemory and the bounded long-term store
+"""
+
+import shutil
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from src.memory.long_term import HashingEmbedder, LongTermMemory, np
+from src.memory.simple_memory import SimpleMemory
+
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class TestMemory(unittest.TestCase):
+    """Test cases for eviction, recall and persistence"""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_short_term_ring_buffer(self):
+        memory = SimpleMemory(short_term_size=3)
+        for i in range(5):
+            memory.add_to_short_term(f"item {i}")
+        self.assertEqual([item["content"] for item in memory.get_short_term_memory()], ["item 2", "item 3", "item 4"])
+
+    def test_size_eviction_drops_oldest_write(self):
+        store = LongTermMemory(max_entries=3)
+        for key in ["a", "b", "c"]:
+            store.put(key, f"value {key}")
+        store.put("a", "rewritten")  # a becomes the newest write
+        store.put("d", "value d")
+        self.assertEqual(len(store), 3)
+        self.assertIsNone(store.get("b"))
+        self.assertEqual(store.get("a")["content"], "rewritten")
+
+    def test_ttl_expiry(self):
+        store = LongTermMemory(ttl=0.05)
+        store.put("old", "expires soon")
+        time.sleep(0.1)
+        store.put("new", "still fresh")
+        self.assertIsNone(store.get("old"))
+        self.assertEqual([hit["key"] for hit in store.recall("expires soon fresh", k=5)], ["new"])
+
+    def test_semantic_recall_ranks_related_entries(self):
+        memory = SimpleMemory()
+        memory.add_to_long_term("quantum", "Qubits use superposition for quantum computing")
+        memory.add_to_long_term("coffee", "Light roast coffee keeps more acidity")
+        memory.add_to_long_term("chess", "The Sicilian defence is a chess opening")
+        hits = memory.recall("how does quantum computing work", k=2)
+        self.assertEqual(hits[0]["key"], "quantum")
+        self.assertGreater(hits[0]["score"], hits[-1]["score"] if len(hits) > 1 else 0)
+        self.assertEqual(memory.get_long_term_memory("coffee"), "Light roast coffee keeps more acidity")
+
+    def test_sqlite_persistence_survives_restart(self):
+        db_path = str(self.tmp / "memory.db")
+        store = LongTermMemory(max_entries=2, db_path=db_path)
+        store.put("a", {"text": "first"})
+        store.put("b", ["second"])
+        store.put("c", "third")
+        store.close()
+
+        reloaded = LongTermMemory(max_entries=2, db_path=db_path)
+        self.assertEqual(len(reloaded), 2)
+        self.assertIsNone(reloaded.get("a"))
+        self.assertEqual(reloaded.get("b")["content"], ["second"])
+        self.assertEqual(reloaded.recall("third", k=1)[0]["key"], "c")
+        reloaded.close()
+
+    def test_reopening_with_another_embedding_dimension_re_embeds(self):
+        db_path = str(self.tmp / "memory.db")
+        store = LongTermMemory(db_path=db_path, embedder=HashingEmbedder(256))
+        store.put_many([("quantum", "Qubits use superposition"), ("coffee", "Light roast keeps acidity")])
+        store.close()
+
+        reloaded = LongTermMemory(db_path=db_path, embedder=HashingEmbedder(384))
+        self.assertEqual(reloaded._matrix.shape[1], 384)
+        self.assertEqual(reloaded.recall("superposition qubits", k=1)[0]["key"], "quantum")
+        reloaded.close()
+
+        # The re-embedded vectors were written back
+        again = LongTermMemory(db_path=db_path, embedder=HashingEmbedder(384))
+        blobs = again._db.execute("SELECT embedding FROM memory").fetchall()
+        self.assertEqual({len(blob) for (blob,) in blobs}, {384 * 4})
+        again.close()
+
+    def test_batch_larger_than_capacity_keeps_newest_without_growing(self):
+        store = LongTermMemory(max_entries=50)
+        store.put_many([(f"old {i}", i) for i in range(50)])
+        capacity = len(store._matrix)
+        store.put_many([(f"key {i}", i) for i in range(5000)] + [("key 4990", "rewritten")])
+
+        self.assertEqual(len(store), 50)
+        self.assertEqual(len(store._matrix), capacity)
+        self.assertEqual(list(store._entries)[-1], "key 4990")
+        self.assertEqual(store.get("key 4990")["content"], "rewritten")
+        self.assertIsNone(store.get("old 49"))
+        self.assertIsNone(store.get("key 4949"))
+        self.assertEqual(store.get("key 4950")["content"], 4950)
+
+
+if __name__ == "__main__":
+    unittest.main()
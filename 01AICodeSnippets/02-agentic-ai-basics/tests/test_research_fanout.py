@@ -0,0 +1,134 @@
+"""
+Tests for the fan-out research mode of ResearchLangChainAgent
+"""
+
+import time
+import unittest
+from unittest.mock import patch
+
+try:
+    from langchain.tools import Tool
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from src.langchain_agents.research_langchain_agent import ResearchLangChainAgent
+except ImportError:
+    FakeListChatModel = None
+
+SOURCE_DELAY = 0.3
+LLM_DELAY = 0.1
+
+
+if FakeListChatModel is not None:
+    class SlowChatModel(FakeListChatModel):
+        """Fake chat model with a fixed round-trip time the tool-calling agent can bind tools to."""
+
+        def _call(self, *args, **kwargs):
+            time.sleep(LLM_DELAY)
+            return super()._call(*args, **kwargs)
+
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+
+def mocked_sources(wikipedia_delay: float = SOURCE_DELAY):
+    def web_search(query):
+        time.sleep(SOURCE_DELAY)
+        return (f"{query} reached a new milestone this year. "
+                "Researchers reported error rates falling. Error rates are falling!")
+
+    def wikipedia(query):
+        time.sleep(wikipedia_delay)
+        return f"Page: {query}\nResearchers reported error rates falling. {query} began in the 1980s."
+
+    return [
+        Tool(name="web_search", description="Search the web.", func=web_search),
+        Tool(name="wikipedia", description="Search Wikipedia.", func=wikipedia),
+        Tool(name="research_synthesizer", description="Synthesize findings.", func=lambda text: text),
+    ]
+
+
+@unittest.skipIf(FakeListChatModel is None, "langchain is not installed")
+class TestResearchFanout(unittest.TestCase):
+    """Test cases for concurrent sources, deadlines, dedupe and the single synthesis call"""
+
+    def _agent(self, responses, tools=None, agent_type="tool-calling"):
+        llm = SlowChatModel(responses=responses)
+        with patch.object(ResearchLangChainAgent, "_initialize_llm", return_value=llm), \
+                patch.object(ResearchLangChainAgent, "_get_tools", return_value=tools or mocked_sources()):
+            return ResearchLangChainAgent(agent_type=agent_type, verbose=False)
+
+    def test_sources_run_concurrently_with_one_synthesis_call(self):
+        agent = self._agent(["Quantum computing report."])
+        result = agent.research_topic("Quantum computing", mode="fanout")
+
+        self.assertEqual(result["output"], "Quantum computing report.")
+        self.assertEqual(result["llm_calls"], 1)
+        self.assertEqual(result["tools_used"], ["web_search", "wikipedia"])
+        self.assertLess(result["timings"]["sources"], 2 * SOURCE_DELAY)
+        self.assertEqual(result["research_mode"], "fanout")
+
+    def test_gathered_text_is_deduplicated_and_trimmed(self):
+        agent = self._agent(["report"])
+        results = [
+            {"tool": "web_search", "output": "Qubits are fragile. Error rates are falling! " + "x" * 200 + ". Logical qubits work.",
+             "error": None},
+            {"tool": "wikipedia", "output": "Page: Qubit\nError rates are falling.  Qubits are FRAGILE.", "error": None},
+            {"tool": "slow", "output": None, "error": "Timed out after 1s"},
+        ]
+        with patch.object(ResearchLangChainAgent, "MAX_CONTEXT_CHARS", 200):
+            context = agent._merge_sources(results)
+
+        # The oversized sentence is skipped, not the rest of its source
+        self.assertEqual(context, "[web_search]\nQubits are fragile. Error rates are falling! Logical qubits work."
+                                  "\n\n[wikipedia]\nPage: Qubit")
+
+        # Headers and separators fit inside the limit along with the sentences
+        wordy = [{"tool": f"source_{i}", "output": " ".join(f"Fact {i}-{n} holds." for n in range(40)), "error": None}
+                 for i in range(3)]
+        with patch.object(ResearchLangChainAgent, "MAX_CONTEXT_CHARS", 200):
+            context = agent._merge_sources(wordy)
+        self.assertLessEqual(len(context), 200)
+        self.assertEqual(context.count("[source_"), 3)
+
+    def test_slow_source_misses_its_deadline(self):
+        agent = self._agent(["report"], tools=mocked_sources(wikipedia_delay=2.0))
+        with patch.dict(ResearchLangChainAgent.SOURCE_TIMEOUTS, {"wikipedia": 0.5}):
+            result = agent.research_topic("Quantum computing", mode="fanout")
+
+        wikipedia = next(source for source in result["sources"] if source["tool"] == "wikipedia")
+        self.assertIn("Timed out", wikipedia["error"])
+        self.assertEqual(result["tools_used"], ["web_search"])
+        self.assertLess(result["timings"]["total"], 1.5)
+
+    def test_current_research_skips_wikipedia(self):
+        agent = self._agent(["report"])
+        result = agent.research_topic("Quantum computing", include_background=False, mode="fanout")
+        self.assertEqual([source["tool"] for source in result["sources"]], ["web_search"])
+
+    def test_fanout_is_faster_than_react(self):
+        react = self._agent([
+            "Thought: search first\nAction: web_search\nAction Input: Quantum computing",
+            "Thought: background next\nAction: wikipedia\nAction Input: Quantum computing",
+            "Final Answer: Quantum computing report."
+        ], agent_type="zero-shot")
+        start = time.perf_counter()
+        react_result = react.research_topic("Quantum computing")
+        react_seconds = time.perf_counter() - start
+
+        fanout = self._agent(["Quantum computing report."])
+        start = time.perf_counter()
+        fanout_result = fanout.research_topic("Quantum computing", mode="fanout")
+        fanout_seconds = time.perf_counter() - start
+
+        self.assertEqual(react_result["llm_calls"], 3)
+        self.assertEqual(fanout_result["llm_calls"], 1)
+        # ReAct: 2 sequential sources + 3 LLM round trips; fan-out: 1 source + 1 round trip
+        self.assertLess(fanout_seconds, react_seconds - SOURCE_DELAY)
+
+    def test_unknown_mode(self):
+        agent = self._agent(["report"])
+        with self.assertRaises(ValueError):
+            agent.research_topic("Quantum computing", mode="parallel")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+"""
+Tests for the sequence engine
+"""
+
+import unittest
+
+from src.tools.sequences import (
+    MAX_PRIME_RANGE, describe_sequence, fibonacci, iter_sequence, nth_fibonacci_like, prime_summary, primes
+)
+
+
+class TestSequences(unittest.TestCase):
+    """Test cases for the sieve, Fibonacci helpers and truncated output"""
+
+    def test_segmented_sieve_matches_trial_division(self):
+        def is_prime(n):
+            return n > 1 and all(n % i for i in range(2, int(n ** 0.5) + 1))
+
+        for start, end in [(1, 1), (1, 2), (0, 100), (90, 200), (999_000, 1_001_000)]:
+            with self.subTest(start=start, end=end):
+                expected = [n for n in range(start, end + 1) if is_prime(n)]
+                self.assertEqual(list(primes(start, end)), expected)
+                self.assertEqual(prime_summary(start, end), (len(expected), expected[-1] if expected else None))
+
+    def test_fast_doubling_matches_iteration(self):
+        terms = list(iter_sequence("fibonacci", 3, 40))
+        self.assertEqual(terms[:5], [3, 4, 7, 11, 18])
+        self.assertEqual([nth_fibonacci_like(3, 4, n) for n in range(40)], terms)
+        self.assertEqual(fibonacci(90)[0], 2880067194370816120)
+
+    def test_small_sequences_are_unchanged(self):
+        self.assertEqual(describe_sequence("fibonacci", 1, 6), "Fibonacci sequence: [1, 2, 3, 5, 8, 13]")
+        self.assertEqual(describe_sequence("prime", 1, 20), "Prime sequence: [2, 3, 5, 7, 11, 13, 17, 19]")
+        self.assertEqual(describe_sequence("cube", 1, 3), "Cube sequence: [1, 8, 27]")
+
+    def test_large_requests_are_truncated(self):
+        text = describe_sequence("prime", 1, 10_000_000, max_terms=5)
+        self.assertEqual(text, "Prime sequence (first 5 of 664,579 terms): [2, 3, 5, 7, 11, ...] last term: 9999991")
+        text = describe_sequence("fibonacci", 0, 100_000, max_terms=3)
+        self.assertTrue(text.endswith("last term: <20,899-digit number>"), text)
+
+    def test_hard_limits(self):
+        with self.assertRaises(ValueError):
+            describe_sequence("prime", 1, MAX_PRIME_RANGE + 1)
+        with self.assertRaises(ValueError):
+            describe_sequence("factorial", 1, 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
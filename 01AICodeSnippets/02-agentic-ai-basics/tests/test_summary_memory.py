@@ -0,0 +1,116 @@
+"""
+Tests for the summarizing, token-bounded LangChain memory
+"""
+
+import threading
+import unittest
+from unittest.mock import patch
+
+try:
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from src.langchain_agents.calculator_langchain_agent import CalculatorLangChainAgent
+    from src.langchain_agents.summary_memory import SummaryBufferMemory, count_message_tokens
+except ImportError:
+    FakeListChatModel = None
+
+
+if FakeListChatModel is not None:
+    class FakeToolModel(FakeListChatModel):
+        """Fake chat model the tool-calling agent can bind tools to."""
+
+        def bind_tools(self, tools, **kwargs):
+            return self
+
+
+@unittest.skipIf(FakeListChatModel is None, "langchain is not installed")
+class TestSummaryMemory(unittest.TestCase):
+    """Test cases for background summarization and prompt-token logging"""
+
+    def test_older_turns_are_folded_into_summary(self):
+        llm = FakeListChatModel(responses=["User asked about turns 0 and 1."])
+        memory = SummaryBufferMemory(llm=llm, keep_turns=2)
+        for i in range(3):
+            memory.save_context({"input": f"question {i}"}, {"output": f"answer {i}"})
+        memory.wait_for_summary(timeout=5)
+
+        history = memory.load_memory_variables({})["chat_history"]
+        self.assertIn("User asked about turns 0 and 1.", history[0].content)
+        self.assertEqual([m.content for m in history[1:]], ["question 1", "answer 1", "question 2", "answer 2"])
+
+    def test_summarization_is_off_the_critical_path(self):
+        release = threading.Event()
+
+        class SlowModel(FakeListChatModel):
+            def invoke(self, *args, **kwargs):
+                release.wait(5)
+                return super().invoke(*args, **kwargs)
+
+        memory = SummaryBufferMemory(llm=SlowModel(responses=["summary"]), keep_turns=1)
+        memory.save_context({"input": "q0"}, {"output": "a0"})
+        memory.save_context({"input": "q1"}, {"output": "a1"})  # returns while the summary is pending
+        self.assertEqual(memory.summary, "")
+        self.assertEqual(len(memory.load_memory_variables({})["chat_history"]), 4)
+        release.set()
+        memory.wait_for_summary(timeout=5)
+        self.assertEqual(memory.summary, "summary")
+
+    def test_history_respects_token_budget(self):
+        memory = SummaryBufferMemory(llm=FakeListChatModel(responses=["s"]), keep_turns=10, max_token_limit=60)
+        for i in range(5):
+            memory.save_context({"input": "q" * 80}, {"output": f"a{i}" * 40})
+        history = memory.load_memory_variables({})["chat_history"]
+        self.assertLessEqual(sum(len(m.content) // 4 + 5 for m in history), 60)
+        self.assertEqual(history[-1].content, "a4" * 40)
+
+    def test_oversized_summary_is_trimmed_and_last_turn_kept(self):
+        memory = SummaryBufferMemory(llm=FakeListChatModel(responses=["s"]), keep_turns=10, max_token_limit=100)
+        memory.save_context({"input": "earlier question"}, {"output": "earlier answer"})
+        memory.save_context({"input": "latest question"}, {"output": "latest answer"})
+        memory.summary = "Long running summary. " * 200
+
+        history = memory.load_memory_variables({})["chat_history"]
+        self.assertEqual([m.content for m in history[-2:]], ["latest question", "latest answer"])
+        self.assertTrue(history[0].content.endswith(" ..."))
+        self.assertLessEqual(count_message_tokens(history), 100)
+
+        # A last turn over the limit on its own is still sent, without the summary
+        memory.save_context({"input": "q" * 600}, {"output": "a"})
+        history = memory.load_memory_variables({})["chat_history"]
+        self.assertEqual([m.content for m in history], ["q" * 600, "a"])
+
+    def test_agent_logs_bounded_prompt_tokens(self):
+        llm = FakeToolModel(responses=[f"answer {i} " + "x" * 400 for i in range(40)])
+        with patch.object(CalculatorLangChainAgent, "_initialize_llm", return_value=llm):
+            buffered = CalculatorLangChainAgent(verbose=False)
+            summarized = CalculatorLangChainAgent(verbose=False, memory_mode="summary",
+                                                  memory_turns=2, memory_token_limit=500)
+        for agent in (buffered, summarized):
+            for i in range(8):
+                result = agent.run(f"question {i} " + "y" * 400)
+                if agent is summarized:
+                    agent.memory.wait_for_summary(timeout=5)
+            self.assertEqual(len(agent.token_log), 8)
+            self.assertEqual(result["prompt_tokens"], agent.token_log[-1]["prompt_tokens"])
+
+        tokens = [entry["prompt_tokens"] for entry in buffered.token_log]
+        self.assertEqual(tokens, sorted(tokens))
+        self.assertLess(summarized.token_log[-1]["prompt_tokens"], 0.6 * tokens[-1])
+
+        summarized.reset_memory()
+        self.assertEqual(summarized.memory.summary, "")
+
+    def test_token_line_is_printed_only_when_verbose(self):
+        for verbose in (False, True):
+            with self.subTest(verbose=verbose):
+                llm = FakeToolModel(responses=["4"])
+                with patch.object(CalculatorLangChainAgent, "_initialize_llm", return_value=llm):
+                    agent = CalculatorLangChainAgent(verbose=verbose)
+                with patch("builtins.print") as printed:
+                    agent.run("2 + 2")
+                lines = [str(call.args[0]) for call in printed.call_args_list if call.args]
+                self.assertEqual(any("prompt tokens" in line for line in lines), verbose)
+                self.assertEqual(len(agent.token_log), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+"""
+Tests for the tool-result cache and the shared requests session
+"""
+
+import json
+import os
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from unittest.mock import patch
+
+from src.tools.cache import FOREVER, ToolResultCache, casefold_input
+
+try:
+    from langchain_core.language_models.fake_chat_models import FakeListChatModel
+    from src.langchain_agents.tools_langchain_agent import TOOL_CACHE, ToolsLangChainAgent
+except ImportError:
+    FakeListChatModel = None
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Answers like OpenWeather (/weather) and TinyURL (/shorten), counting requests."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+        with self.server.lock:
+            self.server.requests.append((url.path, query))
+        time.sleep(self.server.delay)
+
+        if url.path == "/weather" and query.get("q", "").startswith("Atlantis"):
+            status, body = 404, json.dumps({"message": "city not found"})
+        elif url.path == "/weather":
+            status, body = 200, json.dumps({
+                "main": {"temp": 12.5, "feels_like": 11.0, "humidity": 80},
+                "weather": [{"description": "light rain"}],
+                "wind": {"speed": 4.1}
+            })
+        else:
+            status, body = 200, "https://tinyurl.com/abc123"
+
+        payload = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.requests = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def count(self, path: str) -> int:
+        with self.lock:
+            return sum(1 for request_path, _ in self.requests if request_path == path)
+
+
+class TestToolResultCache(unittest.TestCase):
+    """Test cases for TTLs, coalescing and statistics"""
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = ToolResultCache(ttls={"weather": 600}, normalizers={"weather": casefold_input},
+                                clock=lambda: now[0])
+        calls = []
+        fetch = cache.wrap("weather", lambda location: calls.append(location) or f"sunny in {location}")
+
+        self.assertEqual(fetch("London,UK"), "sunny in London,UK")
+        now[0] = 599
+        self.assertEqual(fetch("  london,uk "), "sunny in London,UK")
+        self.assertEqual(len(calls), 1)
+        now[0] = 601
+        fetch("London,UK")
+        self.assertEqual(len(calls), 2)
+
+        stats = cache.stats()["tools"]["weather"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 2))
+        self.assertAlmostEqual(stats["hit_rate"], 1 / 3, places=3)
+
+    def test_errors_and_uncached_tools_are_not_stored(self):
+        cache = ToolResultCache(ttls={"weather": FOREVER})
+        calls = []
+
+        def flaky(location):
+            calls.append(location)
+            return "Error getting weather: timeout" if len(calls) == 1 else "sunny"
+
+        cache.call("weather", "Paris,FR", flaky)
+        self.assertEqual(cache.call("weather", "Paris,FR", flaky), "sunny")
+        cache.call("time", "UTC", flaky)
+        cache.call("time", "UTC", flaky)
+        self.assertEqual(len(calls), 4)
+
+    def test_inputs_are_only_stripped_by_default(self):
+        cache = ToolResultCache(ttls={"echo": FOREVER})
+        calls = []
+        echo = cache.wrap("echo", lambda text: calls.append(text) or text)
+        self.assertEqual(echo("https://example.com/Docs"), "https://example.com/Docs")
+        self.assertEqual(echo("https://example.com/docs"), "https://example.com/docs")
+        self.assertEqual(echo("  https://example.com/Docs\n"), "https://example.com/Docs")
+        self.assertEqual(len(calls), 2)
+
+    def test_lru_bound(self):
+        cache = ToolResultCache(ttls={"echo": FOREVER}, max_entries=2)
+        for text in ["a", "b", "a", "c"]:
+            cache.call("echo", text, str.upper)
+        self.assertEqual(cache.stats()["entries"], 2)
+        cache.call("echo", "a", str.upper)
+        cache.call("echo", "b", str.upper)
+        self.assertEqual(cache.stats()["tools"]["echo"]["misses"], 4)
+
+
+class TestCachedTools(unittest.TestCase):
+    """Test cases for ToolsLangChainAgent tools against a local stand-in server"""
+
+    def setUp(self):
+        if FakeListChatModel is None:
+            self.skipTest("langchain is not installed")
+        self.server = StandInServer(delay=0.2)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.patches = [
+            patch.dict(os.environ, {"OPENWEATHER_API_KEY": "test_key"}),
+            patch.object(ToolsLangChainAgent, "WEATHER_URL", f"{self.server.url}/weather"),
+            patch.object(ToolsLangChainAgent, "SHORTENER_URL", f"{self.server.url}/shorten"),
+        ]
+        for active in self.patches:
+            active.start()
+        TOOL_CACHE.clear()
+
+    def tearDown(self):
+        for active in self.patches:
+            active.stop()
+        TOOL_CACHE.clear()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _agent(self, responses):
+        llm = FakeListChatModel(responses=responses)
+        with patch.object(ToolsLangChainAgent, "_initialize_llm", return_value=llm):
+            return ToolsLangChainAgent(agent_type="zero-shot", verbose=False)
+
+    def test_concurrent_identical_calls_are_coalesced(self):
+        agent = self._agent(["unused"])
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(agent.use_tool("weather", "London,UK")["output"]))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.server.count("/weather"), 1)
+        self.assertEqual(len(set(results)), 1)
+        self.assertIn("light rain", results[0])
+        stats = TOOL_CACHE.stats()["tools"]["weather"]
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"] + stats["coalesced"], 7)
+
+    def test_shortener_is_cached_and_api_errors_are_not(self):
+        agent = self._agent(["unused"])
+        for _ in range(3):
+            self.assertEqual(agent.use_tool("url_shortener", "https://example.com")["output"],
+                             "Shortened URL: https://tinyurl.com/abc123")
+        agent.use_tool("weather", "Atlantis,XX")
+        output = agent.use_tool("weather", "Atlantis,XX")["output"]
+
+        self.assertEqual(self.server.count("/shorten"), 1)
+        self.assertEqual(self.server.count("/weather"), 2)
+        self.assertEqual(output, "Error: city not found")
+        # Query parameters are encoded by the session, not pasted into the URL
+        self.assertIn(("/shorten", {"url": "https://example.com"}), self.server.requests)
+
+    def test_urls_differing_only_in_case_are_cached_separately(self):
+        agent = self._agent(["unused"])
+        for url in ["https://example.com/Page?id=AbC", "https://example.com/page?id=abc",
+                    " https://example.com/Page?id=AbC "]:
+            agent.use_tool("url_shortener", url)
+        agent.use_tool("weather", "London,UK")
+        agent.use_tool("weather", "  LONDON,uk")
+
+        self.assertEqual(self.server.count("/shorten"), 2)
+        self.assertEqual(self.server.count("/weather"), 1)
+        shortened = [query["url"] for path, query in self.server.requests if path == "/shorten"]
+        self.assertEqual(shortened, ["https://example.com/Page?id=AbC", "https://example.com/page?id=abc"])
+
+    def test_run_reports_hit_rates(self):
+        step = "Thought: shorten it\nAction: url_shortener\nAction Input: https://example.com"
+        agent = self._agent([
+            step, "Final Answer: https://tinyurl.com/abc123",
+            step, "Final Answer: https://tinyurl.com/abc123"
+        ])
+        agent.run("Shorten https://example.com")
+        result = agent.run("Shorten https://example.com again")
+
+        self.assertNotIn("error", result)
+        self.assertEqual(self.server.count("/shorten"), 1)
+        stats = result["tool_cache"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["tools"]["url_shortener"]["hit_rate"], 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""
+Tests for the BaseAgent tool-execution loop
+"""
+
+import asyncio
+import os
+import time
+import unittest
+from unittest.mock import patch
+
+from src.agents.base_agent import BaseAgent
+from src.tools.executor import parse_tool_calls
+
+
+class SlowToolsAgent(BaseAgent):
+    def _get_default_tools(self):
+        return [
+            {"name": "web_search", "description": "search", "func": self._slow("web"), "timeout": 2.0},
+            {"name": "wikipedia", "description": "encyclopedia", "func": self._slow("wiki"), "timeout": 2.0},
+            {"name": "stuck", "description": "never returns in time", "func": self._slow("stuck", 1.0), "timeout": 0.2},
+        ]
+
+    @staticmethod
+    def _slow(label, delay=0.3):
+        def func(query):
+            time.sleep(delay)
+            return f"{label} result for {query}"
+        return func
+
+
+class TestToolExecution(unittest.TestCase):
+    """Test cases for tool-call parsing and the parallel execution loop"""
+
+    def setUp(self):
+        with patch.dict(os.environ, {"GROQ_API_KEY": "test_key"}):
+            self.agent = SlowToolsAgent()
+        self.replies = []
+        self.sent = []
+
+    def fake_chat(self, messages):
+        self.sent.append([dict(message) for message in messages])
+        return self.replies.pop(0)
+
+    async def fake_achat(self, messages):
+        return self.fake_chat(messages)
+
+    def test_parse_tool_calls(self):
+        text = ("I will search.\nTOOL: Web_Search: quantum computing\n"
+                "- TOOL: wikipedia: \"Qubit\"\nTOOL: web_search: quantum computing\nTOOL: unknown: x")
+        self.assertEqual(
+            parse_tool_calls(text, self.agent.tools),
+            [("web_search", "quantum computing"), ("wikipedia", "Qubit"), ("unknown", "x")]
+        )
+
+    def test_independent_tools_run_in_parallel(self):
+        self.replies = ["TOOL: web_search: qubits\nTOOL: wikipedia: Qubit", "Final answer"]
+        with patch.object(self.agent, "_chat", self.fake_chat):
+            result = self.agent.run("Research qubits")
+
+        self.assertEqual(result["output"], "Final answer")
+        self.assertEqual([call["output"] for call in result["tool_calls"]],
+                         ["web result for qubits", "wiki result for Qubit"])
+        # Two 0.3 s tools in parallel, not 0.6 s back to back
+        self.assertLess(result["timings"]["tools"], 0.55)
+        self.assertEqual(set(result["timings"]), {"plan", "tools", "answer", "total"})
+
+        # One follow-up turn carrying both results
+        self.assertEqual(len(self.sent), 2)
+        self.assertEqual([m["role"] for m in self.sent[1]], ["user", "assistant", "user"])
+        self.assertIn("web result for qubits", self.sent[1][2]["content"])
+        self.assertIn("wiki result for Qubit", self.sent[1][2]["content"])
+
+    def test_timeout_and_unknown_tool_are_reported(self):
+        self.replies = ["TOOL: stuck: x\nTOOL: web_search: y\nTOOL: calculator: 1+1", "Done"]
+        with patch.object(self.agent, "_chat", self.fake_chat):
+            result = self.agent.run("task")
+
+        stuck, search, missing = result["tool_calls"]
+        self.assertEqual(stuck["error"], "Timed out after 0.2s")
+        self.assertEqual(search["output"], "web result for y")
+        self.assertEqual(missing["error"], "Unknown tool 'calculator'")
+        self.assertLess(result["timings"]["tools"], 0.9)
+
+    def test_direct_answer_is_single_round_trip(self):
+        self.replies = ["4"]
+        with patch.object(self.agent, "_chat", self.fake_chat):
+            result = self.agent.run("What is 2+2?")
+        self.assertEqual(result["output"], "4")
+        self.assertEqual(result["tool_calls"], [])
+        self.assertNotIn("tools", result["timings"])
+
+    def test_arun_runs_tools_concurrently(self):
+        self.replies = ["TOOL: web_search: a\nTOOL: wikipedia: b", "Answer"]
+        with patch.object(self.agent, "_achat", self.fake_achat):
+            result = asyncio.run(self.agent.arun("task"))
+        self.assertEqual(result["output"], "Answer")
+        self.assertEqual([call["error"] for call in result["tool_calls"]], [None, None])
+        self.assertLess(result["timings"]["tools"], 0.55)
+
+
+if __name__ == "__main__":
+    unittest.main()